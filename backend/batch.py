@@ -0,0 +1,37 @@
+"""Multi-get: many entities of one kind by id in a single request.
+
+Batch routes take ``ids=1,2,3``, resolve them with one ``IN`` query over
+the resource's projection (so related names come from the same joined
+select), and answer in request order with the ids that were not found.
+"""
+from fastapi import HTTPException
+
+from pagination import MAX_PAGE_SIZE
+
+MAX_BATCH_IDS = MAX_PAGE_SIZE
+# Ids are SQLite INTEGER primary keys; larger values overflow in the driver.
+MAX_ID = 2 ** 63 - 1
+
+
+def parse_ids(ids: str) -> list[int]:
+    """The distinct ids of a comma-separated list, in request order."""
+    try:
+        parsed = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        parsed = None
+    if parsed is None or any(not 1 <= value <= MAX_ID for value in parsed):
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    parsed = list(dict.fromkeys(parsed))
+    if not parsed:
+        raise HTTPException(status_code=400, detail="No ids given")
+    if len(parsed) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request"
+        )
+    return parsed
+
+
+def in_request_order(rows, ids: list[int]) -> tuple[list, list[int]]:
+    """Order ``rows`` (which carry an ``id``) like ``ids``; return the missing ids too."""
+    by_id = {row.id: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id], [i for i in ids if i not in by_id]
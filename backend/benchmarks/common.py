@@ -0,0 +1,178 @@
+"""Helpers shared by the benchmark scripts: a throwaway server and a load driver.
+
+Run benchmarks from the backend directory, e.g. ``python -m benchmarks.db_modes``.
+"""
+import asyncio
+import contextlib
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Requests slower than this count as errors instead of stalling the run.
+REQUEST_TIMEOUT = 30
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(env: dict = None, workers: int = 1):
+    """Run uvicorn on a fresh database file and yield its base URL."""
+    with tempfile.TemporaryDirectory() as tmp:
+        port = _free_port()
+        server_env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+            **(env or {}),
+        }
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=server_env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    httpx.get(f"{base_url}/health").raise_for_status()
+                    break
+                except httpx.HTTPError:
+                    if time.monotonic() > deadline or proc.poll() is not None:
+                        raise RuntimeError("server did not start")
+                    time.sleep(0.1)
+            yield base_url
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+def seed(base_url: str, classes: int = 20, students: int = 2000) -> None:
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        class_ids = [
+            client.post("/api/classes/", json={"name": f"Class {i}", "section": "A"})
+            .json()["id"]
+            for i in range(classes)
+        ]
+        client.post("/api/students/bulk", json=[
+            {
+                "name": f"Student {i}",
+                "email": f"student{i}@bench.test",
+                "class_id": class_ids[i % len(class_ids)],
+            }
+            for i in range(students)
+        ]).raise_for_status()
+
+
+def percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _drive(base_url, make_request, total, concurrency, transport=None):
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=REQUEST_TIMEOUT, transport=transport
+    ) as client:
+        async def worker():
+            nonlocal errors
+            while True:
+                try:
+                    i = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                try:
+                    resp = await make_request(client, i)
+                    failed = resp.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                latencies.append(time.perf_counter() - start)
+                errors += failed
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def _summarize(latencies, errors, elapsed, total, concurrency, keep_samples=False) -> dict:
+    summary = {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+    if keep_samples:
+        summary["samples_ms"] = [round(latency * 1000, 3) for latency in latencies]
+    return summary
+
+
+def run_load(
+    base_url, make_request, total: int, concurrency: int,
+    transport: httpx.AsyncBaseTransport = None, keep_samples: bool = False,
+) -> dict:
+    """Issue ``total`` requests from ``concurrency`` clients and summarise them.
+
+    ``transport`` sends the requests somewhere other than the network, such
+    as an in-process ``httpx.ASGITransport``; ``keep_samples`` adds every
+    latency to the summary.
+    """
+    return _summarize(
+        *asyncio.run(_drive(base_url, make_request, total, concurrency, transport)),
+        total, concurrency, keep_samples,
+    )
+
+
+def run_mixed(base_url, loads: dict) -> dict:
+    """Run several named loads at the same time.
+
+    ``loads`` maps a name to ``(make_request, total, concurrency)``; the
+    result maps the same names to their summaries.
+    """
+
+    async def drive_all():
+        return await asyncio.gather(*(
+            _drive(base_url, make_request, total, concurrency)
+            for make_request, total, concurrency in loads.values()
+        ))
+
+    return {
+        name: _summarize(*outcome, total, concurrency)
+        for (name, (_, total, concurrency)), outcome
+        in zip(loads.items(), asyncio.run(drive_all()))
+    }
+
+
+def print_table(rows: list[dict]) -> None:
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = [max(len(str(c)), *(len(str(r[c])) for r in rows)) for c in columns]
+    print("  ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(w) for c, w in zip(columns, widths)))
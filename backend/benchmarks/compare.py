@@ -0,0 +1,177 @@
+"""Gate a build on a stored benchmark baseline.
+
+Loads a report written by ``benchmarks.runner``, reruns the same scenarios
+with the same volumes, request counts and concurrency (or reads a second
+report given with ``--current``), and compares them scenario by scenario.
+
+A latency metric (p50 or p95) regresses only when all three hold:
+
+- it grew by more than ``--latency-tolerance`` (relative);
+- it grew by more than ``--min-delta-ms``, so sub-millisecond jitter on
+  fast routes is ignored;
+- a one-sided Mann-Whitney U test on the raw samples says the current
+  latencies are stochastically larger with p < ``--alpha``.
+
+SQL statements per request are deterministic, so they regress as soon as
+they exceed the baseline by more than ``--query-tolerance``. Scenarios
+missing from either side are listed but do not fail the gate.
+
+Prints a per-scenario table and exits 1 if anything regressed.
+
+Usage: python -m benchmarks.compare BASELINE.json [--current REPORT.json]
+                                    [--output current.json] [--latency-tolerance 0.15]
+"""
+import argparse
+import json
+import math
+import sys
+from argparse import Namespace
+from pathlib import Path
+
+from benchmarks.common import print_table
+
+LATENCY_METRICS = ("p50_ms", "p95_ms")
+
+
+def mann_whitney_greater(current: list, baseline: list) -> float:
+    """p-value that ``current`` is stochastically greater than ``baseline``.
+
+    Normal approximation with tie and continuity corrections, which is
+    accurate for the hundreds of samples a scenario records.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    n = n1 + n2
+    rank_sum, ties, i = 0.0, 0.0, 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        # Tied values share the mean of their ranks.
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(baseline: dict, current: dict, latency_tolerance: float = 0.15,
+            min_delta_ms: float = 1.0, alpha: float = 0.01,
+            query_tolerance: float = 0.0) -> list[dict]:
+    """One row per scenario and metric, with a ``status`` of ok, regressed,
+    improved, new or missing."""
+    rows = []
+    base_scenarios, current_scenarios = baseline["scenarios"], current["scenarios"]
+    for name in sorted(base_scenarios.keys() | current_scenarios.keys()):
+        if name not in current_scenarios:
+            rows.append(_row(name, "-", None, None, "missing"))
+            continue
+        if name not in base_scenarios:
+            rows.append(_row(name, "-", None, None, "new"))
+            continue
+        before, after = base_scenarios[name], current_scenarios[name]
+
+        p_value = mann_whitney_greater(after.get("samples_ms", []), before.get("samples_ms", []))
+        p_lower = mann_whitney_greater(before.get("samples_ms", []), after.get("samples_ms", []))
+        for metric in LATENCY_METRICS:
+            old, new = before[metric], after[metric]
+            delta = new - old
+            if delta > min_delta_ms and delta > old * latency_tolerance and p_value < alpha:
+                status = "regressed"
+            elif -delta > min_delta_ms and -delta > old * latency_tolerance and p_lower < alpha:
+                status = "improved"
+            else:
+                status = "ok"
+            rows.append(_row(name, metric, old, new, status, p_value))
+
+        old, new = before["queries_per_request"], after["queries_per_request"]
+        if new > old + query_tolerance:
+            status = "regressed"
+        elif new < old - query_tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append(_row(name, "queries_per_request", old, new, status))
+    return rows
+
+
+def _row(scenario, metric, old, new, status, p_value=None) -> dict:
+    if old is None or new is None:
+        change = "-"
+    elif old:
+        change = f"{(new - old) / old:+.1%}"
+    else:
+        change = "+inf" if new else "+0.0%"
+    return {
+        "scenario": scenario,
+        "metric": metric,
+        "baseline": "-" if old is None else round(old, 2),
+        "current": "-" if new is None else round(new, 2),
+        "change": change,
+        "p_value": "-" if p_value is None else f"{p_value:.3g}",
+        "status": status,
+    }
+
+
+def rerun(baseline: dict, database: str = None) -> dict:
+    """Run the baseline's scenarios again under the same settings."""
+    from benchmarks.runner import SCENARIOS, run_benchmark
+
+    meta = baseline["meta"]
+    args = Namespace(
+        scale=None,
+        database=database,
+        requests=meta["requests"],
+        concurrency=meta["concurrency"],
+        warmup=meta["warmup"],
+        cache=meta["cache"],
+        only=None,
+        seed=meta["seed"],
+    )
+    scenarios = [s for s in SCENARIOS if s.name in baseline["scenarios"]]
+    return run_benchmark(args, scenarios, volumes=meta["volumes"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="report from benchmarks.runner to compare against")
+    parser.add_argument("--current", help="compare this report instead of running again")
+    parser.add_argument("--database", help="seeded SQLite file to run against")
+    parser.add_argument("--output", help="also write the new run's report here")
+    parser.add_argument("--latency-tolerance", type=float, default=0.15)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument("--query-tolerance", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    if args.current:
+        current = json.loads(Path(args.current).read_text())
+    else:
+        current = rerun(baseline, args.database)
+        if args.output:
+            Path(args.output).write_text(json.dumps(current, indent=2))
+
+    rows = compare(
+        baseline, current, args.latency_tolerance, args.min_delta_ms, args.alpha,
+        args.query_tolerance,
+    )
+    print_table(rows)
+    regressed = sorted({row["scenario"] for row in rows if row["status"] == "regressed"})
+    if regressed:
+        print(f"regressed: {', '.join(regressed)}")
+        return 1
+    print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
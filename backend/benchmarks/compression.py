@@ -0,0 +1,102 @@
+"""Weigh the CPU cost of response compression against the bytes it saves.
+
+Builds the JSON student list and the streamed CSV export for a seeded
+database in-process, then compresses each with every available encoder
+at a few levels: the list as one body, the export chunk by chunk with the
+per-chunk flushes the middleware uses. ``transfer_ms`` is the time to send
+the result over a link of ``--link-kbps``; ``total_ms`` adds the CPU time,
+so encodings whose total beats identity pay for themselves on that link.
+
+Usage: python -m benchmarks.compression [--rows 10000] [--repeat 5] [--link-kbps 2000]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import Response
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import print_table
+from compression import ENCODERS
+from database import create_sqlite_engine
+from models import Class, Student
+from routes.exports import EXPORTS, _encode, _stream_rows
+from routes.students import list_students
+from schema import create_schema
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 6), "zstd": (1, 3, 9)}
+
+
+def compress(coding: str, level: int, chunks: list) -> bytes:
+    encoder = ENCODERS[coding](level)
+    last = len(chunks) - 1
+    return b"".join(encoder.compress(chunk, final=i == last) for i, chunk in enumerate(chunks))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--link-kbps", type=float, default=2000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        create_schema(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(Class), [
+                {"name": f"Grade {i}", "section": "A"} for i in range(1, 21)
+            ])
+            conn.execute(insert(Student), [
+                {"name": f"Student {i}", "email": f"s{i}@bench.test",
+                 "phone": "555-0100", "class_id": i % 20 + 1}
+                for i in range(args.rows)
+            ])
+        with sessionmaker(bind=engine)() as db:
+            listing = list_students(
+                Response(), search=None, class_id=None, limit=None, after=None,
+                fields=None, db=db,
+            ).body
+        bodies = {
+            "list json": [listing],
+            "export csv": [
+                chunk.encode()
+                for chunk in _encode(_stream_rows(engine, EXPORTS["students"]()), "csv")
+            ],
+        }
+        engine.dispose()
+
+    def transfer_ms(size: int) -> float:
+        return size * 8 / args.link_kbps
+
+    results = []
+    for body, chunks in bodies.items():
+        size = sum(len(chunk) for chunk in chunks)
+        results.append({
+            "body": body, "encoding": "identity", "level": "-", "chunks": len(chunks),
+            "bytes": size, "ratio": 1.0, "cpu_ms": 0.0,
+            "transfer_ms": round(transfer_ms(size), 1),
+            "total_ms": round(transfer_ms(size), 1),
+        })
+        for coding in ENCODERS:
+            for level in LEVELS[coding]:
+                samples = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    out = compress(coding, level, chunks)
+                    samples.append((time.perf_counter() - start) * 1000)
+                cpu_ms = min(samples)
+                results.append({
+                    "body": body, "encoding": coding, "level": level, "chunks": len(chunks),
+                    "bytes": len(out), "ratio": round(size / len(out), 1),
+                    "cpu_ms": round(cpu_ms, 1),
+                    "transfer_ms": round(transfer_ms(len(out)), 1),
+                    "total_ms": round(cpu_ms + transfer_ms(len(out)), 1),
+                })
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
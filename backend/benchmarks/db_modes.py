@@ -0,0 +1,36 @@
+"""Compare the sync (threadpool) and async (aiosqlite) CRUD routers under load.
+
+Usage: python -m benchmarks.db_modes [--requests 2000] [--concurrency 20 100]
+"""
+import argparse
+
+from benchmarks.common import print_table, run_load, seed, serve
+
+
+async def mixed_request(client, i):
+    # Nine reads for every write, roughly the production mix.
+    if i % 10 == 0:
+        return await client.post("/api/teachers/", json={
+            "name": f"Teacher {i}", "email": f"teacher{i}@bench.test",
+        })
+    return await client.get(f"/api/students/?class_id={i % 20 + 1}&limit=50")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[20, 100])
+    args = parser.parse_args(argv)
+
+    results = []
+    for mode in ("sync", "async"):
+        with serve({"DB_MODE": mode}) as base_url:
+            seed(base_url)
+            for concurrency in args.concurrency:
+                stats = run_load(base_url, mixed_request, args.requests, concurrency)
+                results.append({"mode": mode, **stats})
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
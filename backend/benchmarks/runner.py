@@ -0,0 +1,319 @@
+"""Drive every router in-process against a synthetic school and report.
+
+Seeds a database with ``benchmarks.seed`` (or reuses ``--database``), then
+runs each scenario below through ``httpx.ASGITransport`` straight into the
+app, with no server or sockets in the way. Each scenario records p50, p95
+and p99 latency, throughput, SQL statements per request, and the RSS the
+process had when the scenario started along with how far it grew while
+the scenario ran. RSS is sampled from ``/proc`` during the scenario, so
+these fields are null on platforms without it. The results go to a JSON
+report, and a summary table goes to stdout.
+
+The response cache is off unless ``--cache`` is given, so repeated reads
+measure the routes and not the cache.
+
+Usage: python -m benchmarks.runner [--scale 1.0] [--requests 200] [--concurrency 8]
+                                   [--output bench_report.json] [--only students. ...]
+"""
+import argparse
+import importlib
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import threading
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+
+from benchmarks.common import print_table, run_load
+
+BASE_URL = "http://bench"
+RSS_INTERVAL = 0.005
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    # (rng, unique number, seeded volumes) -> (path, request keyword arguments)
+    request: Callable
+
+
+def _pick(rng, count):
+    return rng.randrange(1, count + 1)
+
+
+def _ids(rng, count, size=20):
+    return ",".join(str(_pick(rng, count)) for _ in range(size))
+
+
+def _student(n):
+    return {"name": f"Bench Student {n}", "email": f"bench{n}@load.test"}
+
+
+SCENARIOS = [
+    Scenario("students.list", "GET", lambda rng, n, v: (
+        f"/api/students/?class_id={_pick(rng, v['classes'])}&limit=50", {})),
+    Scenario("students.search", "GET", lambda rng, n, v: (
+        f"/api/students/?search=Student {_pick(rng, v['students'])}&limit=20", {})),
+    Scenario("students.fields", "GET", lambda rng, n, v: (
+        f"/api/students/?limit=200&fields=id,name&class_id={_pick(rng, v['classes'])}", {})),
+    Scenario("students.detail", "GET", lambda rng, n, v: (
+        f"/api/students/{_pick(rng, v['students'])}", {})),
+    Scenario("students.batch", "GET", lambda rng, n, v: (
+        f"/api/students/batch?ids={_ids(rng, v['students'])}", {})),
+    Scenario("students.create", "POST", lambda rng, n, v: (
+        "/api/students/", {"json": {**_student(n), "class_id": _pick(rng, v["classes"])}})),
+    Scenario("students.update", "PUT", lambda rng, n, v: (
+        f"/api/students/{_pick(rng, v['students'])}", {"json": {"phone": f"555-{n % 10000:04d}"}})),
+    Scenario("students.bulk_create", "POST", lambda rng, n, v: (
+        "/api/students/bulk", {"json": [_student(f"{n}-{i}") for i in range(100)]})),
+    Scenario("teachers.list", "GET", lambda rng, n, v: (
+        "/api/teachers/?department=Science&limit=50", {})),
+    Scenario("teachers.detail", "GET", lambda rng, n, v: (
+        f"/api/teachers/{_pick(rng, v['teachers'])}", {})),
+    Scenario("teachers.create", "POST", lambda rng, n, v: (
+        "/api/teachers/", {"json": {"name": f"Bench Teacher {n}", "email": f"bt{n}@load.test"}})),
+    Scenario("classes.list", "GET", lambda rng, n, v: ("/api/classes/?limit=100", {})),
+    Scenario("classes.detail", "GET", lambda rng, n, v: (
+        f"/api/classes/{_pick(rng, v['classes'])}", {})),
+    Scenario("classes.roster", "GET", lambda rng, n, v: (
+        f"/api/classes/{_pick(rng, v['classes'])}/roster", {})),
+    Scenario("subjects.list", "GET", lambda rng, n, v: (
+        f"/api/subjects/?class_id={_pick(rng, v['classes'])}&limit=50", {})),
+    Scenario("subjects.detail", "GET", lambda rng, n, v: (
+        f"/api/subjects/{_pick(rng, v['subjects'])}", {})),
+    Scenario("subjects.create", "POST", lambda rng, n, v: (
+        "/api/subjects/", {"json": {
+            "name": "Bench", "code": f"BENCH{n}",
+            "teacher_id": _pick(rng, v["teachers"]), "class_id": _pick(rng, v["classes"]),
+        }})),
+    Scenario("stats.summary", "GET", lambda rng, n, v: ("/api/stats/", {})),
+    Scenario("export.classes", "GET", lambda rng, n, v: (
+        "/api/export/classes?format=ndjson", {})),
+    Scenario("import.teachers", "POST", lambda rng, n, v: (
+        "/api/import/teachers?format=csv", {"content": "name,email\n" + "".join(
+            f"Imported {n}-{i},imp{n}-{i}@load.test\n" for i in range(50)
+        )})),
+    Scenario("auth.login", "POST", lambda rng, n, v: (
+        "/api/auth/login", {"json": {"username": "bench", "password": "bench-password"}})),
+]
+
+
+def _rss_mb() -> Optional[float]:
+    """The process's current resident set size, or None without ``/proc``."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class RSSSampler:
+    """Samples current RSS on a background thread while the block runs.
+
+    The process-wide high-water mark (``ru_maxrss``) never goes down and
+    includes the seeding, so it cannot be attributed to one scenario.
+    """
+
+    def __init__(self, interval: float = RSS_INTERVAL):
+        self.interval = interval
+        self.start = self.peak = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> None:
+        current = _rss_mb()
+        if current is not None and (self.peak is None or current > self.peak):
+            self.peak = current
+
+    def _run(self) -> None:
+        while not self._done.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.start = self.peak = _rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._done.set()
+        self._thread.join()
+        self._sample()
+
+    def summary(self) -> dict:
+        if self.start is None:
+            return {"rss_start_mb": None, "rss_growth_mb": None}
+        return {
+            "rss_start_mb": round(self.start, 1),
+            "rss_growth_mb": round(self.peak - self.start, 1),
+        }
+
+
+def _git_commit() -> str:
+    head = Path(__file__).resolve().parents[2] / ".git" / "HEAD"
+    try:
+        ref = head.read_text().strip()
+        if ref.startswith("ref: "):
+            return (head.parent / ref[5:]).read_text().strip()
+        return ref
+    except OSError:
+        return "unknown"
+
+
+def run_scenarios(app, scenarios, volumes, requests, concurrency, warmup, seed=0) -> dict:
+    """Run ``scenarios`` against ``app`` in order and return their summaries."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    statements = [0]
+
+    def count_statement(*args):
+        statements[0] += 1
+
+    event.listen(Engine, "before_cursor_execute", count_statement)
+    transport = httpx.ASGITransport(app=app)
+    unique = itertools.count()
+    results = {}
+    try:
+        for scenario in scenarios:
+            rng = random.Random(f"{seed}:{scenario.name}")
+
+            async def make_request(client, i, scenario=scenario, rng=rng):
+                path, kwargs = scenario.request(rng, next(unique), volumes)
+                return await client.request(scenario.method, path, **kwargs)
+
+            with RSSSampler() as rss:
+                if warmup:
+                    run_load(BASE_URL, make_request, warmup, concurrency, transport)
+                before = statements[0]
+                summary = run_load(
+                    BASE_URL, make_request, requests, concurrency, transport, keep_samples=True
+                )
+                executed = statements[0] - before
+            results[scenario.name] = {
+                "method": scenario.method,
+                **summary,
+                "queries_per_request": round(executed / requests, 2),
+                **rss.summary(),
+            }
+    finally:
+        event.remove(Engine, "before_cursor_execute", count_statement)
+    return results
+
+
+def run_benchmark(args, scenarios=SCENARIOS, volumes: dict = None) -> dict:
+    """Seed (unless reusing a database), import the app, run and report.
+
+    ``volumes`` replaces the ``--scale``d seed volumes, e.g. to repeat the
+    run a baseline report describes.
+    """
+    tmp = None
+    if args.database:
+        path = Path(args.database).resolve()
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        path = Path(tmp.name) / "bench.db"
+    url = f"sqlite:///{path}"
+    # The app reads its configuration at import time.
+    os.environ["DATABASE_URL"] = url
+    os.environ["CACHE_ENABLED"] = "true" if args.cache else "false"
+
+    from benchmarks.seed import create_database, scaled, seed_school
+
+    volumes = volumes or scaled(args.scale)
+    seed_seconds = None
+    if not path.exists():
+        engine = create_database(url)
+        start = time.perf_counter()
+        seed_school(engine, volumes, args.seed)
+        seed_seconds = round(time.perf_counter() - start, 1)
+        engine.dispose()
+    else:
+        volumes = _count_rows(path)
+
+    app = importlib.import_module("main").app
+    _register_bench_user(app)
+    selected = [s for s in scenarios if not args.only or s.name.startswith(tuple(args.only))]
+    try:
+        results = run_scenarios(
+            app, selected, volumes, args.requests, args.concurrency, args.warmup, args.seed
+        )
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "volumes": volumes,
+            "seed_seconds": seed_seconds,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "cache": args.cache,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+
+
+def _count_rows(path: Path) -> dict:
+    with sqlite3.connect(path) as conn:
+        return {
+            table: conn.execute(f"SELECT max(id) FROM {table}").fetchone()[0] or 0
+            for table in ("classes", "students", "teachers", "subjects")
+        }
+
+
+def _register_bench_user(app) -> None:
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as client:
+        client.post("/api/auth/register", json={
+            "username": "bench", "email": "bench@load.test", "password": "bench-password",
+        })
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiplier on the seed volumes (0.1 for a quick run)")
+    parser.add_argument("--database", help="reuse this seeded SQLite file, or seed it if missing")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20, help="unrecorded requests per scenario")
+    parser.add_argument("--cache", action="store_true", help="leave the response cache on")
+    parser.add_argument("--only", nargs="+", help="run scenarios whose names start with these")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--output", default="bench_report.json")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args)
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print_table([
+        {"scenario": name, **{k: v for k, v in result.items() if k != "samples_ms"}}
+        for name, result in report["scenarios"].items()
+    ])
+    print(f"report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Fill a database with a synthetic school of configurable size.
+
+Volumes default to a large district: 1k classes, 500k students, 5k
+teachers and 50k subjects. ``--scale`` multiplies all four. Foreign keys
+follow skewed, school-like distributions rather than round-robin:
+
+- class sizes vary around their mean, and a few students have no class;
+- every class gets a share of the subjects;
+- teacher loads are long-tailed (log-normal), so some teachers cover
+  several times the average, and a few subjects have no teacher.
+
+Rows go in through executemany batches, so the search, counter and
+version triggers fire exactly as they do for API writes. The same
+``--seed`` always produces the same school.
+
+Usage: python -m benchmarks.seed --database sqlite:///./school_bench.db [--scale 0.1]
+"""
+import argparse
+import random
+import time
+from itertools import accumulate
+
+from sqlalchemy import insert
+
+from database import create_sqlite_engine
+from models import Class, Student, Subject, Teacher
+from schema import create_schema
+
+VOLUMES = {"classes": 1000, "students": 500_000, "teachers": 5000, "subjects": 50_000}
+BATCH_SIZE = 10_000
+
+DEPARTMENTS = [
+    "Mathematics", "Science", "English", "History", "Geography", "Art",
+    "Music", "Physical Education", "Computer Science", "Languages",
+]
+SUBJECT_NAMES = [
+    "Algebra", "Geometry", "Biology", "Chemistry", "Physics", "Literature",
+    "Writing", "World History", "Civics", "Geography", "Drawing", "Choir",
+    "Athletics", "Programming", "Spanish", "French",
+]
+# Share of rows whose optional foreign key is left empty.
+UNASSIGNED_STUDENTS = 0.03
+UNTAUGHT_SUBJECTS = 0.02
+
+
+def scaled(scale: float, **overrides) -> dict:
+    """``VOLUMES`` times ``scale`` (at least one of each), with overrides."""
+    volumes = {name: max(1, int(count * scale)) for name, count in VOLUMES.items()}
+    volumes.update({name: count for name, count in overrides.items() if count is not None})
+    return volumes
+
+
+def _phone(rng: random.Random):
+    return f"555-{rng.randrange(10000):04d}" if rng.random() < 0.8 else None
+
+
+def _insert(conn, model, rows) -> None:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(insert(model), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(model), batch)
+
+
+def seed_school(engine, volumes: dict = VOLUMES, seed: int = 0) -> dict:
+    """Insert a school of ``volumes`` into an empty database; return timings."""
+    rng = random.Random(seed)
+    timings = {}
+
+    def timed(name, model, rows):
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            _insert(conn, model, rows)
+        timings[name] = round(time.perf_counter() - start, 2)
+
+    n_classes, n_teachers = volumes["classes"], volumes["teachers"]
+    timed("classes", Class, (
+        {
+            "name": f"Grade {i // 8 % 12 + 1}-{i}",
+            "section": "ABCDEFGH"[i % 8],
+            "room_number": f"R{rng.randrange(100, 999)}" if rng.random() < 0.9 else None,
+        }
+        for i in range(n_classes)
+    ))
+    timed("teachers", Teacher, (
+        {
+            "name": f"Teacher {i}",
+            "email": f"teacher{i}@school.test",
+            "phone": _phone(rng),
+            "department": rng.choice(DEPARTMENTS),
+        }
+        for i in range(n_teachers)
+    ))
+
+    # Ids are assigned in insert order on an empty database.
+    class_ids = range(1, n_classes + 1)
+    class_weights = list(accumulate(max(0.2, rng.gauss(1, 0.3)) for _ in class_ids))
+    teacher_ids = range(1, n_teachers + 1)
+    teacher_weights = list(accumulate(rng.lognormvariate(0, 0.6) for _ in teacher_ids))
+
+    def student_class():
+        if rng.random() < UNASSIGNED_STUDENTS:
+            return None
+        return rng.choices(class_ids, cum_weights=class_weights)[0]
+
+    timed("students", Student, (
+        {
+            "name": f"Student {i}",
+            "email": f"student{i}@school.test",
+            "phone": _phone(rng),
+            "class_id": student_class(),
+        }
+        for i in range(volumes["students"])
+    ))
+
+    def subject_teacher():
+        if rng.random() < UNTAUGHT_SUBJECTS:
+            return None
+        return rng.choices(teacher_ids, cum_weights=teacher_weights)[0]
+
+    timed("subjects", Subject, (
+        {
+            "name": f"{rng.choice(SUBJECT_NAMES)} {i // n_classes + 1}",
+            "code": f"SUB{i:06d}",
+            # Round-robin with jitter keeps every class's share close.
+            "class_id": (i + rng.randrange(3)) % n_classes + 1,
+            "teacher_id": subject_teacher(),
+        }
+        for i in range(volumes["subjects"])
+    ))
+    return timings
+
+
+def create_database(url: str):
+    """A fresh engine on ``url`` with the full schema, triggers included."""
+    engine = create_sqlite_engine(url)
+    create_schema(engine)
+    return engine
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", required=True, help="SQLAlchemy URL of an empty database")
+    parser.add_argument("--scale", type=float, default=1.0)
+    for name in VOLUMES:
+        parser.add_argument(f"--{name}", type=int, help=f"override the scaled {name} count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    volumes = scaled(args.scale, **{name: getattr(args, name) for name in VOLUMES})
+    engine = create_database(args.database)
+    timings = seed_school(engine, volumes, args.seed)
+    engine.dispose()
+    for name, count in volumes.items():
+        print(f"{name:<9} {count:>8} rows in {timings[name]}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare list serialization paths on a large student list.
+
+Times, in-process and without HTTP, the ORM pipeline the routes used
+before (joinedload, one StudentResponse per row, then FastAPI's response
+validation and JSON dump) against the column-row serializer the list
+route now uses.
+
+Usage: python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from benchmarks.common import print_table
+from database import create_sqlite_engine
+from models import Class, Student
+from routes.students import list_students
+from schema import create_schema
+from schemas.student import StudentResponse
+
+
+def orm_models(db):
+    students = db.query(Student).options(joinedload(Student.student_class)).order_by(Student.id)
+    result = [
+        StudentResponse(
+            id=s.id,
+            name=s.name,
+            email=s.email,
+            phone=s.phone,
+            class_id=s.class_id,
+            class_name=s.student_class.name if s.student_class else None,
+        )
+        for s in students
+    ]
+    adapter = TypeAdapter(list[StudentResponse])
+    return adapter.dump_json(adapter.validate_python(result))
+
+
+def column_rows(db):
+    return list_students(
+        Response(), search=None, class_id=None, limit=None, after=None, fields=None, db=db
+    ).body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        create_schema(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(Class), [
+                {"name": f"Grade {i}", "section": "A"} for i in range(1, 21)
+            ])
+            conn.execute(insert(Student), [
+                {"name": f"Student {i}", "email": f"s{i}@bench.test",
+                 "phone": "555-0100", "class_id": i % 20 + 1}
+                for i in range(args.rows)
+            ])
+        Session = sessionmaker(bind=engine)
+
+        results, bodies = [], {}
+        for name, path in (("orm+models", orm_models), ("column rows", column_rows)):
+            samples = []
+            for _ in range(args.repeat):
+                with Session() as db:
+                    start = time.perf_counter()
+                    bodies[name] = path(db)
+                    samples.append((time.perf_counter() - start) * 1000)
+            results.append({
+                "path": name,
+                "rows": args.rows,
+                "bytes": len(bodies[name]),
+                "best_ms": round(min(samples), 1),
+                "mean_ms": round(sum(samples) / len(samples), 1),
+            })
+        engine.dispose()
+    assert bodies["orm+models"] == bodies["column rows"], "paths disagree"
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
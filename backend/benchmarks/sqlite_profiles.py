@@ -0,0 +1,42 @@
+"""Compare SQLite engine profiles under concurrent reads and writes.
+
+Usage: python -m benchmarks.sqlite_profiles [--reads 2000] [--writes 300]
+"""
+import argparse
+
+from benchmarks.common import print_table, run_mixed, seed, serve
+
+
+async def read(client, i):
+    return await client.get(f"/api/students/?class_id={i % 20 + 1}&limit=50")
+
+
+async def write(client, i):
+    return await client.post("/api/teachers/", json={
+        "name": f"Teacher {i}", "email": f"teacher{i}@bench.test",
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--writes", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--profiles", nargs="+", default=["default", "production"])
+    args = parser.parse_args(argv)
+
+    results = []
+    for profile in args.profiles:
+        with serve({"DB_PROFILE": profile}) as base_url:
+            seed(base_url)
+            outcome = run_mixed(base_url, {
+                "read": (read, args.reads, args.concurrency),
+                "write": (write, args.writes, max(1, args.concurrency // 4)),
+            })
+        for kind, stats in outcome.items():
+            results.append({"profile": profile, "kind": kind, **stats})
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Compare concurrent single-item writes with and without the write queue.
+
+Usage: python -m benchmarks.write_queue [--writes 1000] [--concurrency 32]
+"""
+import argparse
+
+from benchmarks.common import print_table, run_load, seed, serve
+
+
+async def write(client, i):
+    return await client.post("/api/students/", json={
+        "name": f"Queued {i}", "email": f"queued{i}@bench.test", "class_id": i % 20 + 1,
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--window-ms", default="2")
+    parser.add_argument("--profile", default="production")
+    args = parser.parse_args(argv)
+
+    results = []
+    for enabled in ("false", "true"):
+        env = {
+            "WRITE_QUEUE_ENABLED": enabled,
+            "WRITE_QUEUE_WINDOW_MS": args.window_ms,
+            "DB_PROFILE": args.profile,
+        }
+        with serve(env) as base_url:
+            seed(base_url)
+            stats = run_load(base_url, write, args.writes, args.concurrency)
+        results.append({"write_queue": enabled, **stats})
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
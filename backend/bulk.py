@@ -0,0 +1,157 @@
+"""Set-based create/update/delete shared by the bulk routes and importers.
+
+Every helper validates a whole batch with one query per constraint, writes
+it with a single executemany, and returns one ``BulkItemResult`` per input
+item. Callers own the transaction and must commit.
+"""
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from models import Class, Student, Subject, Teacher
+from schemas.bulk import BulkItemResult, BulkResponse
+
+# model -> (unique column, error detail)
+UNIQUE_FIELDS = {
+    Student: ("email", "Email already registered"),
+    Teacher: ("email", "Email already registered"),
+    Subject: ("code", "Subject code already exists"),
+}
+
+# model -> {foreign key column: (referenced model, error detail)}
+FOREIGN_KEYS = {
+    Student: {"class_id": (Class, "Class not found")},
+    Teacher: {},
+    Subject: {
+        "teacher_id": (Teacher, "Teacher not found"),
+        "class_id": (Class, "Class not found"),
+    },
+}
+
+# model -> columns an update may not set to null
+REQUIRED = {
+    model: tuple(
+        column.key for column in model.__table__.columns
+        if not column.nullable and not column.primary_key
+    )
+    for model in (Student, Teacher, Subject)
+}
+
+# model -> foreign key columns pointing at it. Deleting a row nulls them, as
+# the ORM does for the single-item routes.
+REFERENCED_BY = {
+    Student: (),
+    Teacher: (Subject.teacher_id,),
+    Subject: (),
+}
+
+NOT_FOUND = {
+    Student: "Student not found",
+    Teacher: "Teacher not found",
+    Subject: "Subject not found",
+}
+
+
+def _existing(db: Session, column, values) -> set:
+    values = {v for v in values if v is not None}
+    if not values:
+        return set()
+    return set(db.execute(select(column).where(column.in_(values))).scalars())
+
+
+def _check_foreign_keys(db: Session, model, rows: list[dict], errors: dict) -> None:
+    for field, (target, detail) in FOREIGN_KEYS[model].items():
+        # Falsy ids mean "no relation", as in the single-item routes.
+        found = _existing(db, target.id, (r.get(field) for r in rows if r.get(field)))
+        for i, row in enumerate(rows):
+            if i not in errors and row.get(field) and row[field] not in found:
+                errors[i] = detail
+
+
+def bulk_create(db: Session, model, rows: list[dict]) -> list[BulkItemResult]:
+    field, duplicate = UNIQUE_FIELDS[model]
+    errors = {}
+    taken = _existing(db, getattr(model, field), (r[field] for r in rows))
+    for i, row in enumerate(rows):
+        if row[field] in taken:
+            errors[i] = duplicate
+        taken.add(row[field])
+    _check_foreign_keys(db, model, rows, errors)
+
+    valid = [rows[i] for i in range(len(rows)) if i not in errors]
+    ids = {}
+    if valid:
+        db.execute(insert(model), valid)
+        # The unique column maps the new rows back to their generated ids.
+        column = getattr(model, field)
+        ids = dict(db.execute(
+            select(column, model.id).where(column.in_([r[field] for r in valid]))
+        ).all())
+    return [
+        BulkItemResult(index=i, status="error", detail=errors[i])
+        if i in errors
+        else BulkItemResult(index=i, id=ids[row[field]], status="created")
+        for i, row in enumerate(rows)
+    ]
+
+
+def bulk_update(db: Session, model, rows: list[dict]) -> list[BulkItemResult]:
+    field, duplicate = UNIQUE_FIELDS[model]
+    errors = {}
+    found = _existing(db, model.id, (r["id"] for r in rows))
+    for i, row in enumerate(rows):
+        nulls = [key for key in REQUIRED[model] if key in row and row[key] is None]
+        if row["id"] not in found:
+            errors[i] = NOT_FOUND[model]
+        elif nulls:
+            errors[i] = f"{nulls[0].capitalize()} cannot be null"
+
+    new_values = [r[field] for r in rows if r.get(field) is not None]
+    owners = {}
+    if new_values:
+        column = getattr(model, field)
+        owners = dict(db.execute(
+            select(column, model.id).where(column.in_(set(new_values)))
+        ).all())
+    for i, row in enumerate(rows):
+        value = row.get(field)
+        if i in errors or value is None:
+            continue
+        if owners.setdefault(value, row["id"]) != row["id"]:
+            errors[i] = duplicate
+    _check_foreign_keys(db, model, rows, errors)
+
+    valid = [rows[i] for i in range(len(rows)) if i not in errors]
+    if valid:
+        db.execute(update(model), valid)
+    return [
+        BulkItemResult(index=i, id=row["id"], status="error", detail=errors[i])
+        if i in errors
+        else BulkItemResult(index=i, id=row["id"], status="updated")
+        for i, row in enumerate(rows)
+    ]
+
+
+def bulk_delete(db: Session, model, ids: list[int]) -> list[BulkItemResult]:
+    found = _existing(db, model.id, ids)
+    if found:
+        for column in REFERENCED_BY[model]:
+            db.execute(update(column.class_).where(column.in_(found)).values({column.key: None}))
+        db.execute(delete(model).where(model.id.in_(found)))
+    results = []
+    for i, item_id in enumerate(ids):
+        if item_id in found:
+            results.append(BulkItemResult(index=i, id=item_id, status="deleted"))
+            # A repeated id is reported as missing the second time.
+            found.discard(item_id)
+        else:
+            results.append(BulkItemResult(
+                index=i, id=item_id, status="error", detail=NOT_FOUND[model]
+            ))
+    return results
+
+
+def summarize(results: list[BulkItemResult]) -> BulkResponse:
+    failed = sum(1 for r in results if r.status == "error")
+    return BulkResponse(
+        succeeded=len(results) - failed, failed=failed, results=results
+    )
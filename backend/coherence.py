@@ -0,0 +1,118 @@
+"""Keep per-process versions coherent across worker processes.
+
+Triggers count row changes per table in ``table_versions``. Each worker
+holds one dedicated connection and, before answering from its versions,
+asks SQLite for ``PRAGMA data_version``. The value only changes after
+another connection commits, so the common case costs one pragma and no
+I/O. When it does change, the worker re-reads ``table_versions`` and bumps
+its local version of every table whose counter moved, which invalidates
+the affected ETags and cached responses.
+
+A worker's own commits are seen by its watcher too and bump those tables
+a second time; that costs one extra cache miss per local write. They also
+make the next request poll even within the interval, because ETags are
+built from the counters the watcher last read.
+
+Counters restart from zero whenever the database is recreated, so the
+``_database_id`` row holds a random id, written once with the table, that
+namespaces them.
+"""
+import secrets
+import threading
+import time
+
+import versions
+
+WATCHED_TABLES = ("students", "teachers", "classes", "subjects")
+# The table_versions row whose version is the database's id.
+DATABASE_ID_ROW = "_database_id"
+
+
+def _triggers() -> list[str]:
+    statements = []
+    for table in WATCHED_TABLES:
+        bump = f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';"
+        for suffix, operation in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} "
+                f"AFTER {operation} ON {table} BEGIN {bump} END"
+            )
+    return statements
+
+
+def create_version_triggers(connection) -> None:
+    """Seed ``table_versions`` and create the triggers that bump it."""
+    if connection.dialect.name != "sqlite":
+        return
+    connection.exec_driver_sql(
+        f"INSERT OR IGNORE INTO table_versions(table_name, version) "
+        f"VALUES ('{DATABASE_ID_ROW}', {secrets.randbits(62)})"
+    )
+    for table in WATCHED_TABLES:
+        connection.exec_driver_sql(
+            f"INSERT OR IGNORE INTO table_versions(table_name, version) VALUES ('{table}', 0)"
+        )
+    for statement in _triggers():
+        connection.exec_driver_sql(statement)
+
+
+class VersionWatcher:
+    """Polls one database for commits made by other connections."""
+
+    def __init__(self, engine, interval: float = 0.0):
+        self.interval = interval
+        self.polls = 0
+        self.changes = 0
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        cparams["check_same_thread"] = False
+        self._connection = engine.dialect.connect(*cargs, **cparams)
+        self._lock = threading.Lock()
+        self._next_poll = 0.0
+        self._data_version = None
+        self._seen = self._read_versions()
+
+    def _read_versions(self) -> dict:
+        return dict(self._connection.execute(
+            "SELECT table_name, version FROM table_versions"
+        ).fetchall())
+
+    def poll(self) -> None:
+        if time.monotonic() < self._next_poll:
+            return
+        with self._lock:
+            self._next_poll = time.monotonic() + self.interval
+            self.polls += 1
+            data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return
+            self._data_version = data_version
+            current = self._read_versions()
+            changed = [t for t, v in current.items() if self._seen.get(t) != v]
+            if DATABASE_ID_ROW in changed:
+                # A different database: nothing read from the old one holds.
+                changed = list(WATCHED_TABLES)
+            self._seen = current
+        if changed:
+            self.changes += 1
+            versions.bump(*changed)
+
+    def counters(self) -> tuple:
+        """The database id and ``table_versions`` as of the last poll."""
+        seen = self._seen
+        return seen.get(DATABASE_ID_ROW), seen
+
+    def expire(self, tables=()) -> None:
+        """Poll on the next request regardless of the interval."""
+        self._next_poll = 0.0
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def watch(engine, interval: float) -> VersionWatcher:
+    """Start checking ``engine``'s database before versions are read."""
+    watcher = VersionWatcher(engine, interval)
+    versions.add_poller(watcher.poll)
+    versions.share_versions(watcher.counters)
+    versions.subscribe(watcher.expire)
+    return watcher
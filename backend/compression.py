@@ -0,0 +1,159 @@
+"""Compress response bodies the client can decode.
+
+``CompressionMiddleware`` picks the best encoding from ``Accept-Encoding``
+among those available: Brotli and zstd when their packages are installed,
+and gzip always. Whole bodies under ``COMPRESSION_MIN_SIZE`` are sent as is,
+since framing overhead outweighs the savings there. Streamed bodies, such
+as exports, are compressed chunk by chunk and flushed after each chunk so
+they keep streaming.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_ZSTD_LEVEL,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipEncoder:
+    def __init__(self, level: int = COMPRESSION_GZIP_LEVEL):
+        # wbits 31: deflate with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+class BrotliEncoder:
+    def __init__(self, level: int = COMPRESSION_BROTLI_QUALITY):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class ZstdEncoder:
+    def __init__(self, level: int = COMPRESSION_ZSTD_LEVEL):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        mode = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH if final
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+# Available encodings, most preferred first.
+ENCODERS = {}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+ENCODERS["gzip"] = GzipEncoder
+
+
+def negotiate(accept_encoding: str, available=ENCODERS) -> Optional[str]:
+    """The available encoding the client ranks highest, ties going to ours."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights["gzip" if coding == "x-gzip" else coding] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compressible(status: int, headers: Headers) -> bool:
+    if status < 200 or status in (204, 304) or "content-encoding" in headers:
+        return False
+    media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith(("json", "xml", "javascript"))
+
+
+class CompressionMiddleware:
+    def __init__(self, app, min_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        # The start message is held until the first body chunk shows whether
+        # the body is small or streamed.
+        start, encoder = None, None
+
+        async def compress(message):
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=list(start["headers"]))
+                if compressible(start["status"], headers):
+                    # The representation depends on Accept-Encoding even
+                    # when this one goes out uncompressed.
+                    headers.add_vary_header("Accept-Encoding")
+                    if coding is not None and (more_body or len(body) >= self.min_size):
+                        encoder = ENCODERS[coding]()
+                        headers["content-encoding"] = coding
+                        # Byte-for-byte different from the identity body.
+                        etag = headers.get("etag")
+                        if etag and not etag.startswith("W/"):
+                            headers["etag"] = f"W/{etag}"
+                        if "content-length" in headers:
+                            del headers["content-length"]
+                        body = encoder.compress(body, final=not more_body)
+                        if not more_body:
+                            headers["content-length"] = str(len(body))
+                await send({**start, "headers": headers.raw})
+                start = None
+            elif encoder is not None:
+                body = encoder.compress(body, final=not more_body)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, compress)
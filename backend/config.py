@@ -0,0 +1,70 @@
+import os
+
+# Every setting can be overridden through the environment.
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./school_management.db")
+
+# "sync" serves the CRUD routers from the threadpool with a sync Session,
+# "async" serves them on the event loop through aiosqlite.
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+# SQLite tuning profile applied to every connection, see database.SQLITE_PROFILES.
+DB_PROFILE = os.getenv("DB_PROFILE", "production")
+# Keep the pool at least as large as Starlette's threadpool (40 threads) so
+# sync handlers never wait on each other for a connection.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "40"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+
+# Reads go to a separate pool of read-only connections. By default they open
+# DATABASE_URL in read-only mode; point this at a replica file to offload them.
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "40"))
+
+# Serialize mutations through one writer thread per engine and group-commit
+# those arriving within the window, see write_queue.py.
+WRITE_QUEUE_ENABLED = os.getenv("WRITE_QUEUE_ENABLED", "false").lower() in ("1", "true", "yes")
+WRITE_QUEUE_WINDOW_MS = float(os.getenv("WRITE_QUEUE_WINDOW_MS", "2"))
+WRITE_QUEUE_MAX_BATCH = int(os.getenv("WRITE_QUEUE_MAX_BATCH", "64"))
+
+# In-process cache of serialized GET responses, see response_cache.py.
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Detect writes by other worker processes before serving cached responses
+# or ETags, see coherence.py. 0 checks on every request.
+COHERENCE_ENABLED = os.getenv("COHERENCE_ENABLED", "true").lower() in ("1", "true", "yes")
+COHERENCE_POLL_MS = float(os.getenv("COHERENCE_POLL_MS", "0"))
+
+# Response compression, see compression.py. Bodies smaller than
+# COMPRESSION_MIN_SIZE bytes go out as is; streamed bodies are always
+# compressed. Brotli and zstd are used when their packages are installed.
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+# Prometheus metrics at GET /metrics, see metrics.py.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Debug mode adds diagnostics to responses, e.g. SQL counts as headers.
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+
+# Per-request SQL accounting, see query_audit.py. A statement run this many
+# times in one request is logged as a likely N+1.
+QUERY_AUDIT_ENABLED = os.getenv("QUERY_AUDIT_ENABLED", "true").lower() in ("1", "true", "yes")
+QUERY_AUDIT_REPEAT_THRESHOLD = int(os.getenv("QUERY_AUDIT_REPEAT_THRESHOLD", "5"))
+
+# Request profiling, see profiling.py. Requests sending X-Profile-Token with
+# this value and X-Profile: 1 (or ?profile=1) are profiled; unset disables it.
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+# Fraction of all requests profiled continuously, 0 to 1.
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Sampling interval. Below the interpreter's switch interval (5 ms by
+# default) the sampler mostly contends with requests for the GIL.
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "100"))
+# Also write reports here as <id>.json, so every worker process can serve them.
+PROFILE_DIR = os.getenv("PROFILE_DIR")
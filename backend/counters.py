@@ -0,0 +1,74 @@
+from sqlalchemy import text
+
+
+TOTAL_SCOPES = ("students", "teachers", "classes", "subjects")
+
+# (child table, foreign key column, per-parent scope)
+GROUPED_SCOPES = (
+    ("students", "class_id", "class_students"),
+    ("subjects", "teacher_id", "teacher_subjects"),
+)
+
+
+def _bump(scope: str, ref: str, delta: int) -> str:
+    return (
+        f"INSERT INTO stat_counters(scope, ref_id, count) "
+        f"SELECT '{scope}', {ref}, {delta} WHERE {ref} IS NOT NULL "
+        f"ON CONFLICT(scope, ref_id) DO UPDATE SET count = count + ({delta});"
+    )
+
+
+def _triggers() -> list[str]:
+    statements = []
+    for table in TOTAL_SCOPES:
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_count_ai AFTER INSERT ON {table} "
+            f"BEGIN {_bump(table, '0', 1)} END"
+        )
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_count_ad AFTER DELETE ON {table} "
+            f"BEGIN {_bump(table, '0', -1)} END"
+        )
+    for table, column, scope in GROUPED_SCOPES:
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {scope}_count_ai AFTER INSERT ON {table} "
+            f"BEGIN {_bump(scope, f'new.{column}', 1)} END"
+        )
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {scope}_count_ad AFTER DELETE ON {table} "
+            f"BEGIN {_bump(scope, f'old.{column}', -1)} END"
+        )
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {scope}_count_au "
+            f"AFTER UPDATE OF {column} ON {table} "
+            f"WHEN old.{column} IS NOT new.{column} BEGIN "
+            f"{_bump(scope, f'old.{column}', -1)} {_bump(scope, f'new.{column}', 1)} END"
+        )
+    return statements
+
+
+def recount(connection) -> None:
+    """Rebuild every counter from the base tables."""
+    connection.exec_driver_sql("DELETE FROM stat_counters")
+    for table in TOTAL_SCOPES:
+        connection.exec_driver_sql(
+            f"INSERT INTO stat_counters(scope, ref_id, count) "
+            f"SELECT '{table}', 0, COUNT(*) FROM {table}"
+        )
+    for table, column, scope in GROUPED_SCOPES:
+        connection.exec_driver_sql(
+            f"INSERT INTO stat_counters(scope, ref_id, count) "
+            f"SELECT '{scope}', {column}, COUNT(*) FROM {table} "
+            f"WHERE {column} IS NOT NULL GROUP BY {column}"
+        )
+
+
+def create_counter_triggers(connection) -> None:
+    """Create the counter triggers, seeding the counters on first use."""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in _triggers():
+        connection.exec_driver_sql(statement)
+    # Seed counters for databases that predate the counters table.
+    if connection.execute(text("SELECT 1 FROM stat_counters LIMIT 1")).first() is None:
+        recount(connection)
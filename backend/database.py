@@ -1,13 +1,106 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./school_management.db"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+from config import (
+    DATABASE_URL,
+    DB_BUSY_TIMEOUT_MS,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_PROFILE,
+    DB_READ_POOL_SIZE,
+    READ_DATABASE_URL,
 )
 
+SQLALCHEMY_DATABASE_URL = DATABASE_URL
+
+# PRAGMAs issued on every new connection, by profile.
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        # Readers no longer block behind the writer and vice versa.
+        "journal_mode": "WAL",
+        # Safe with WAL: only the last transactions can be lost on power loss.
+        "synchronous": "NORMAL",
+        "busy_timeout": DB_BUSY_TIMEOUT_MS,
+        "mmap_size": 256 * 1024 * 1024,
+        # Negative values are KiB: 64 MiB of page cache per connection.
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def apply_pragmas(dbapi_connection, profile: str, readonly: bool = False) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PROFILES[profile].items():
+            # The journal mode is a property of the file, set by the writer.
+            if readonly and name == "journal_mode":
+                continue
+            cursor.execute(f"PRAGMA {name} = {value}")
+        if readonly:
+            cursor.execute("PRAGMA query_only = 1")
+    finally:
+        cursor.close()
+
+
+def engine_options(profile: str, readonly: bool = False) -> dict:
+    """Pool settings for ``create_engine`` under ``profile``."""
+    if profile == "default":
+        return {}
+    return {
+        "pool_size": DB_READ_POOL_SIZE if readonly else DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
+
+
+def configure_engine(engine, profile: str = DB_PROFILE, readonly: bool = False):
+    """Apply ``profile``'s PRAGMAs to every connection ``engine`` opens."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, profile, readonly)
+        # Let SQLAlchemy, not the driver, decide when transactions begin so
+        # SAVEPOINTs nest inside them (the write queue relies on this).
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        # Writers take the write lock up front instead of failing to
+        # upgrade a read lock halfway through the transaction.
+        conn.exec_driver_sql("BEGIN" if readonly else "BEGIN IMMEDIATE")
+
+    return engine
+
+
+def create_sqlite_engine(url: str, profile: str = DB_PROFILE, readonly: bool = False):
+    return configure_engine(
+        create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            **engine_options(profile, readonly),
+        ),
+        profile,
+        readonly,
+    )
+
+
+def read_only_url(url: str) -> str:
+    """Open the same SQLite file through a ``mode=ro`` URI."""
+    parsed = make_url(url)
+    if parsed.database in (None, "", ":memory:") or "uri" in parsed.query:
+        return url
+    return f"sqlite:///file:{parsed.database}?mode=ro&uri=true"
+
+
+SQLALCHEMY_READ_DATABASE_URL = READ_DATABASE_URL or read_only_url(SQLALCHEMY_DATABASE_URL)
+
+engine = create_sqlite_engine(SQLALCHEMY_DATABASE_URL)
+read_engine = create_sqlite_engine(SQLALCHEMY_READ_DATABASE_URL, readonly=True)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
@@ -18,3 +111,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Session on the read-only pool, for handlers that never write."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
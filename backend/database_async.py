@@ -0,0 +1,58 @@
+from functools import lru_cache
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from config import DB_PROFILE
+from database import (
+    SQLALCHEMY_DATABASE_URL,
+    SQLALCHEMY_READ_DATABASE_URL,
+    configure_engine,
+    engine_options,
+)
+
+
+def async_url(url: str) -> str:
+    """Point a sync ``sqlite://`` URL at the aiosqlite driver."""
+    return make_url(url).set(drivername="sqlite+aiosqlite").render_as_string(
+        hide_password=False
+    )
+
+
+@lru_cache(maxsize=None)
+def get_async_engine():
+    # Created on first use so the sync mode never needs aiosqlite installed.
+    engine = create_async_engine(
+        async_url(SQLALCHEMY_DATABASE_URL), **engine_options(DB_PROFILE)
+    )
+    configure_engine(engine.sync_engine, DB_PROFILE)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_async_read_engine():
+    engine = create_async_engine(
+        async_url(SQLALCHEMY_READ_DATABASE_URL),
+        **engine_options(DB_PROFILE, readonly=True),
+    )
+    configure_engine(engine.sync_engine, DB_PROFILE, readonly=True)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker(readonly: bool = False):
+    return async_sessionmaker(
+        get_async_read_engine() if readonly else get_async_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with get_async_sessionmaker(readonly=True)() as db:
+        yield db
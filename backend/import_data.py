@@ -0,0 +1,55 @@
+"""Load a CSV or NDJSON roster file into the database in bounded chunks.
+
+Usage: python import_data.py students roster.csv [--format csv] [--chunk-size 1000]
+"""
+import argparse
+import sys
+
+from database import SessionLocal, engine
+from importer import DEFAULT_CHUNK_SIZE, FORMATS, IMPORTABLE, run_import
+from schema import create_schema
+
+READ_SIZE = 1 << 16
+
+
+def read_chunks(path: str):
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            yield chunk
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("entity", choices=sorted(IMPORTABLE))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, dest="fmt")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    fmt = args.fmt or ("csv" if args.path.endswith(".csv") else "ndjson")
+
+    create_schema(engine)
+
+    def progress(summary):
+        print(
+            f"\r{summary.processed} rows, {summary.created} created, "
+            f"{summary.failed} failed",
+            end="", file=sys.stderr, flush=True,
+        )
+
+    db = SessionLocal()
+    try:
+        summary = run_import(
+            db, args.entity, read_chunks(args.path), fmt, args.chunk_size, progress
+        )
+    finally:
+        db.close()
+    print(file=sys.stderr)
+    for error in summary.errors:
+        print(f"row {error.row}: {error.detail}", file=sys.stderr)
+    if summary.errors_truncated:
+        print("(further errors omitted)", file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
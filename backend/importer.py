@@ -0,0 +1,129 @@
+"""Incremental CSV/NDJSON roster import shared by the upload route and CLI.
+
+Input arrives as an iterator of byte chunks and is parsed lazily, so only
+one chunk of rows is held in memory at a time. Each chunk is validated
+against the entity's create schema, written with ``bulk.bulk_create`` and
+committed before the next chunk is read.
+"""
+import codecs
+import csv
+import json
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from bulk import bulk_create
+from models import Student, Subject, Teacher
+from schemas.imports import ImportRowError, ImportSummary
+from schemas.student import StudentCreate
+from schemas.subject import SubjectCreate
+from schemas.teacher import TeacherCreate
+
+IMPORTABLE = {
+    "students": (Student, StudentCreate),
+    "teachers": (Teacher, TeacherCreate),
+    "subjects": (Subject, SubjectCreate),
+}
+FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 1000
+# Per-row errors kept in the summary; the counts stay exact past this.
+MAX_REPORTED_ERRORS = 1000
+
+
+@dataclass(frozen=True)
+class ParseError:
+    """A row that could not be parsed at all, as opposed to an invalid one."""
+    detail: str
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode UTF-8 byte chunks into lines, keeping line endings."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        # The last piece may be an incomplete line; hold it for the next chunk.
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def iter_records(chunks: Iterable[bytes], fmt: str) -> Iterator[tuple[int, object]]:
+    """Yield ``(row number, record)`` pairs; a record is the parsed value or a
+    ``ParseError``."""
+    lines = iter_lines(chunks)
+    if fmt == "csv":
+        for number, record in enumerate(csv.DictReader(lines), start=1):
+            # Empty cells mean "not provided" for optional columns.
+            yield number, {k: (v if v != "" else None) for k, v in record.items()}
+        return
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError as exc:
+            yield number, ParseError(f"Invalid JSON: {exc}")
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+def run_import(
+    db: Session,
+    entity: str,
+    chunks: Iterable[bytes],
+    fmt: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_progress: Optional[Callable[[ImportSummary], None]] = None,
+) -> ImportSummary:
+    model, schema = IMPORTABLE[entity]
+    summary = ImportSummary(entity=entity)
+    batch: list[tuple[int, dict]] = []
+
+    def record_error(row: int, detail: str) -> None:
+        summary.failed += 1
+        if len(summary.errors) < MAX_REPORTED_ERRORS:
+            summary.errors.append(ImportRowError(row=row, detail=detail))
+        else:
+            summary.errors_truncated = True
+
+    def flush() -> None:
+        results = bulk_create(db, model, [data for _, data in batch])
+        db.commit()
+        for (row, _), result in zip(batch, results):
+            if result.status == "created":
+                summary.created += 1
+            else:
+                record_error(row, result.detail)
+        summary.chunks += 1
+        batch.clear()
+        if on_progress:
+            on_progress(summary)
+
+    for row, record in iter_records(chunks, fmt):
+        summary.processed += 1
+        if isinstance(record, ParseError):
+            record_error(row, record.detail)
+            continue
+        try:
+            batch.append((row, schema.model_validate(record).model_dump()))
+        except ValidationError as exc:
+            record_error(row, _validation_detail(exc))
+            continue
+        if len(batch) >= chunk_size:
+            flush()
+    if batch:
+        flush()
+    summary.errors.sort(key=lambda e: e.row)
+    return summary
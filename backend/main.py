@@ -1,15 +1,52 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from database import engine, Base
-from routes import students, teachers, classes, subjects, auth
+import coherence
+import metrics
+from compression import CompressionMiddleware
+from config import (
+    CACHE_ENABLED, COHERENCE_ENABLED, COHERENCE_POLL_MS, COMPRESSION_ENABLED, DB_MODE,
+    METRICS_ENABLED, PROFILE_SAMPLE_RATE, PROFILING_TOKEN, QUERY_AUDIT_ENABLED,
+)
+from database import engine, read_engine
+from pagination import NEXT_CURSOR_HEADER
+from profiling import PROFILE_ID_HEADER, ProfilingMiddleware
+from query_audit import QueryAuditMiddleware
+from response_cache import ResponseCacheMiddleware
+from routes import auth, stats, imports, exports, profiles
+from schema import create_schema
+
+if DB_MODE == "async":
+    from routes_async import students, teachers, classes, subjects
+else:
+    from routes import students, teachers, classes, subjects
+
+# Create all tables, with their search indexes and triggers
+create_schema(engine)
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Picks up writes made by other worker processes sharing the database file
+if COHERENCE_ENABLED and engine.url.database not in (None, "", ":memory:"):
+    coherence.watch(read_engine, COHERENCE_POLL_MS / 1000)
 
 
 app = FastAPI(title="School Management API", version="1.0.0")
 
+# Added first so it sits inside CORS and replayed responses get CORS headers
+if CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware)
+
+# Outside the cache, which stores identity bodies and serves every encoding
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Outside the cache, so cache hits are audited as the zero statements they run
+if QUERY_AUDIT_ENABLED:
+    app.add_middleware(QueryAuditMiddleware)
+
+# Outside the cache, which on-demand profiles bypass
+if PROFILING_TOKEN or PROFILE_SAMPLE_RATE:
+    app.add_middleware(ProfilingMiddleware)
+
 # CORS middleware for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -17,14 +54,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", PROFILE_ID_HEADER],
 )
 
+# Outermost, so latency covers every other middleware and cache hits
+if METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.watch_pool("write", engine)
+    metrics.watch_pool("read", read_engine)
+    if DB_MODE == "async":
+        from database_async import get_async_engine, get_async_read_engine
+
+        metrics.watch_pool("async_write", get_async_engine().sync_engine)
+        metrics.watch_pool("async_read", get_async_read_engine().sync_engine)
+
 # Register routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(students.router, prefix="/api/students", tags=["Students"])
 app.include_router(teachers.router, prefix="/api/teachers", tags=["Teachers"])
 app.include_router(classes.router, prefix="/api/classes", tags=["Classes"])
 app.include_router(subjects.router, prefix="/api/subjects", tags=["Subjects"])
+app.include_router(stats.router, prefix="/api/stats", tags=["Stats"])
+app.include_router(imports.router, prefix="/api/import", tags=["Import"])
+app.include_router(exports.router, prefix="/api/export", tags=["Export"])
+app.include_router(profiles.router, prefix="/api/profiles", tags=["Profiling"])
 
 
 @app.get("/health")
@@ -32,6 +85,11 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/api")
 def api_root():
     return {
@@ -42,5 +100,6 @@ def api_root():
             "teachers": "/api/teachers",
             "classes": "/api/classes",
             "subjects": "/api/subjects",
+            "stats": "/api/stats",
         },
     }
@@ -0,0 +1,379 @@
+"""Request and database metrics in the Prometheus text exposition format.
+
+``MetricsMiddleware`` records, per method and route template, request
+counts by status, a latency histogram, and histograms of the SQL
+statements each request ran and the time they took. It also tracks
+in-flight requests. Statements are attributed to the request's
+``RequestDB`` through a context variable, which Starlette copies into the
+threadpool that runs sync handlers and streamed bodies. Statements run on
+the write queue's thread count toward no request.
+
+``RequestDB`` is the app's one per-request SQL recorder. The N+1 audit
+(query_audit.py) and the profiler (profiling.py) read it through
+``recording()``, which reuses the recorder of an outer middleware.
+
+``render()`` produces the ``GET /metrics`` body. It adds connection pool
+gauges for every engine passed to ``watch_pool`` and the response cache
+counters. Everything is kept in-process with no client library, so each
+worker process exposes its own numbers.
+"""
+import re
+import threading
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import QUERY_AUDIT_REPEAT_THRESHOLD
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Requests that match no route share one label, so scanners probing random
+# paths cannot grow the label set.
+UNMATCHED = "unmatched"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, key)} {_number(value)}"
+            for key, value in values
+        ]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # labels -> [per-bucket counts..., sum, count]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = self.header()
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}"
+                )
+            labels = _labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_number(values[-2])}")
+            lines.append(f"{self.name}_count{labels} {values[-1]}")
+        return lines
+
+
+requests_total = Counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+)
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time to send the whole response.", ("method", "route")
+)
+requests_in_flight = Gauge("http_requests_in_flight", "Requests being served.")
+requests_in_flight.inc(amount=0)
+request_db_queries = Histogram(
+    "http_request_db_queries", "SQL statements run per request.", ("method", "route"),
+    buckets=QUERY_BUCKETS,
+)
+request_db_seconds = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per request.", ("method", "route")
+)
+pool_checkouts = Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool.", ("pool",)
+)
+
+REGISTRY: list[Metric] = [
+    requests_total, request_duration, requests_in_flight,
+    request_db_queries, request_db_seconds, pool_checkouts,
+]
+# Extra sources of exposition lines, read on every scrape.
+COLLECTORS: list[Callable[[], list[str]]] = []
+
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_NAMED = re.compile(r"(?<!:):\w+|%\(\w+\)s|\$\d+|%s")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize(statement: str) -> str:
+    """``statement`` with literals and parameters replaced by ``?`` and
+    expanded ``IN`` lists folded into one."""
+    sql = _STRING.sub("?", statement)
+    sql = _NAMED.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def group_statements(statements: Iterable[str]) -> StatementCounter:
+    """Run counts by normalized SQL, from a list of statements or a counter
+    of them."""
+    groups = StatementCounter()
+    for statement, count in StatementCounter(statements).items():
+        groups[normalize(statement)] += count
+    return groups
+
+
+@dataclass
+class RequestDB:
+    # "METHOD /path" of the request, for log lines and tests.
+    label: str = ""
+    queries: int = 0
+    seconds: float = 0.0
+    # Statement text -> times run, executemany batches left out. Grouped by
+    # normalized SQL only when read, see group_statements.
+    statements: StatementCounter = field(default_factory=StatementCounter)
+    # Kept only once a profiler sets them: (start, seconds, statement,
+    # executemany) per statement, and the threads that ran statements.
+    timeline: Optional[list] = None
+    threads: Optional[set] = None
+
+    def repeated(self, threshold: int = QUERY_AUDIT_REPEAT_THRESHOLD) -> dict[str, int]:
+        """Normalized statements run at least ``threshold`` times, most
+        frequent first."""
+        return {
+            sql: count
+            for sql, count in group_statements(self.statements).most_common()
+            if count >= threshold
+        }
+
+
+_current: ContextVar[Optional[RequestDB]] = ContextVar("metrics_request_db", default=None)
+
+
+@contextmanager
+def recording(label: str = ""):
+    """The current request's ``RequestDB``, created here unless an outer
+    middleware already records the request."""
+    stats = _current.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = RequestDB(label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+    stats = _current.get()
+    if stats is not None and stats.threads is not None:
+        stats.threads.add(threading.get_ident())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("metrics_started")
+    if not started:
+        return
+    start = started.pop()
+    elapsed = time.perf_counter() - start
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.seconds += elapsed
+    if not executemany:
+        stats.statements[statement] += 1
+    if stats.timeline is not None:
+        stats.timeline.append((start, elapsed, statement, executemany))
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(context):
+    # A failed statement never reaches after_cursor_execute.
+    if context.connection is not None:
+        started = context.connection.info.get("metrics_started")
+        if started:
+            started.pop()
+
+
+_POOL_GAUGES = (
+    ("db_pool_size", "Connections the pool keeps open.", "size"),
+    ("db_pool_checked_out", "Connections currently in use.", "checkedout"),
+    ("db_pool_checked_in", "Idle connections in the pool.", "checkedin"),
+    ("db_pool_overflow", "Connections open beyond the pool size.", "overflow"),
+)
+_pools: dict[str, object] = {}
+
+
+def watch_pool(name: str, engine) -> None:
+    """Export ``engine``'s pool gauges and checkout count as ``pool=name``."""
+    if name in _pools:
+        return
+    _pools[name] = engine.pool
+    event.listen(engine, "checkout", lambda *args: pool_checkouts.inc(name))
+
+
+def _pool_lines() -> list[str]:
+    lines = []
+    for metric, help, method in _POOL_GAUGES:
+        # Pools other than QueuePool (e.g. StaticPool) do not size themselves.
+        values = [
+            (name, getattr(pool, method)())
+            for name, pool in sorted(_pools.items())
+            if hasattr(pool, method)
+        ]
+        if values:
+            lines += [f"# HELP {metric} {help}", f"# TYPE {metric} gauge"]
+            lines += [f'{metric}{{pool="{_escape(name)}"}} {value}' for name, value in values]
+    return lines
+
+
+def _cache_lines() -> list[str]:
+    from response_cache import response_cache
+
+    stats = response_cache.stats()
+    lines = []
+    for key in ("hits", "misses", "evictions", "invalidations", "expirations"):
+        name = f"response_cache_{key}_total"
+        lines += [f"# HELP {name} Response cache {key}.", f"# TYPE {name} counter",
+                  f"{name} {stats[key]}"]
+    for key, help in (("entries", "Cached responses."), ("size_bytes", "Bytes of cached bodies.")):
+        name = f"response_cache_{key}"
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {stats[key]}"]
+    return lines
+
+
+COLLECTORS += [_pool_lines, _cache_lines]
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    for collect in COLLECTORS:
+        lines += collect()
+    return "\n".join(lines) + "\n"
+
+
+def route_template(scope) -> str:
+    """The path pattern of the route that served ``scope``, e.g.
+    ``/api/students/{student_id}``."""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED
+    # FastAPI resolves included routers lazily, so the route may carry its
+    # path relative to the router's prefix. Prefixes are static, so they
+    # are the request path's leading segments.
+    inner = [segment for segment in template.split("/") if segment]
+    actual = [segment for segment in scope["path"].split("/") if segment]
+    prefix = actual[:max(0, len(actual) - len(inner))]
+    path = "/" + "/".join(prefix + inner)
+    return path + "/" if template.endswith("/") and path != "/" else path
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        requests_in_flight.inc()
+        start = time.perf_counter()
+
+        async def record_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            with recording(f"{scope['method']} {scope['path']}") as stats:
+                await self.app(scope, receive, record_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            requests_in_flight.dec()
+            method = scope["method"]
+            route = route_template(scope)
+            requests_total.inc(method, route, str(status))
+            request_duration.observe(elapsed, method, route)
+            request_db_queries.observe(stats.queries, method, route)
+            request_db_seconds.observe(stats.seconds, method, route)
@@ -0,0 +1,66 @@
+"""Incremental schema changes for databases created by older releases.
+
+``Base.metadata.create_all`` only creates missing tables, so anything added
+to an existing table (such as an index) is declared here as a named step.
+Each step runs once per database and is recorded in ``schema_migrations``.
+
+Run against the default database with ``python migrations.py``.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from database import Base, engine as default_engine
+
+
+def create_indexes(*names: str):
+    """Step that creates the named model indexes if they do not exist yet."""
+
+    def step(connection):
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in names:
+                    index.create(connection, checkfirst=True)
+
+    return step
+
+
+MIGRATIONS = [
+    (
+        "0001_filter_indexes",
+        create_indexes(
+            "ix_students_class_id",
+            "ix_subjects_teacher_id",
+            "ix_subjects_class_id",
+            "ix_teachers_department",
+        ),
+    ),
+]
+
+
+def run_migrations(engine=default_engine) -> list[str]:
+    """Apply pending migrations in order and return the names applied."""
+    applied = []
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "name VARCHAR PRIMARY KEY, applied_at VARCHAR NOT NULL)"
+        ))
+        done = set(conn.execute(text("SELECT name FROM schema_migrations")).scalars())
+        for name, step in MIGRATIONS:
+            if name in done:
+                continue
+            step(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (name, applied_at) VALUES (:n, :t)"),
+                {"n": name, "t": datetime.now(timezone.utc).isoformat()},
+            )
+            applied.append(name)
+    return applied
+
+
+if __name__ == "__main__":
+    import models  # noqa: F401  registers the tables on Base.metadata
+
+    for name in run_migrations():
+        print(f"applied {name}")
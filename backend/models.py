@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -38,6 +38,11 @@ class Teacher(Base):
 
     subjects = relationship("Subject", back_populates="teacher")
 
+    # The department filter matches case-insensitively.
+    __table_args__ = (
+        Index("ix_teachers_department", department.collate("NOCASE")),
+    )
+
 
 class Student(Base):
     __tablename__ = "students"
@@ -46,7 +51,7 @@ class Student(Base):
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
     phone = Column(String, nullable=True)
-    class_id = Column(Integer, ForeignKey("classes.id"), nullable=True)
+    class_id = Column(Integer, ForeignKey("classes.id"), nullable=True, index=True)
 
     student_class = relationship("Class", back_populates="students")
 
@@ -57,8 +62,28 @@ class Subject(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     code = Column(String, unique=True, nullable=False)
-    teacher_id = Column(Integer, ForeignKey("teachers.id"), nullable=True)
-    class_id = Column(Integer, ForeignKey("classes.id"), nullable=True)
+    teacher_id = Column(Integer, ForeignKey("teachers.id"), nullable=True, index=True)
+    class_id = Column(Integer, ForeignKey("classes.id"), nullable=True, index=True)
 
     teacher = relationship("Teacher", back_populates="subjects")
     subject_class = relationship("Class", back_populates="subjects")
+
+
+class StatCounter(Base):
+    __tablename__ = "stat_counters"
+
+    # scope is an entity total ("students", ...) with ref_id 0, or a
+    # per-parent count ("class_students", "teacher_subjects") keyed by ref_id.
+    scope = Column(String, primary_key=True)
+    ref_id = Column(Integer, primary_key=True, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    # Bumped by triggers on every row change, so each worker process can
+    # tell which tables another process wrote to. The ``_database_id`` row
+    # holds a random id instead, see coherence.py.
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,70 @@
+import base64
+import json
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Values are bound as SQL parameters; anything else fails in the driver.
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def apply_keyset(query, keys: list, limit: Optional[int], after: Optional[str]):
+    """Seek ``query`` past the ``after`` cursor and order it by ``keys``.
+
+    Works on both ORM queries and ``select()`` statements. The last key must
+    be unique (normally the primary key) so the order is total. One row more
+    than ``limit`` is fetched so ``page_rows`` can tell whether more follow.
+    """
+    if after:
+        values = decode_cursor(after, len(keys))
+        if len(keys) == 1:
+            query = query.filter(keys[0] > values[0])
+        else:
+            query = query.filter(tuple_(*keys) > tuple_(*values))
+    query = query.order_by(*keys)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def page_rows(rows: list, keys: list, limit: Optional[int], response: Response) -> list:
+    """Trim the lookahead row and set ``X-Next-Cursor`` when more rows follow."""
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(rows[-1], key.key) for key in keys]
+        )
+    return rows
+
+
+def paginate(
+    query,
+    keys: list,
+    limit: Optional[int],
+    after: Optional[str],
+    response: Response,
+):
+    """Return one page of ``query`` ordered by ``keys``."""
+    rows = apply_keyset(query, keys, limit, after).all()
+    return page_rows(rows, keys, limit, response)
@@ -0,0 +1,395 @@
+"""Opt-in profiling of single requests.
+
+A request is profiled on demand when it carries ``X-Profile: 1`` or
+``?profile=1`` together with ``X-Profile-Token: <PROFILING_TOKEN>``. A
+wrong token gets a 403, and without a configured token the flag is
+ignored. On-demand requests bypass the response cache so the route
+actually runs. ``PROFILE_SAMPLE_RATE`` also profiles that fraction of all
+other requests, cache hits included, without allocation tracking.
+
+Each profile records:
+
+- a call tree from a sampling profiler. One background thread, shared by
+  every profile in progress, reads the stacks of the threads serving each
+  request every ``PROFILE_INTERVAL_MS``. Those are the event loop thread,
+  which also runs other requests' coroutines, and any threadpool thread
+  that executed one of the request's statements, until that thread is
+  seen back in its pool;
+- a timeline of the request's SQL statements;
+- for on-demand requests, the allocations still alive at the end of the
+  request, by line, and the traced peak. tracemalloc is process-wide, so
+  concurrent requests show up here too.
+
+Reports are kept in memory, the last ``PROFILE_KEEP`` of them, and also
+written to ``PROFILE_DIR`` as JSON when it is set, so any worker process
+can serve them. The ``X-Profile-Id`` response header names the report,
+which ``GET /api/profiles/{id}`` returns.
+"""
+import json
+import random
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+import metrics
+from config import (
+    PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_KEEP, PROFILE_SAMPLE_RATE, PROFILING_TOKEN,
+)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+# Entries of the call tree's "top" list and the allocation summary.
+TOP_ENTRIES = 25
+MAX_SQL_LENGTH = 500
+
+
+def authorized(token: Optional[str]) -> bool:
+    """Whether ``token`` is the configured profiling token."""
+    return bool(PROFILING_TOKEN) and token is not None and secrets.compare_digest(
+        token.encode(), PROFILING_TOKEN.encode()
+    )
+
+
+def requested(scope) -> bool:
+    """Whether the request asks to be profiled, by header or query flag."""
+    if Headers(scope=scope).get(PROFILE_HEADER) in ("1", "true"):
+        return True
+    query = scope.get("query_string", b"").decode("latin-1")
+    return any(key == "profile" and value in ("1", "true") for key, value in parse_qsl(query))
+
+
+def _label(code) -> str:
+    path = Path(code.co_filename)
+    return f"{code.co_name} ({path.parent.name}/{path.name}:{code.co_firstlineno})"
+
+
+def _parked(stack: list) -> bool:
+    """Whether a thread is idle: a threadpool worker waiting on its queue, or
+    the event loop waiting in select."""
+    leaf = stack[-1]
+    if leaf.co_name == "select" and leaf.co_filename.endswith("selectors.py"):
+        return True
+    return any(
+        caller.co_name == "run" and callee.co_name == "get"
+        and callee.co_filename.endswith("queue.py")
+        for caller, callee in zip(stack, stack[1:])
+    )
+
+
+class Profile:
+    """What one request's profile collects while the request runs. The SQL
+    timeline and the threads that ran statements come from the request's
+    ``metrics.RequestDB``."""
+
+    def __init__(self, scope, trigger: str, interval: float, allocations: bool,
+                 db: metrics.RequestDB):
+        self.id = uuid.uuid4().hex
+        self.scope = scope
+        self.trigger = trigger
+        self.interval = interval
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.loop_thread = threading.get_ident()
+        self.threads = {self.loop_thread}
+        self.stacks: Counter = Counter()
+        self.db = db
+        if db.timeline is None:
+            db.timeline = []
+        # A threadpool thread running the request's statements is serving it.
+        db.threads = self.threads
+        self.status = None
+        self.duration = None
+        self.allocations = None
+        self._tracing = allocations
+        if allocations:
+            _start_tracing()
+        self._baseline = tracemalloc.take_snapshot() if self._tracing else None
+
+    def __enter__(self):
+        _sampler.add(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.duration = time.perf_counter() - self.start
+        _sampler.remove(self)
+        if self._tracing:
+            self.allocations = self._allocations()
+            _stop_tracing()
+
+    def sample(self, stacks: dict) -> None:
+        """Count the current stack of each thread serving the request.
+        ``stacks`` maps thread ids to their stack, None for idle threads."""
+        for ident in list(self.threads):
+            if ident not in stacks:
+                continue
+            stack = stacks[ident]
+            if stack is None:
+                # Whatever the worker runs next belongs to another request.
+                if ident != self.loop_thread:
+                    self.threads.discard(ident)
+                continue
+            self.stacks[stack] += 1
+
+    def _allocations(self) -> dict:
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        stats = [s for s in snapshot.compare_to(self._baseline, "lineno") if s.size_diff > 0]
+        return {
+            "peak_kb": round(peak / 1024, 1),
+            "retained_kb": round(sum(s.size_diff for s in stats) / 1024, 1),
+            "top": [
+                {
+                    "where": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+                    "size_kb": round(s.size_diff / 1024, 1),
+                    "count": s.count_diff,
+                }
+                for s in stats[:TOP_ENTRIES]
+            ],
+        }
+
+    def report(self) -> dict:
+        tree = {"name": "all", "samples": 0, "children": {}}
+        own = Counter()
+        for stack, count in self.stacks.items():
+            node = tree
+            node["samples"] += count
+            for code in stack:
+                node = node["children"].setdefault(
+                    _label(code), {"name": _label(code), "samples": 0, "children": {}}
+                )
+                node["samples"] += count
+            own[_label(stack[-1])] += count
+        sql = [
+            {
+                "start_ms": round((start - self.start) * 1000, 3),
+                "duration_ms": round(seconds * 1000, 3),
+                "statement": statement[:MAX_SQL_LENGTH],
+                "executemany": executemany,
+            }
+            for start, seconds, statement, executemany in self.db.timeline
+        ]
+        sql_ms = sum(entry["duration_ms"] for entry in sql)
+        return {
+            "id": self.id,
+            "trigger": self.trigger,
+            "method": self.scope["method"],
+            "path": self.scope["path"],
+            "query": self.scope.get("query_string", b"").decode("latin-1"),
+            "status": self.status,
+            "started_at": self.started_at.isoformat(timespec="milliseconds"),
+            "duration_ms": round(self.duration * 1000, 2),
+            "interval_ms": round(self.interval * 1000, 2),
+            "samples": tree["samples"],
+            "top": [
+                {"name": name, "samples": count} for name, count in own.most_common(TOP_ENTRIES)
+            ],
+            "call_tree": _finish(tree),
+            "sql": {"count": len(sql), "total_ms": round(sql_ms, 2), "timeline": sql},
+            "allocations": self.allocations,
+        }
+
+
+def _stack(frame) -> Optional[tuple]:
+    """The code objects of ``frame``'s stack, outermost first, or None when
+    the thread is idle."""
+    stack = []
+    while frame is not None:
+        stack.append(frame.f_code)
+        frame = frame.f_back
+    stack.reverse()
+    return None if _parked(stack) else tuple(stack)
+
+
+class Sampler:
+    """One thread sampling the stacks of every profile in progress.
+
+    Each thread's stack is read once per tick, however many profiles
+    share it, and the thread sleeps while nothing is being profiled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        # Profile -> perf_counter() of its next sample.
+        self._due: dict[Profile, float] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._due[profile] = time.perf_counter() + profile.interval
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="profile-sampler", daemon=True
+                )
+                self._thread.start()
+            self._wake.notify()
+
+    def remove(self, profile: Profile) -> None:
+        # Samples are taken under the lock, so none lands after this.
+        with self._lock:
+            self._due.pop(profile, None)
+
+    def _run(self) -> None:
+        with self._lock:
+            while True:
+                if not self._due:
+                    self._wake.wait()
+                    continue
+                now = time.perf_counter()
+                wait = min(self._due.values()) - now
+                if wait > 0:
+                    self._wake.wait(wait)
+                    continue
+                frames = sys._current_frames()
+                stacks = {}
+                for profile, due in self._due.items():
+                    if due > now:
+                        continue
+                    for ident in list(profile.threads):
+                        if ident not in stacks and ident in frames:
+                            stacks[ident] = _stack(frames[ident])
+                    profile.sample(stacks)
+                    self._due[profile] = now + profile.interval
+                del frames
+
+
+_sampler = Sampler()
+
+
+def _finish(node: dict) -> dict:
+    children = sorted(node["children"].values(), key=lambda child: -child["samples"])
+    return {**node, "children": [_finish(child) for child in children]}
+
+
+def folded(report: dict) -> str:
+    """The call tree as collapsed stacks, one ``a;b;c count`` line per leaf,
+    the input format of flame graph tools."""
+    lines = []
+
+    def walk(node, path):
+        own = node["samples"] - sum(child["samples"] for child in node["children"])
+        if own and path:
+            lines.append(f"{';'.join(path)} {own}")
+        for child in node["children"]:
+            walk(child, path + [child["name"]])
+
+    walk(report["call_tree"], [])
+    return "\n".join(lines) + "\n"
+
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+
+
+def _start_tracing() -> None:
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if _tracing_users == 0:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        _tracing_users += 1
+
+
+def _stop_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+
+
+class ProfileStore:
+    def __init__(self, keep: int = PROFILE_KEEP, directory: Optional[str] = PROFILE_DIR):
+        self.keep = keep
+        self.directory = Path(directory) if directory else None
+        self._reports: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, report: dict) -> None:
+        with self._lock:
+            self._reports[report["id"]] = report
+            while len(self._reports) > self.keep:
+                self._reports.popitem(last=False)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{report['id']}.json").write_text(json.dumps(report))
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        with self._lock:
+            report = self._reports.get(profile_id)
+        if report is None and self.directory is not None and profile_id.isalnum():
+            path = self.directory / f"{profile_id}.json"
+            if path.exists():
+                report = json.loads(path.read_text())
+        return report
+
+    def recent(self) -> list[dict]:
+        """This process's reports, newest first."""
+        with self._lock:
+            return list(reversed(self._reports.values()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reports.clear()
+
+
+profile_store = ProfileStore()
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 interval_ms: float = PROFILE_INTERVAL_MS, store: ProfileStore = profile_store):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        on_demand = bool(PROFILING_TOKEN) and requested(scope)
+        if on_demand:
+            if not authorized(Headers(scope=scope).get(PROFILE_TOKEN_HEADER)):
+                response = JSONResponse({"detail": "Invalid profiling token"}, status_code=403)
+                await response(scope, receive, send)
+                return
+            scope.setdefault("state", {})["bypass_cache"] = True
+        elif not (self.sample_rate and random.random() < self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        trigger = "on-demand" if on_demand else "sampled"
+        with metrics.recording(f"{scope['method']} {scope['path']}") as db:
+            profile = Profile(scope, trigger, self.interval, allocations=on_demand, db=db)
+
+            async def send_with_id(message):
+                if message["type"] == "http.response.start":
+                    profile.status = message["status"]
+                    MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile.id
+                await send(message)
+
+            try:
+                with profile:
+                    await self.app(scope, receive, send_with_id)
+            finally:
+                self.store.add(profile.report())
@@ -0,0 +1,101 @@
+"""Response fields of each resource and the columns they are selected from.
+
+List and detail routes select rows of plain columns rather than ORM
+entities. The ``fields`` query parameter narrows that selection, so a
+client asking for ``fields=id,name`` only makes SQLite read, and the
+server encode, those two columns. Joins to related tables are added only
+when one of their fields is requested.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+
+from models import Class, Student, Subject, Teacher
+
+
+@dataclass(frozen=True)
+class Projection:
+    model: type
+    # response field -> column, in response order
+    columns: dict
+    # response field -> (joined model, on clause) needed to select it
+    joins: dict = field(default_factory=dict)
+
+    def pick(self, fields: Optional[str]) -> dict:
+        """The columns named in a comma-separated ``fields`` parameter."""
+        names = {name.strip() for name in (fields or "").split(",") if name.strip()}
+        if not names:
+            return self.columns
+        unknown = sorted(names - self.columns.keys())
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+            )
+        return {name: column for name, column in self.columns.items() if name in names}
+
+    def select(self, make: Callable, selected: dict, *required):
+        """Build ``make(...)`` (``db.query`` or ``select``) over ``selected``.
+
+        ``required`` columns, such as pagination keys, are selected after the
+        requested ones, where serialization ignores them.
+        """
+        items = [column.label(name) for name, column in selected.items()]
+        items += [c.label(c.key) for c in required if c.key not in selected]
+        query = make(*items).select_from(self.model)
+        for name, (target, onclause) in self.joins.items():
+            if name in selected:
+                query = query.outerjoin(target, onclause)
+        return query
+
+
+STUDENTS = Projection(
+    Student,
+    {
+        "name": Student.name,
+        "email": Student.email,
+        "phone": Student.phone,
+        "class_id": Student.class_id,
+        "id": Student.id,
+        "class_name": Class.name,
+    },
+    {"class_name": (Class, Student.class_id == Class.id)},
+)
+
+TEACHERS = Projection(
+    Teacher,
+    {
+        "name": Teacher.name,
+        "email": Teacher.email,
+        "phone": Teacher.phone,
+        "department": Teacher.department,
+        "id": Teacher.id,
+    },
+)
+
+CLASSES = Projection(
+    Class,
+    {
+        "name": Class.name,
+        "section": Class.section,
+        "room_number": Class.room_number,
+        "id": Class.id,
+    },
+)
+
+SUBJECTS = Projection(
+    Subject,
+    {
+        "name": Subject.name,
+        "code": Subject.code,
+        "teacher_id": Subject.teacher_id,
+        "class_id": Subject.class_id,
+        "id": Subject.id,
+        "teacher_name": Teacher.name,
+        "class_name": Class.name,
+    },
+    {
+        "teacher_name": (Teacher, Subject.teacher_id == Teacher.id),
+        "class_name": (Class, Subject.class_id == Class.id),
+    },
+)
@@ -0,0 +1,105 @@
+"""Per-request N+1 detection on top of the request's SQL recorder.
+
+``QueryAuditMiddleware`` reads the request's ``metrics.RequestDB``, which
+counts its statements, and groups them by normalized SQL. Literals, bound
+parameters and expanded ``IN`` lists are folded, so ``WHERE id = 1`` and
+``WHERE id = 2`` fall into one group. A group run ``threshold`` times or
+more in one request is what lazy loading in a loop looks like, and it is
+logged as a warning. ``executemany`` batches count toward the total but
+are never flagged; they already are the fix.
+
+With ``DEBUG`` on, the counts go out as ``X-Query-Count`` and, for the
+worst group, ``X-Query-Repeated`` response headers. Statements run while a
+streamed body is being sent come after the headers, so they only reach
+the log line.
+
+Tests use ``record()``, through the ``sql_audit`` fixture, to get the
+``RequestDB`` of every request audited while it is open.
+"""
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from starlette.datastructures import MutableHeaders
+
+import metrics
+from config import DEBUG, QUERY_AUDIT_REPEAT_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+QUERY_REPEATED_HEADER = "X-Query-Repeated"
+# Header values are cut here; the log line has the full statement.
+MAX_HEADER_SQL = 200
+
+
+@dataclass
+class QueryAudit:
+    # One RequestDB per request finished while recording, oldest first.
+    requests: list[metrics.RequestDB] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(stats.queries for stats in self.requests)
+
+    def clear(self) -> None:
+        self.requests.clear()
+
+
+# Open record() blocks.
+_recorders: list[QueryAudit] = []
+
+
+@contextmanager
+def record():
+    """Collect the ``RequestDB`` of every request audited until exit."""
+    recorder = QueryAudit()
+    _recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorders.remove(recorder)
+
+
+class QueryAuditMiddleware:
+    def __init__(self, app, headers: bool = DEBUG,
+                 threshold: int = QUERY_AUDIT_REPEAT_THRESHOLD):
+        self.app = app
+        self.headers = headers
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with metrics.recording(f"{scope['method']} {scope['path']}") as stats:
+
+            async def send_with_counts(message):
+                if message["type"] == "http.response.start" and self.headers:
+                    headers = MutableHeaders(scope=message)
+                    headers[QUERY_COUNT_HEADER] = str(stats.queries)
+                    worst = stats.repeated(self.threshold)
+                    if worst:
+                        sql, count = next(iter(worst.items()))
+                        headers[QUERY_REPEATED_HEADER] = f"{count}x {sql[:MAX_HEADER_SQL]}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_counts)
+            finally:
+                self.report(stats)
+
+    def report(self, stats: metrics.RequestDB) -> None:
+        for recorder in _recorders:
+            recorder.requests.append(stats)
+        for sql, count in stats.repeated(self.threshold).items():
+            logger.warning(
+                "%s: possible N+1, %d runs of %s (%d statements in the request)",
+                stats.label, count, sql, stats.queries,
+            )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s: %d SQL statements, %d distinct",
+                stats.label, stats.queries, len(metrics.group_statements(stats.statements)),
+            )
@@ -0,0 +1,220 @@
+"""In-process cache of serialized GET responses.
+
+Routes opt in by declaring the tables they read with
+``versions.conditional_get``. ``ResponseCacheMiddleware`` keys responses by
+path plus normalized query string, stores the encoded body and headers of
+every 200, and replays them without entering the route. Each entry is
+tagged with the table version it was built at; a commit to any of its
+tables drops it, and an entry whose version no longer matches is never
+served. Entries are bounded by count, total size and age.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+
+import versions
+from config import CACHE_MAX_BYTES, CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+
+# Headers replayed on a 304 from the cache, as conditional_get does.
+_VALIDATORS = (b"etag", b"last-modified", b"cache-control")
+
+
+@dataclass
+class CacheEntry:
+    tables: tuple
+    version: int
+    expires_at: float
+    headers: list
+    body: bytes
+    # The route that built the entry, restored on hits for request metrics.
+    route: object = None
+
+    @property
+    def etag(self) -> Optional[str]:
+        for name, value in self.headers:
+            if name == b"etag":
+                return value.decode("latin-1")
+        return None
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        ttl: float = CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.expirations = 0
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._by_table: dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            if versions.version(*entry.tables) != entry.version:
+                # A commit raced the invalidation; never serve it.
+                self._remove(key)
+                self.invalidations += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def record_miss(self) -> None:
+        # Counted by the middleware once the route turns out to be cacheable,
+        # so requests to other routes do not skew the ratio.
+        with self._lock:
+            self.misses += 1
+
+    def set(
+        self, key: tuple, tables: tuple, version: int, headers: list, body: bytes,
+        route: object = None,
+    ) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            # Built from data that changed while the route ran.
+            if versions.version(*tables) != version:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(
+                tables, version, time.monotonic() + self.ttl, headers, body, route
+            )
+            self.size += len(body)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tables: tuple) -> None:
+        with self._lock:
+            keys = set()
+            for table in tables:
+                keys |= self._by_table.get(table, set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "size_bytes": self.size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+            }
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= len(entry.body)
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+
+response_cache = ResponseCache()
+versions.subscribe(response_cache.invalidate)
+
+
+def cache_key(scope) -> tuple:
+    """Path plus query parameters in a canonical order."""
+    query = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+    return scope["path"], urlencode(sorted(query))
+
+
+class ResponseCacheMiddleware:
+    def __init__(self, app, cache: ResponseCache = response_cache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        # Set by outer middleware that needs the route to run, e.g. profiling.
+        if scope.get("state", {}).get("bypass_cache"):
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope)
+        versions.refresh()
+        entry = self.cache.get(key)
+        if entry is not None:
+            if entry.route is not None:
+                scope["route"] = entry.route
+            await self._replay(entry, Headers(scope=scope), send)
+            return
+
+        # conditional_get records the tables and version here.
+        state = scope.setdefault("state", {})
+        start, chunks = {}, []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                # Decided up front so uncacheable (e.g. streamed) bodies are
+                # never buffered.
+                if "cache_tables" in state:
+                    self.cache.record_miss()
+                    if message["status"] == 200:
+                        start.update(message)
+            elif start and message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self.cache.set(
+                        key, state["cache_tables"], state["cache_version"],
+                        list(start.get("headers", [])), b"".join(chunks),
+                        scope.get("route"),
+                    )
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+    @staticmethod
+    async def _replay(entry: CacheEntry, request_headers: Headers, send) -> None:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and entry.etag and versions.etag_matches(if_none_match, entry.etag):
+            headers = [(k, v) for k, v in entry.headers if k in _VALIDATORS]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": entry.headers})
+        await send({"type": "http.response.body", "body": entry.body})
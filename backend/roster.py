@@ -0,0 +1,56 @@
+"""The nested class page: a class with its students, subjects and teachers.
+
+``ROSTER_LOAD`` eager-loads everything the roster shows in three queries
+whatever the class size: the class, its students (selectin) and its
+subjects joined to their teachers (selectin + joined).
+"""
+from sqlalchemy.orm import selectinload
+
+from models import Class, Subject
+from schemas.class_schema import ClassRoster
+from schemas.student import StudentResponse
+from schemas.subject import SubjectResponse
+from schemas.teacher import TeacherResponse
+
+ROSTER_LOAD = (
+    selectinload(Class.students),
+    selectinload(Class.subjects).joinedload(Subject.teacher),
+)
+
+
+def to_roster(cls: Class) -> ClassRoster:
+    subjects = sorted(cls.subjects, key=lambda s: s.id)
+    teachers = {s.teacher.id: s.teacher for s in subjects if s.teacher is not None}
+    return ClassRoster(
+        id=cls.id,
+        name=cls.name,
+        section=cls.section,
+        room_number=cls.room_number,
+        students=[
+            StudentResponse(
+                id=s.id,
+                name=s.name,
+                email=s.email,
+                phone=s.phone,
+                class_id=s.class_id,
+                class_name=cls.name,
+            )
+            for s in sorted(cls.students, key=lambda s: s.id)
+        ],
+        subjects=[
+            SubjectResponse(
+                id=s.id,
+                name=s.name,
+                code=s.code,
+                teacher_id=s.teacher_id,
+                class_id=s.class_id,
+                teacher_name=s.teacher.name if s.teacher else None,
+                class_name=cls.name,
+            )
+            for s in subjects
+        ],
+        teachers=[
+            TeacherResponse.model_validate(t)
+            for t in sorted(teachers.values(), key=lambda t: (t.name, t.id))
+        ],
+    )
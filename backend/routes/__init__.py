@@ -1,3 +1,3 @@
-from routes import students, teachers, classes, subjects, auth
+from routes import students, teachers, classes, subjects, auth, stats, imports, exports
 
-__all__ = ["students", "teachers", "classes", "subjects", "auth"]
+__all__ = ["students", "teachers", "classes", "subjects", "auth", "stats", "imports", "exports"]
@@ -1,65 +1,133 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from database import get_db
+from database import get_db, get_read_db
+from pagination import MAX_PAGE_SIZE, paginate
+from batch import in_request_order, parse_ids
+from projections import CLASSES
+from roster import ROSTER_LOAD, to_roster
+from versions import CLASS_TABLES, ROSTER_TABLES, conditional_get
+from search import apply_search
+from serialization import batch_response, row_response, rows_response
+from write_queue import run_write
 from models import Class
-from schemas.class_schema import ClassCreate, ClassUpdate, ClassResponse
+from schemas.class_schema import (
+    ClassCreate, ClassUpdate, ClassResponse, ClassBatchResponse, ClassRoster,
+)
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[ClassResponse])
+@router.get(
+    "/",
+    response_model=list[ClassResponse],
+    dependencies=[Depends(conditional_get(CLASS_TABLES))],
+)
 def list_classes(
+    response: Response,
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
 ):
-    query = db.query(Class)
+    selected = CLASSES.pick(fields)
+    query = CLASSES.select(db.query, selected, Class.id)
+    keys = [Class.id]
     if search:
-        query = query.filter(
-            Class.name.ilike(f"%{search}%")
-            | Class.section.ilike(f"%{search}%")
-        )
-    return query.all()
+        query, keys = apply_search(query, Class, search)
+    rows = paginate(query, keys, limit, after, response)
+    return rows_response(ClassResponse, list(selected), rows, response)
 
 
-@router.get("/{class_id}", response_model=ClassResponse)
-def get_class(class_id: int, db: Session = Depends(get_db)):
-    cls = db.query(Class).filter(Class.id == class_id).first()
+@router.get(
+    "/batch",
+    response_model=ClassBatchResponse,
+    dependencies=[Depends(conditional_get(CLASS_TABLES))],
+)
+def get_classes_batch(
+    response: Response,
+    ids: str = Query(...),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    wanted = parse_ids(ids)
+    selected = CLASSES.pick(fields)
+    query = CLASSES.select(db.query, selected, Class.id).filter(Class.id.in_(wanted))
+    rows = query.all()
+    rows, missing = in_request_order(rows, wanted)
+    return batch_response(ClassResponse, list(selected), rows, missing, response)
+
+
+@router.get(
+    "/{class_id}",
+    response_model=ClassResponse,
+    dependencies=[Depends(conditional_get(CLASS_TABLES))],
+)
+def get_class(
+    class_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    selected = CLASSES.pick(fields)
+    row = CLASSES.select(db.query, selected).filter(Class.id == class_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Class not found")
+    return row_response(ClassResponse, list(selected), row, response)
+
+
+@router.get(
+    "/{class_id}/roster",
+    response_model=ClassRoster,
+    dependencies=[Depends(conditional_get(ROSTER_TABLES))],
+)
+def get_class_roster(class_id: int, db: Session = Depends(get_read_db)):
+    cls = db.query(Class).options(*ROSTER_LOAD).filter(Class.id == class_id).first()
     if not cls:
         raise HTTPException(status_code=404, detail="Class not found")
-    return cls
+    return to_roster(cls)
 
 
 @router.post("/", response_model=ClassResponse, status_code=201)
 def create_class(cls: ClassCreate, db: Session = Depends(get_db)):
-    db_class = Class(**cls.model_dump())
-    db.add(db_class)
-    db.commit()
-    db.refresh(db_class)
-    return db_class
+    def write(db: Session):
+        db_class = Class(**cls.model_dump())
+        db.add(db_class)
+        db.flush()
+        db.refresh(db_class)
+        return ClassResponse.model_validate(db_class)
+
+    return run_write(db, write)
 
 
 @router.put("/{class_id}", response_model=ClassResponse)
 def update_class(
     class_id: int, cls: ClassUpdate, db: Session = Depends(get_db)
 ):
-    db_class = db.query(Class).filter(Class.id == class_id).first()
-    if not db_class:
-        raise HTTPException(status_code=404, detail="Class not found")
-    update_data = cls.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_class, key, value)
-    db.commit()
-    db.refresh(db_class)
-    return db_class
+    def write(db: Session):
+        db_class = db.query(Class).filter(Class.id == class_id).first()
+        if not db_class:
+            raise HTTPException(status_code=404, detail="Class not found")
+        update_data = cls.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_class, key, value)
+        db.flush()
+        db.refresh(db_class)
+        return ClassResponse.model_validate(db_class)
+
+    return run_write(db, write)
 
 
 @router.delete("/{class_id}")
 def delete_class(class_id: int, db: Session = Depends(get_db)):
-    db_class = db.query(Class).filter(Class.id == class_id).first()
-    if not db_class:
-        raise HTTPException(status_code=404, detail="Class not found")
-    db.delete(db_class)
-    db.commit()
-    return {"message": "Class deleted successfully"}
+    def write(db: Session):
+        db_class = db.query(Class).filter(Class.id == class_id).first()
+        if not db_class:
+            raise HTTPException(status_code=404, detail="Class not found")
+        db.delete(db_class)
+        db.flush()
+        return {"message": "Class deleted successfully"}
+
+    return run_write(db, write)
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import get_read_db
+from models import Student, Teacher, Class, Subject
+
+router = APIRouter()
+
+# Rows are fetched from the driver in batches of this size.
+YIELD_PER = 1000
+# Output is buffered into chunks of roughly this many bytes.
+CHUNK_BYTES = 64 * 1024
+
+EXPORTS = {
+    "students": lambda: select(
+        Student.id, Student.name, Student.email, Student.phone,
+        Student.class_id, Class.name.label("class_name"),
+    ).outerjoin(Class, Student.class_id == Class.id).order_by(Student.id),
+    "teachers": lambda: select(
+        Teacher.id, Teacher.name, Teacher.email, Teacher.phone, Teacher.department,
+    ).order_by(Teacher.id),
+    "classes": lambda: select(
+        Class.id, Class.name, Class.section, Class.room_number,
+    ).order_by(Class.id),
+    "subjects": lambda: select(
+        Subject.id, Subject.name, Subject.code, Subject.teacher_id, Subject.class_id,
+        Teacher.name.label("teacher_name"), Class.name.label("class_name"),
+    )
+    .outerjoin(Teacher, Subject.teacher_id == Teacher.id)
+    .outerjoin(Class, Subject.class_id == Class.id)
+    .order_by(Subject.id),
+}
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _stream_rows(bind, stmt):
+    # The request's session may be closed before the body is sent, so the
+    # stream runs on its own session against the same engine.
+    with Session(bind=bind) as session:
+        result = session.execute(stmt.execution_options(yield_per=YIELD_PER))
+        yield list(result.keys())
+        yield from result
+
+
+def _encode(rows, fmt: str):
+    keys = next(rows)
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(buffer)
+        writer.writerow(keys)
+        write_row = writer.writerow
+    else:
+        def write_row(row):
+            buffer.write(json.dumps(dict(zip(keys, row))))
+            buffer.write("\n")
+    # The header and first row are flushed immediately so the client gets
+    # its first byte before the rest of the table is read.
+    pending_first = True
+    for row in rows:
+        write_row(row)
+        if pending_first or buffer.tell() >= CHUNK_BYTES:
+            pending_first = False
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/{entity}")
+def export_entity(
+    entity: str,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    db: Session = Depends(get_read_db),
+):
+    if entity not in EXPORTS:
+        raise HTTPException(status_code=404, detail="Unknown entity")
+    rows = _stream_rows(db.get_bind(), EXPORTS[entity]())
+    return StreamingResponse(
+        _encode(rows, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{fmt}"'},
+    )
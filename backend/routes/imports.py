@@ -0,0 +1,64 @@
+import logging
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from database import get_db
+from importer import DEFAULT_CHUNK_SIZE, FORMATS, IMPORTABLE, run_import
+from schemas.imports import ImportSummary
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def _sync_chunks(request: Request):
+    """Pull the request body from the event loop while running in a worker thread."""
+    stream = request.stream()
+
+    async def next_chunk():
+        try:
+            return await stream.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    while (chunk := anyio.from_thread.run(next_chunk)) is not None:
+        if chunk:
+            yield chunk
+
+
+@router.post("/{entity}", response_model=ImportSummary)
+async def import_entity(
+    entity: str,
+    request: Request,
+    fmt: Optional[str] = Query(None, alias="format"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    if entity not in IMPORTABLE:
+        raise HTTPException(status_code=404, detail="Unknown entity")
+    if fmt is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        fmt = CONTENT_TYPES.get(content_type)
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be csv or ndjson")
+
+    def progress(summary: ImportSummary) -> None:
+        logger.info(
+            "import %s: %d rows processed, %d created, %d failed",
+            entity, summary.processed, summary.created, summary.failed,
+        )
+
+    return await run_in_threadpool(
+        run_import, db, entity, _sync_chunks(request), fmt, chunk_size, progress
+    )
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+import profiling
+from profiling import folded, profile_store
+from schemas.profile import ProfileSummary
+
+router = APIRouter()
+
+
+def require_profiling_token(x_profile_token: str = Header(None)):
+    if not profiling.authorized(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+@router.get(
+    "/",
+    response_model=list[ProfileSummary],
+    dependencies=[Depends(require_profiling_token)],
+)
+def list_profiles():
+    return profile_store.recent()
+
+
+@router.get("/{profile_id}", dependencies=[Depends(require_profiling_token)])
+def get_profile(profile_id: str, format: str = Query("json")):
+    report = profile_store.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "folded":
+        return PlainTextResponse(folded(report))
+    if format != "json":
+        raise HTTPException(status_code=400, detail="Format must be json or folded")
+    return report
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from counters import TOTAL_SCOPES
+from database import get_read_db
+from models import Class, StatCounter, Teacher
+from response_cache import response_cache
+from schemas.stats import (
+    CacheStats, ClassStudentCount, StatsResponse, TeacherSubjectCount,
+)
+from versions import STATS_TABLES, conditional_get
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=StatsResponse,
+    dependencies=[Depends(conditional_get(STATS_TABLES))],
+)
+def get_stats(db: Session = Depends(get_read_db)):
+    totals = dict.fromkeys(TOTAL_SCOPES, 0)
+    totals.update(
+        db.query(StatCounter.scope, StatCounter.count)
+        .filter(StatCounter.scope.in_(TOTAL_SCOPES), StatCounter.ref_id == 0)
+        .all()
+    )
+    per_class = (
+        db.query(Class.id, Class.name, StatCounter.count)
+        .join(StatCounter, StatCounter.ref_id == Class.id)
+        .filter(StatCounter.scope == "class_students", StatCounter.count > 0)
+        .order_by(Class.id)
+        .all()
+    )
+    per_teacher = (
+        db.query(Teacher.id, Teacher.name, StatCounter.count)
+        .join(StatCounter, StatCounter.ref_id == Teacher.id)
+        .filter(StatCounter.scope == "teacher_subjects", StatCounter.count > 0)
+        .order_by(Teacher.id)
+        .all()
+    )
+    return StatsResponse(
+        **totals,
+        students_per_class=[
+            ClassStudentCount(class_id=cid, class_name=name, students=count)
+            for cid, name, count in per_class
+        ],
+        subjects_per_teacher=[
+            TeacherSubjectCount(teacher_id=tid, teacher_name=name, subjects=count)
+            for tid, name, count in per_teacher
+        ],
+    )
+
+
+@router.get("/cache", response_model=CacheStats)
+def get_cache_stats():
+    return response_cache.stats()
@@ -1,120 +1,190 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from database import get_db
+from database import get_db, get_read_db
+from pagination import MAX_PAGE_SIZE, paginate
+from batch import in_request_order, parse_ids
+from projections import STUDENTS
+from versions import STUDENT_TABLES, conditional_get
+from search import apply_search
+from serialization import batch_response, row_response, rows_response
+from write_queue import run_write
+from bulk import bulk_create, bulk_delete, bulk_update, summarize
 from models import Student, Class
-from schemas.student import StudentCreate, StudentUpdate, StudentResponse
+from schemas.student import (
+    StudentCreate, StudentUpdate, StudentBulkUpdate, StudentResponse,
+    StudentBatchResponse,
+)
+from schemas.bulk import BulkDelete, BulkResponse
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[StudentResponse])
+@router.get(
+    "/",
+    response_model=list[StudentResponse],
+    dependencies=[Depends(conditional_get(STUDENT_TABLES))],
+)
 def list_students(
+    response: Response,
     search: Optional[str] = Query(None),
     class_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
 ):
-    query = db.query(Student)
+    selected = STUDENTS.pick(fields)
+    query = STUDENTS.select(db.query, selected, Student.id)
+    keys = [Student.id]
     if search:
-        query = query.filter(
-            Student.name.ilike(f"%{search}%")
-            | Student.email.ilike(f"%{search}%")
-        )
+        query, keys = apply_search(query, Student, search)
     if class_id:
         query = query.filter(Student.class_id == class_id)
-    students = query.all()
-    result = []
-    for s in students:
-        data = StudentResponse(
-            id=s.id,
-            name=s.name,
-            email=s.email,
-            phone=s.phone,
-            class_id=s.class_id,
-            class_name=s.student_class.name if s.student_class else None,
+    rows = paginate(query, keys, limit, after, response)
+    return rows_response(StudentResponse, list(selected), rows, response)
+
+
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_create_students(students: list[StudentCreate], db: Session = Depends(get_db)):
+    def write(db: Session):
+        results = bulk_create(db, Student, [item.model_dump() for item in students])
+        return summarize(results)
+
+    return run_write(db, write)
+
+
+@router.put("/bulk", response_model=BulkResponse)
+def bulk_update_students(
+    students: list[StudentBulkUpdate], db: Session = Depends(get_db)
+):
+    def write(db: Session):
+        results = bulk_update(
+            db, Student, [item.model_dump(exclude_unset=True) for item in students]
         )
-        result.append(data)
-    return result
+        return summarize(results)
 
+    return run_write(db, write)
+
+
+@router.delete("/bulk", response_model=BulkResponse)
+def bulk_delete_students(body: BulkDelete, db: Session = Depends(get_db)):
+    def write(db: Session):
+        results = bulk_delete(db, Student, body.ids)
+        return summarize(results)
+
+    return run_write(db, write)
+
+
+@router.get(
+    "/batch",
+    response_model=StudentBatchResponse,
+    dependencies=[Depends(conditional_get(STUDENT_TABLES))],
+)
+def get_students_batch(
+    response: Response,
+    ids: str = Query(...),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    wanted = parse_ids(ids)
+    selected = STUDENTS.pick(fields)
+    query = STUDENTS.select(db.query, selected, Student.id).filter(Student.id.in_(wanted))
+    rows = query.all()
+    rows, missing = in_request_order(rows, wanted)
+    return batch_response(StudentResponse, list(selected), rows, missing, response)
 
-@router.get("/{student_id}", response_model=StudentResponse)
-def get_student(student_id: int, db: Session = Depends(get_db)):
-    student = db.query(Student).filter(Student.id == student_id).first()
-    if not student:
+
+@router.get(
+    "/{student_id}",
+    response_model=StudentResponse,
+    dependencies=[Depends(conditional_get(STUDENT_TABLES))],
+)
+def get_student(
+    student_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    selected = STUDENTS.pick(fields)
+    row = STUDENTS.select(db.query, selected).filter(Student.id == student_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Student not found")
-    return StudentResponse(
-        id=student.id,
-        name=student.name,
-        email=student.email,
-        phone=student.phone,
-        class_id=student.class_id,
-        class_name=student.student_class.name if student.student_class else None,
-    )
+    return row_response(StudentResponse, list(selected), row, response)
 
 
 @router.post("/", response_model=StudentResponse, status_code=201)
 def create_student(student: StudentCreate, db: Session = Depends(get_db)):
-    existing = db.query(Student).filter(Student.email == student.email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    if student.class_id:
-        cls = db.query(Class).filter(Class.id == student.class_id).first()
-        if not cls:
-            raise HTTPException(status_code=400, detail="Class not found")
-    db_student = Student(**student.model_dump())
-    db.add(db_student)
-    db.commit()
-    db.refresh(db_student)
-    return StudentResponse(
-        id=db_student.id,
-        name=db_student.name,
-        email=db_student.email,
-        phone=db_student.phone,
-        class_id=db_student.class_id,
-        class_name=db_student.student_class.name if db_student.student_class else None,
-    )
+    def write(db: Session):
+        existing = db.query(Student).filter(Student.email == student.email).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        if student.class_id:
+            cls = db.query(Class).filter(Class.id == student.class_id).first()
+            if not cls:
+                raise HTTPException(status_code=400, detail="Class not found")
+        db_student = Student(**student.model_dump())
+        db.add(db_student)
+        db.flush()
+        db.refresh(db_student)
+        return StudentResponse(
+            id=db_student.id,
+            name=db_student.name,
+            email=db_student.email,
+            phone=db_student.phone,
+            class_id=db_student.class_id,
+            class_name=db_student.student_class.name if db_student.student_class else None,
+        )
+
+    return run_write(db, write)
 
 
 @router.put("/{student_id}", response_model=StudentResponse)
 def update_student(
     student_id: int, student: StudentUpdate, db: Session = Depends(get_db)
 ):
-    db_student = db.query(Student).filter(Student.id == student_id).first()
-    if not db_student:
-        raise HTTPException(status_code=404, detail="Student not found")
-    update_data = student.model_dump(exclude_unset=True)
-    if "email" in update_data:
-        existing = (
-            db.query(Student)
-            .filter(Student.email == update_data["email"], Student.id != student_id)
-            .first()
+    def write(db: Session):
+        db_student = db.query(Student).filter(Student.id == student_id).first()
+        if not db_student:
+            raise HTTPException(status_code=404, detail="Student not found")
+        update_data = student.model_dump(exclude_unset=True)
+        if "email" in update_data:
+            existing = (
+                db.query(Student)
+                .filter(Student.email == update_data["email"], Student.id != student_id)
+                .first()
+            )
+            if existing:
+                raise HTTPException(status_code=400, detail="Email already registered")
+        if "class_id" in update_data and update_data["class_id"]:
+            cls = db.query(Class).filter(Class.id == update_data["class_id"]).first()
+            if not cls:
+                raise HTTPException(status_code=400, detail="Class not found")
+        for key, value in update_data.items():
+            setattr(db_student, key, value)
+        db.flush()
+        db.refresh(db_student)
+        return StudentResponse(
+            id=db_student.id,
+            name=db_student.name,
+            email=db_student.email,
+            phone=db_student.phone,
+            class_id=db_student.class_id,
+            class_name=db_student.student_class.name if db_student.student_class else None,
         )
-        if existing:
-            raise HTTPException(status_code=400, detail="Email already registered")
-    if "class_id" in update_data and update_data["class_id"]:
-        cls = db.query(Class).filter(Class.id == update_data["class_id"]).first()
-        if not cls:
-            raise HTTPException(status_code=400, detail="Class not found")
-    for key, value in update_data.items():
-        setattr(db_student, key, value)
-    db.commit()
-    db.refresh(db_student)
-    return StudentResponse(
-        id=db_student.id,
-        name=db_student.name,
-        email=db_student.email,
-        phone=db_student.phone,
-        class_id=db_student.class_id,
-        class_name=db_student.student_class.name if db_student.student_class else None,
-    )
+
+    return run_write(db, write)
 
 
 @router.delete("/{student_id}")
 def delete_student(student_id: int, db: Session = Depends(get_db)):
-    db_student = db.query(Student).filter(Student.id == student_id).first()
-    if not db_student:
-        raise HTTPException(status_code=404, detail="Student not found")
-    db.delete(db_student)
-    db.commit()
-    return {"message": "Student deleted successfully"}
+    def write(db: Session):
+        db_student = db.query(Student).filter(Student.id == student_id).first()
+        if not db_student:
+            raise HTTPException(status_code=404, detail="Student not found")
+        db.delete(db_student)
+        db.flush()
+        return {"message": "Student deleted successfully"}
+
+    return run_write(db, write)
@@ -1,137 +1,205 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from database import get_db
+from database import get_db, get_read_db
+from pagination import MAX_PAGE_SIZE, paginate
+from batch import in_request_order, parse_ids
+from projections import SUBJECTS
+from versions import SUBJECT_TABLES, conditional_get
+from search import apply_search
+from serialization import batch_response, row_response, rows_response
+from write_queue import run_write
+from bulk import bulk_create, bulk_delete, bulk_update, summarize
 from models import Subject, Teacher, Class
-from schemas.subject import SubjectCreate, SubjectUpdate, SubjectResponse
+from schemas.subject import (
+    SubjectCreate, SubjectUpdate, SubjectBulkUpdate, SubjectResponse,
+    SubjectBatchResponse,
+)
+from schemas.bulk import BulkDelete, BulkResponse
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[SubjectResponse])
+@router.get(
+    "/",
+    response_model=list[SubjectResponse],
+    dependencies=[Depends(conditional_get(SUBJECT_TABLES))],
+)
 def list_subjects(
+    response: Response,
     search: Optional[str] = Query(None),
     teacher_id: Optional[int] = Query(None),
     class_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
 ):
-    query = db.query(Subject)
+    selected = SUBJECTS.pick(fields)
+    query = SUBJECTS.select(db.query, selected, Subject.id)
+    keys = [Subject.id]
     if search:
-        query = query.filter(
-            Subject.name.ilike(f"%{search}%")
-            | Subject.code.ilike(f"%{search}%")
-        )
+        query, keys = apply_search(query, Subject, search)
     if teacher_id:
         query = query.filter(Subject.teacher_id == teacher_id)
     if class_id:
         query = query.filter(Subject.class_id == class_id)
-    subjects = query.all()
-    result = []
-    for s in subjects:
-        data = SubjectResponse(
-            id=s.id,
-            name=s.name,
-            code=s.code,
-            teacher_id=s.teacher_id,
-            class_id=s.class_id,
-            teacher_name=s.teacher.name if s.teacher else None,
-            class_name=s.subject_class.name if s.subject_class else None,
+    rows = paginate(query, keys, limit, after, response)
+    return rows_response(SubjectResponse, list(selected), rows, response)
+
+
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_create_subjects(subjects: list[SubjectCreate], db: Session = Depends(get_db)):
+    def write(db: Session):
+        results = bulk_create(db, Subject, [item.model_dump() for item in subjects])
+        return summarize(results)
+
+    return run_write(db, write)
+
+
+@router.put("/bulk", response_model=BulkResponse)
+def bulk_update_subjects(
+    subjects: list[SubjectBulkUpdate], db: Session = Depends(get_db)
+):
+    def write(db: Session):
+        results = bulk_update(
+            db, Subject, [item.model_dump(exclude_unset=True) for item in subjects]
         )
-        result.append(data)
-    return result
+        return summarize(results)
+
+    return run_write(db, write)
+
+
+@router.delete("/bulk", response_model=BulkResponse)
+def bulk_delete_subjects(body: BulkDelete, db: Session = Depends(get_db)):
+    def write(db: Session):
+        results = bulk_delete(db, Subject, body.ids)
+        return summarize(results)
+
+    return run_write(db, write)
+
+
+@router.get(
+    "/batch",
+    response_model=SubjectBatchResponse,
+    dependencies=[Depends(conditional_get(SUBJECT_TABLES))],
+)
+def get_subjects_batch(
+    response: Response,
+    ids: str = Query(...),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    wanted = parse_ids(ids)
+    selected = SUBJECTS.pick(fields)
+    query = SUBJECTS.select(db.query, selected, Subject.id).filter(Subject.id.in_(wanted))
+    rows = query.all()
+    rows, missing = in_request_order(rows, wanted)
+    return batch_response(SubjectResponse, list(selected), rows, missing, response)
 
 
-@router.get("/{subject_id}", response_model=SubjectResponse)
-def get_subject(subject_id: int, db: Session = Depends(get_db)):
-    subject = db.query(Subject).filter(Subject.id == subject_id).first()
-    if not subject:
+@router.get(
+    "/{subject_id}",
+    response_model=SubjectResponse,
+    dependencies=[Depends(conditional_get(SUBJECT_TABLES))],
+)
+def get_subject(
+    subject_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    selected = SUBJECTS.pick(fields)
+    row = SUBJECTS.select(db.query, selected).filter(Subject.id == subject_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Subject not found")
-    return SubjectResponse(
-        id=subject.id,
-        name=subject.name,
-        code=subject.code,
-        teacher_id=subject.teacher_id,
-        class_id=subject.class_id,
-        teacher_name=subject.teacher.name if subject.teacher else None,
-        class_name=subject.subject_class.name if subject.subject_class else None,
-    )
+    return row_response(SubjectResponse, list(selected), row, response)
 
 
 @router.post("/", response_model=SubjectResponse, status_code=201)
 def create_subject(subject: SubjectCreate, db: Session = Depends(get_db)):
-    existing = db.query(Subject).filter(Subject.code == subject.code).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Subject code already exists")
-    if subject.teacher_id:
-        teacher = db.query(Teacher).filter(Teacher.id == subject.teacher_id).first()
-        if not teacher:
-            raise HTTPException(status_code=400, detail="Teacher not found")
-    if subject.class_id:
-        cls = db.query(Class).filter(Class.id == subject.class_id).first()
-        if not cls:
-            raise HTTPException(status_code=400, detail="Class not found")
-    db_subject = Subject(**subject.model_dump())
-    db.add(db_subject)
-    db.commit()
-    db.refresh(db_subject)
-    return SubjectResponse(
-        id=db_subject.id,
-        name=db_subject.name,
-        code=db_subject.code,
-        teacher_id=db_subject.teacher_id,
-        class_id=db_subject.class_id,
-        teacher_name=db_subject.teacher.name if db_subject.teacher else None,
-        class_name=db_subject.subject_class.name if db_subject.subject_class else None,
-    )
+    def write(db: Session):
+        existing = db.query(Subject).filter(Subject.code == subject.code).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="Subject code already exists")
+        if subject.teacher_id:
+            teacher = db.query(Teacher).filter(Teacher.id == subject.teacher_id).first()
+            if not teacher:
+                raise HTTPException(status_code=400, detail="Teacher not found")
+        if subject.class_id:
+            cls = db.query(Class).filter(Class.id == subject.class_id).first()
+            if not cls:
+                raise HTTPException(status_code=400, detail="Class not found")
+        db_subject = Subject(**subject.model_dump())
+        db.add(db_subject)
+        db.flush()
+        db.refresh(db_subject)
+        return SubjectResponse(
+            id=db_subject.id,
+            name=db_subject.name,
+            code=db_subject.code,
+            teacher_id=db_subject.teacher_id,
+            class_id=db_subject.class_id,
+            teacher_name=db_subject.teacher.name if db_subject.teacher else None,
+            class_name=db_subject.subject_class.name if db_subject.subject_class else None,
+        )
+
+    return run_write(db, write)
 
 
 @router.put("/{subject_id}", response_model=SubjectResponse)
 def update_subject(
     subject_id: int, subject: SubjectUpdate, db: Session = Depends(get_db)
 ):
-    db_subject = db.query(Subject).filter(Subject.id == subject_id).first()
-    if not db_subject:
-        raise HTTPException(status_code=404, detail="Subject not found")
-    update_data = subject.model_dump(exclude_unset=True)
-    if "code" in update_data:
-        existing = (
-            db.query(Subject)
-            .filter(Subject.code == update_data["code"], Subject.id != subject_id)
-            .first()
+    def write(db: Session):
+        db_subject = db.query(Subject).filter(Subject.id == subject_id).first()
+        if not db_subject:
+            raise HTTPException(status_code=404, detail="Subject not found")
+        update_data = subject.model_dump(exclude_unset=True)
+        if "code" in update_data:
+            existing = (
+                db.query(Subject)
+                .filter(Subject.code == update_data["code"], Subject.id != subject_id)
+                .first()
+            )
+            if existing:
+                raise HTTPException(status_code=400, detail="Subject code already exists")
+        if "teacher_id" in update_data and update_data["teacher_id"]:
+            teacher = (
+                db.query(Teacher).filter(Teacher.id == update_data["teacher_id"]).first()
+            )
+            if not teacher:
+                raise HTTPException(status_code=400, detail="Teacher not found")
+        if "class_id" in update_data and update_data["class_id"]:
+            cls = db.query(Class).filter(Class.id == update_data["class_id"]).first()
+            if not cls:
+                raise HTTPException(status_code=400, detail="Class not found")
+        for key, value in update_data.items():
+            setattr(db_subject, key, value)
+        db.flush()
+        db.refresh(db_subject)
+        return SubjectResponse(
+            id=db_subject.id,
+            name=db_subject.name,
+            code=db_subject.code,
+            teacher_id=db_subject.teacher_id,
+            class_id=db_subject.class_id,
+            teacher_name=db_subject.teacher.name if db_subject.teacher else None,
+            class_name=db_subject.subject_class.name if db_subject.subject_class else None,
         )
-        if existing:
-            raise HTTPException(status_code=400, detail="Subject code already exists")
-    if "teacher_id" in update_data and update_data["teacher_id"]:
-        teacher = (
-            db.query(Teacher).filter(Teacher.id == update_data["teacher_id"]).first()
-        )
-        if not teacher:
-            raise HTTPException(status_code=400, detail="Teacher not found")
-    if "class_id" in update_data and update_data["class_id"]:
-        cls = db.query(Class).filter(Class.id == update_data["class_id"]).first()
-        if not cls:
-            raise HTTPException(status_code=400, detail="Class not found")
-    for key, value in update_data.items():
-        setattr(db_subject, key, value)
-    db.commit()
-    db.refresh(db_subject)
-    return SubjectResponse(
-        id=db_subject.id,
-        name=db_subject.name,
-        code=db_subject.code,
-        teacher_id=db_subject.teacher_id,
-        class_id=db_subject.class_id,
-        teacher_name=db_subject.teacher.name if db_subject.teacher else None,
-        class_name=db_subject.subject_class.name if db_subject.subject_class else None,
-    )
+
+    return run_write(db, write)
 
 
 @router.delete("/{subject_id}")
 def delete_subject(subject_id: int, db: Session = Depends(get_db)):
-    db_subject = db.query(Subject).filter(Subject.id == subject_id).first()
-    if not db_subject:
-        raise HTTPException(status_code=404, detail="Subject not found")
-    db.delete(db_subject)
-    db.commit()
-    return {"message": "Subject deleted successfully"}
+    def write(db: Session):
+        db_subject = db.query(Subject).filter(Subject.id == subject_id).first()
+        if not db_subject:
+            raise HTTPException(status_code=404, detail="Subject not found")
+        db.delete(db_subject)
+        db.flush()
+        return {"message": "Subject deleted successfully"}
+
+    return run_write(db, write)
@@ -1,79 +1,168 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from database import get_db
+from database import get_db, get_read_db
+from pagination import MAX_PAGE_SIZE, paginate
+from batch import in_request_order, parse_ids
+from projections import TEACHERS
+from versions import TEACHER_TABLES, conditional_get
+from search import apply_search
+from serialization import batch_response, row_response, rows_response
+from write_queue import run_write
+from bulk import bulk_create, bulk_delete, bulk_update, summarize
 from models import Teacher
-from schemas.teacher import TeacherCreate, TeacherUpdate, TeacherResponse
+from schemas.teacher import (
+    TeacherCreate, TeacherUpdate, TeacherBulkUpdate, TeacherResponse,
+    TeacherBatchResponse,
+)
+from schemas.bulk import BulkDelete, BulkResponse
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[TeacherResponse])
+@router.get(
+    "/",
+    response_model=list[TeacherResponse],
+    dependencies=[Depends(conditional_get(TEACHER_TABLES))],
+)
 def list_teachers(
+    response: Response,
     search: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
 ):
-    query = db.query(Teacher)
+    selected = TEACHERS.pick(fields)
+    query = TEACHERS.select(db.query, selected, Teacher.id)
+    keys = [Teacher.id]
     if search:
-        query = query.filter(
-            Teacher.name.ilike(f"%{search}%")
-            | Teacher.email.ilike(f"%{search}%")
-        )
+        query, keys = apply_search(query, Teacher, search)
     if department:
-        query = query.filter(Teacher.department.ilike(f"%{department}%"))
-    return query.all()
+        query = query.filter(Teacher.department.collate("NOCASE") == department)
+    rows = paginate(query, keys, limit, after, response)
+    return rows_response(TeacherResponse, list(selected), rows, response)
+
+
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_create_teachers(teachers: list[TeacherCreate], db: Session = Depends(get_db)):
+    def write(db: Session):
+        results = bulk_create(db, Teacher, [item.model_dump() for item in teachers])
+        return summarize(results)
+
+    return run_write(db, write)
+
+
+@router.put("/bulk", response_model=BulkResponse)
+def bulk_update_teachers(
+    teachers: list[TeacherBulkUpdate], db: Session = Depends(get_db)
+):
+    def write(db: Session):
+        results = bulk_update(
+            db, Teacher, [item.model_dump(exclude_unset=True) for item in teachers]
+        )
+        return summarize(results)
+
+    return run_write(db, write)
+
+
+@router.delete("/bulk", response_model=BulkResponse)
+def bulk_delete_teachers(body: BulkDelete, db: Session = Depends(get_db)):
+    def write(db: Session):
+        results = bulk_delete(db, Teacher, body.ids)
+        return summarize(results)
+
+    return run_write(db, write)
+
+
+@router.get(
+    "/batch",
+    response_model=TeacherBatchResponse,
+    dependencies=[Depends(conditional_get(TEACHER_TABLES))],
+)
+def get_teachers_batch(
+    response: Response,
+    ids: str = Query(...),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    wanted = parse_ids(ids)
+    selected = TEACHERS.pick(fields)
+    query = TEACHERS.select(db.query, selected, Teacher.id).filter(Teacher.id.in_(wanted))
+    rows = query.all()
+    rows, missing = in_request_order(rows, wanted)
+    return batch_response(TeacherResponse, list(selected), rows, missing, response)
 
 
-@router.get("/{teacher_id}", response_model=TeacherResponse)
-def get_teacher(teacher_id: int, db: Session = Depends(get_db)):
-    teacher = db.query(Teacher).filter(Teacher.id == teacher_id).first()
-    if not teacher:
+@router.get(
+    "/{teacher_id}",
+    response_model=TeacherResponse,
+    dependencies=[Depends(conditional_get(TEACHER_TABLES))],
+)
+def get_teacher(
+    teacher_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    selected = TEACHERS.pick(fields)
+    row = TEACHERS.select(db.query, selected).filter(Teacher.id == teacher_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Teacher not found")
-    return teacher
+    return row_response(TeacherResponse, list(selected), row, response)
 
 
 @router.post("/", response_model=TeacherResponse, status_code=201)
 def create_teacher(teacher: TeacherCreate, db: Session = Depends(get_db)):
-    existing = db.query(Teacher).filter(Teacher.email == teacher.email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    db_teacher = Teacher(**teacher.model_dump())
-    db.add(db_teacher)
-    db.commit()
-    db.refresh(db_teacher)
-    return db_teacher
+    def write(db: Session):
+        existing = db.query(Teacher).filter(Teacher.email == teacher.email).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        db_teacher = Teacher(**teacher.model_dump())
+        db.add(db_teacher)
+        db.flush()
+        db.refresh(db_teacher)
+        return TeacherResponse.model_validate(db_teacher)
+
+    return run_write(db, write)
 
 
 @router.put("/{teacher_id}", response_model=TeacherResponse)
 def update_teacher(
     teacher_id: int, teacher: TeacherUpdate, db: Session = Depends(get_db)
 ):
-    db_teacher = db.query(Teacher).filter(Teacher.id == teacher_id).first()
-    if not db_teacher:
-        raise HTTPException(status_code=404, detail="Teacher not found")
-    update_data = teacher.model_dump(exclude_unset=True)
-    if "email" in update_data:
-        existing = (
-            db.query(Teacher)
-            .filter(Teacher.email == update_data["email"], Teacher.id != teacher_id)
-            .first()
-        )
-        if existing:
-            raise HTTPException(status_code=400, detail="Email already registered")
-    for key, value in update_data.items():
-        setattr(db_teacher, key, value)
-    db.commit()
-    db.refresh(db_teacher)
-    return db_teacher
+    def write(db: Session):
+        db_teacher = db.query(Teacher).filter(Teacher.id == teacher_id).first()
+        if not db_teacher:
+            raise HTTPException(status_code=404, detail="Teacher not found")
+        update_data = teacher.model_dump(exclude_unset=True)
+        if "email" in update_data:
+            existing = (
+                db.query(Teacher)
+                .filter(Teacher.email == update_data["email"], Teacher.id != teacher_id)
+                .first()
+            )
+            if existing:
+                raise HTTPException(status_code=400, detail="Email already registered")
+        for key, value in update_data.items():
+            setattr(db_teacher, key, value)
+        db.flush()
+        db.refresh(db_teacher)
+        return TeacherResponse.model_validate(db_teacher)
+
+    return run_write(db, write)
 
 
 @router.delete("/{teacher_id}")
 def delete_teacher(teacher_id: int, db: Session = Depends(get_db)):
-    db_teacher = db.query(Teacher).filter(Teacher.id == teacher_id).first()
-    if not db_teacher:
-        raise HTTPException(status_code=404, detail="Teacher not found")
-    db.delete(db_teacher)
-    db.commit()
-    return {"message": "Teacher deleted successfully"}
+    def write(db: Session):
+        db_teacher = db.query(Teacher).filter(Teacher.id == teacher_id).first()
+        if not db_teacher:
+            raise HTTPException(status_code=404, detail="Teacher not found")
+        db.delete(db_teacher)
+        db.flush()
+        return {"message": "Teacher deleted successfully"}
+
+    return run_write(db, write)
@@ -0,0 +1,3 @@
+from routes_async import students, teachers, classes, subjects
+
+__all__ = ["students", "teachers", "classes", "subjects"]
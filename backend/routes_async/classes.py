@@ -0,0 +1,123 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from database_async import get_async_db, get_async_read_db
+from pagination import MAX_PAGE_SIZE, apply_keyset, page_rows
+from batch import in_request_order, parse_ids
+from projections import CLASSES
+from roster import ROSTER_LOAD, to_roster
+from versions import CLASS_TABLES, ROSTER_TABLES, conditional_get
+from search import apply_search
+from serialization import batch_response, row_response, rows_response
+from models import Class
+from schemas.class_schema import (
+    ClassCreate, ClassUpdate, ClassResponse, ClassBatchResponse, ClassRoster,
+)
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=list[ClassResponse],
+    dependencies=[Depends(conditional_get(CLASS_TABLES))],
+)
+async def list_classes(
+    response: Response,
+    search: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = CLASSES.pick(fields)
+    query = CLASSES.select(select, selected, Class.id)
+    keys = [Class.id]
+    if search:
+        query, keys = apply_search(query, Class, search)
+    rows = (await db.execute(apply_keyset(query, keys, limit, after))).all()
+    rows = page_rows(rows, keys, limit, response)
+    return rows_response(ClassResponse, list(selected), rows, response)
+
+
+@router.get(
+    "/batch",
+    response_model=ClassBatchResponse,
+    dependencies=[Depends(conditional_get(CLASS_TABLES))],
+)
+async def get_classes_batch(
+    response: Response,
+    ids: str = Query(...),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    wanted = parse_ids(ids)
+    selected = CLASSES.pick(fields)
+    query = CLASSES.select(select, selected, Class.id).where(Class.id.in_(wanted))
+    rows = (await db.execute(query)).all()
+    rows, missing = in_request_order(rows, wanted)
+    return batch_response(ClassResponse, list(selected), rows, missing, response)
+
+
+@router.get(
+    "/{class_id}",
+    response_model=ClassResponse,
+    dependencies=[Depends(conditional_get(CLASS_TABLES))],
+)
+async def get_class(
+    class_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = CLASSES.pick(fields)
+    query = CLASSES.select(select, selected).where(Class.id == class_id)
+    row = (await db.execute(query)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Class not found")
+    return row_response(ClassResponse, list(selected), row, response)
+
+
+@router.get(
+    "/{class_id}/roster",
+    response_model=ClassRoster,
+    dependencies=[Depends(conditional_get(ROSTER_TABLES))],
+)
+async def get_class_roster(class_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    cls = await db.scalar(select(Class).options(*ROSTER_LOAD).where(Class.id == class_id))
+    if not cls:
+        raise HTTPException(status_code=404, detail="Class not found")
+    return to_roster(cls)
+
+
+@router.post("/", response_model=ClassResponse, status_code=201)
+async def create_class(cls: ClassCreate, db: AsyncSession = Depends(get_async_db)):
+    db_class = Class(**cls.model_dump())
+    db.add(db_class)
+    await db.commit()
+    return db_class
+
+
+@router.put("/{class_id}", response_model=ClassResponse)
+async def update_class(
+    class_id: int, cls: ClassUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    db_class = await db.get(Class, class_id)
+    if not db_class:
+        raise HTTPException(status_code=404, detail="Class not found")
+    for key, value in cls.model_dump(exclude_unset=True).items():
+        setattr(db_class, key, value)
+    await db.commit()
+    return db_class
+
+
+@router.delete("/{class_id}")
+async def delete_class(class_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_class = await db.get(Class, class_id)
+    if not db_class:
+        raise HTTPException(status_code=404, detail="Class not found")
+    await db.delete(db_class)
+    await db.commit()
+    return {"message": "Class deleted successfully"}
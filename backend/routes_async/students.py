@@ -0,0 +1,185 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import Optional
+
+from database_async import get_async_db, get_async_read_db
+from pagination import MAX_PAGE_SIZE, apply_keyset, page_rows
+from batch import in_request_order, parse_ids
+from projections import STUDENTS
+from versions import STUDENT_TABLES, conditional_get
+from search import apply_search
+from serialization import batch_response, row_response, rows_response
+from bulk import bulk_create, bulk_delete, bulk_update, summarize
+from models import Student, Class
+from schemas.student import (
+    StudentCreate, StudentUpdate, StudentBulkUpdate, StudentResponse,
+    StudentBatchResponse,
+)
+from schemas.bulk import BulkDelete, BulkResponse
+
+router = APIRouter()
+
+
+def _to_response(student: Student) -> StudentResponse:
+    return StudentResponse(
+        id=student.id,
+        name=student.name,
+        email=student.email,
+        phone=student.phone,
+        class_id=student.class_id,
+        class_name=student.student_class.name if student.student_class else None,
+    )
+
+
+async def _load(db: AsyncSession, student_id: int) -> Optional[Student]:
+    return await db.scalar(
+        select(Student)
+        .options(joinedload(Student.student_class))
+        .where(Student.id == student_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+async def _check_references(db: AsyncSession, data: dict, student_id: int = None):
+    if "email" in data:
+        query = select(Student.id).where(Student.email == data["email"])
+        if student_id is not None:
+            query = query.where(Student.id != student_id)
+        if await db.scalar(query) is not None:
+            raise HTTPException(status_code=400, detail="Email already registered")
+    if data.get("class_id"):
+        if await db.get(Class, data["class_id"]) is None:
+            raise HTTPException(status_code=400, detail="Class not found")
+
+
+@router.get(
+    "/",
+    response_model=list[StudentResponse],
+    dependencies=[Depends(conditional_get(STUDENT_TABLES))],
+)
+async def list_students(
+    response: Response,
+    search: Optional[str] = Query(None),
+    class_id: Optional[int] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = STUDENTS.pick(fields)
+    query = STUDENTS.select(select, selected, Student.id)
+    keys = [Student.id]
+    if search:
+        query, keys = apply_search(query, Student, search)
+    if class_id:
+        query = query.where(Student.class_id == class_id)
+    rows = (await db.execute(apply_keyset(query, keys, limit, after))).all()
+    rows = page_rows(rows, keys, limit, response)
+    return rows_response(StudentResponse, list(selected), rows, response)
+
+
+# The set-based bulk helpers are sync; run_sync hands them the session.
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_students(
+    students: list[StudentCreate], db: AsyncSession = Depends(get_async_db)
+):
+    rows = [item.model_dump() for item in students]
+    results = await db.run_sync(bulk_create, Student, rows)
+    await db.commit()
+    return summarize(results)
+
+
+@router.put("/bulk", response_model=BulkResponse)
+async def bulk_update_students(
+    students: list[StudentBulkUpdate], db: AsyncSession = Depends(get_async_db)
+):
+    rows = [item.model_dump(exclude_unset=True) for item in students]
+    results = await db.run_sync(bulk_update, Student, rows)
+    await db.commit()
+    return summarize(results)
+
+
+@router.delete("/bulk", response_model=BulkResponse)
+async def bulk_delete_students(
+    body: BulkDelete, db: AsyncSession = Depends(get_async_db)
+):
+    results = await db.run_sync(bulk_delete, Student, body.ids)
+    await db.commit()
+    return summarize(results)
+
+
+@router.get(
+    "/batch",
+    response_model=StudentBatchResponse,
+    dependencies=[Depends(conditional_get(STUDENT_TABLES))],
+)
+async def get_students_batch(
+    response: Response,
+    ids: str = Query(...),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    wanted = parse_ids(ids)
+    selected = STUDENTS.pick(fields)
+    query = STUDENTS.select(select, selected, Student.id).where(Student.id.in_(wanted))
+    rows = (await db.execute(query)).all()
+    rows, missing = in_request_order(rows, wanted)
+    return batch_response(StudentResponse, list(selected), rows, missing, response)
+
+
+@router.get(
+    "/{student_id}",
+    response_model=StudentResponse,
+    dependencies=[Depends(conditional_get(STUDENT_TABLES))],
+)
+async def get_student(
+    student_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = STUDENTS.pick(fields)
+    query = STUDENTS.select(select, selected).where(Student.id == student_id)
+    row = (await db.execute(query)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return row_response(StudentResponse, list(selected), row, response)
+
+
+@router.post("/", response_model=StudentResponse, status_code=201)
+async def create_student(
+    student: StudentCreate, db: AsyncSession = Depends(get_async_db)
+):
+    data = student.model_dump()
+    await _check_references(db, data)
+    db_student = Student(**data)
+    db.add(db_student)
+    await db.commit()
+    return _to_response(await _load(db, db_student.id))
+
+
+@router.put("/{student_id}", response_model=StudentResponse)
+async def update_student(
+    student_id: int, student: StudentUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    db_student = await db.get(Student, student_id)
+    if not db_student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    update_data = student.model_dump(exclude_unset=True)
+    await _check_references(db, update_data, student_id)
+    for key, value in update_data.items():
+        setattr(db_student, key, value)
+    await db.commit()
+    return _to_response(await _load(db, student_id))
+
+
+@router.delete("/{student_id}")
+async def delete_student(student_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_student = await db.get(Student, student_id)
+    if not db_student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    await db.delete(db_student)
+    await db.commit()
+    return {"message": "Student deleted successfully"}
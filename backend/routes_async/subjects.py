@@ -0,0 +1,194 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import Optional
+
+from database_async import get_async_db, get_async_read_db
+from pagination import MAX_PAGE_SIZE, apply_keyset, page_rows
+from batch import in_request_order, parse_ids
+from projections import SUBJECTS
+from versions import SUBJECT_TABLES, conditional_get
+from search import apply_search
+from serialization import batch_response, row_response, rows_response
+from bulk import bulk_create, bulk_delete, bulk_update, summarize
+from models import Subject, Teacher, Class
+from schemas.subject import (
+    SubjectCreate, SubjectUpdate, SubjectBulkUpdate, SubjectResponse,
+    SubjectBatchResponse,
+)
+from schemas.bulk import BulkDelete, BulkResponse
+
+router = APIRouter()
+
+_RELATIONS = (joinedload(Subject.teacher), joinedload(Subject.subject_class))
+
+
+def _to_response(subject: Subject) -> SubjectResponse:
+    return SubjectResponse(
+        id=subject.id,
+        name=subject.name,
+        code=subject.code,
+        teacher_id=subject.teacher_id,
+        class_id=subject.class_id,
+        teacher_name=subject.teacher.name if subject.teacher else None,
+        class_name=subject.subject_class.name if subject.subject_class else None,
+    )
+
+
+async def _load(db: AsyncSession, subject_id: int) -> Optional[Subject]:
+    return await db.scalar(
+        select(Subject)
+        .options(*_RELATIONS)
+        .where(Subject.id == subject_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+async def _check_references(db: AsyncSession, data: dict, subject_id: int = None):
+    if "code" in data:
+        query = select(Subject.id).where(Subject.code == data["code"])
+        if subject_id is not None:
+            query = query.where(Subject.id != subject_id)
+        if await db.scalar(query) is not None:
+            raise HTTPException(status_code=400, detail="Subject code already exists")
+    if data.get("teacher_id"):
+        if await db.get(Teacher, data["teacher_id"]) is None:
+            raise HTTPException(status_code=400, detail="Teacher not found")
+    if data.get("class_id"):
+        if await db.get(Class, data["class_id"]) is None:
+            raise HTTPException(status_code=400, detail="Class not found")
+
+
+@router.get(
+    "/",
+    response_model=list[SubjectResponse],
+    dependencies=[Depends(conditional_get(SUBJECT_TABLES))],
+)
+async def list_subjects(
+    response: Response,
+    search: Optional[str] = Query(None),
+    teacher_id: Optional[int] = Query(None),
+    class_id: Optional[int] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = SUBJECTS.pick(fields)
+    query = SUBJECTS.select(select, selected, Subject.id)
+    keys = [Subject.id]
+    if search:
+        query, keys = apply_search(query, Subject, search)
+    if teacher_id:
+        query = query.where(Subject.teacher_id == teacher_id)
+    if class_id:
+        query = query.where(Subject.class_id == class_id)
+    rows = (await db.execute(apply_keyset(query, keys, limit, after))).all()
+    rows = page_rows(rows, keys, limit, response)
+    return rows_response(SubjectResponse, list(selected), rows, response)
+
+
+# The set-based bulk helpers are sync; run_sync hands them the session.
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_subjects(
+    subjects: list[SubjectCreate], db: AsyncSession = Depends(get_async_db)
+):
+    rows = [item.model_dump() for item in subjects]
+    results = await db.run_sync(bulk_create, Subject, rows)
+    await db.commit()
+    return summarize(results)
+
+
+@router.put("/bulk", response_model=BulkResponse)
+async def bulk_update_subjects(
+    subjects: list[SubjectBulkUpdate], db: AsyncSession = Depends(get_async_db)
+):
+    rows = [item.model_dump(exclude_unset=True) for item in subjects]
+    results = await db.run_sync(bulk_update, Subject, rows)
+    await db.commit()
+    return summarize(results)
+
+
+@router.delete("/bulk", response_model=BulkResponse)
+async def bulk_delete_subjects(
+    body: BulkDelete, db: AsyncSession = Depends(get_async_db)
+):
+    results = await db.run_sync(bulk_delete, Subject, body.ids)
+    await db.commit()
+    return summarize(results)
+
+
+@router.get(
+    "/batch",
+    response_model=SubjectBatchResponse,
+    dependencies=[Depends(conditional_get(SUBJECT_TABLES))],
+)
+async def get_subjects_batch(
+    response: Response,
+    ids: str = Query(...),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    wanted = parse_ids(ids)
+    selected = SUBJECTS.pick(fields)
+    query = SUBJECTS.select(select, selected, Subject.id).where(Subject.id.in_(wanted))
+    rows = (await db.execute(query)).all()
+    rows, missing = in_request_order(rows, wanted)
+    return batch_response(SubjectResponse, list(selected), rows, missing, response)
+
+
+@router.get(
+    "/{subject_id}",
+    response_model=SubjectResponse,
+    dependencies=[Depends(conditional_get(SUBJECT_TABLES))],
+)
+async def get_subject(
+    subject_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = SUBJECTS.pick(fields)
+    query = SUBJECTS.select(select, selected).where(Subject.id == subject_id)
+    row = (await db.execute(query)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Subject not found")
+    return row_response(SubjectResponse, list(selected), row, response)
+
+
+@router.post("/", response_model=SubjectResponse, status_code=201)
+async def create_subject(
+    subject: SubjectCreate, db: AsyncSession = Depends(get_async_db)
+):
+    data = subject.model_dump()
+    await _check_references(db, data)
+    db_subject = Subject(**data)
+    db.add(db_subject)
+    await db.commit()
+    return _to_response(await _load(db, db_subject.id))
+
+
+@router.put("/{subject_id}", response_model=SubjectResponse)
+async def update_subject(
+    subject_id: int, subject: SubjectUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    db_subject = await db.get(Subject, subject_id)
+    if not db_subject:
+        raise HTTPException(status_code=404, detail="Subject not found")
+    update_data = subject.model_dump(exclude_unset=True)
+    await _check_references(db, update_data, subject_id)
+    for key, value in update_data.items():
+        setattr(db_subject, key, value)
+    await db.commit()
+    return _to_response(await _load(db, subject_id))
+
+
+@router.delete("/{subject_id}")
+async def delete_subject(subject_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_subject = await db.get(Subject, subject_id)
+    if not db_subject:
+        raise HTTPException(status_code=404, detail="Subject not found")
+    await db.delete(db_subject)
+    await db.commit()
+    return {"message": "Subject deleted successfully"}
@@ -0,0 +1,160 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from database_async import get_async_db, get_async_read_db
+from pagination import MAX_PAGE_SIZE, apply_keyset, page_rows
+from batch import in_request_order, parse_ids
+from projections import TEACHERS
+from versions import TEACHER_TABLES, conditional_get
+from search import apply_search
+from serialization import batch_response, row_response, rows_response
+from bulk import bulk_create, bulk_delete, bulk_update, summarize
+from models import Teacher
+from schemas.teacher import (
+    TeacherCreate, TeacherUpdate, TeacherBulkUpdate, TeacherResponse,
+    TeacherBatchResponse,
+)
+from schemas.bulk import BulkDelete, BulkResponse
+
+router = APIRouter()
+
+
+async def _check_email(db: AsyncSession, email: str, teacher_id: int = None):
+    query = select(Teacher.id).where(Teacher.email == email)
+    if teacher_id is not None:
+        query = query.where(Teacher.id != teacher_id)
+    if await db.scalar(query) is not None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+
+@router.get(
+    "/",
+    response_model=list[TeacherResponse],
+    dependencies=[Depends(conditional_get(TEACHER_TABLES))],
+)
+async def list_teachers(
+    response: Response,
+    search: Optional[str] = Query(None),
+    department: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = TEACHERS.pick(fields)
+    query = TEACHERS.select(select, selected, Teacher.id)
+    keys = [Teacher.id]
+    if search:
+        query, keys = apply_search(query, Teacher, search)
+    if department:
+        query = query.where(Teacher.department.collate("NOCASE") == department)
+    rows = (await db.execute(apply_keyset(query, keys, limit, after))).all()
+    rows = page_rows(rows, keys, limit, response)
+    return rows_response(TeacherResponse, list(selected), rows, response)
+
+
+# The set-based bulk helpers are sync; run_sync hands them the session.
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_teachers(
+    teachers: list[TeacherCreate], db: AsyncSession = Depends(get_async_db)
+):
+    rows = [item.model_dump() for item in teachers]
+    results = await db.run_sync(bulk_create, Teacher, rows)
+    await db.commit()
+    return summarize(results)
+
+
+@router.put("/bulk", response_model=BulkResponse)
+async def bulk_update_teachers(
+    teachers: list[TeacherBulkUpdate], db: AsyncSession = Depends(get_async_db)
+):
+    rows = [item.model_dump(exclude_unset=True) for item in teachers]
+    results = await db.run_sync(bulk_update, Teacher, rows)
+    await db.commit()
+    return summarize(results)
+
+
+@router.delete("/bulk", response_model=BulkResponse)
+async def bulk_delete_teachers(
+    body: BulkDelete, db: AsyncSession = Depends(get_async_db)
+):
+    results = await db.run_sync(bulk_delete, Teacher, body.ids)
+    await db.commit()
+    return summarize(results)
+
+
+@router.get(
+    "/batch",
+    response_model=TeacherBatchResponse,
+    dependencies=[Depends(conditional_get(TEACHER_TABLES))],
+)
+async def get_teachers_batch(
+    response: Response,
+    ids: str = Query(...),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    wanted = parse_ids(ids)
+    selected = TEACHERS.pick(fields)
+    query = TEACHERS.select(select, selected, Teacher.id).where(Teacher.id.in_(wanted))
+    rows = (await db.execute(query)).all()
+    rows, missing = in_request_order(rows, wanted)
+    return batch_response(TeacherResponse, list(selected), rows, missing, response)
+
+
+@router.get(
+    "/{teacher_id}",
+    response_model=TeacherResponse,
+    dependencies=[Depends(conditional_get(TEACHER_TABLES))],
+)
+async def get_teacher(
+    teacher_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = TEACHERS.pick(fields)
+    query = TEACHERS.select(select, selected).where(Teacher.id == teacher_id)
+    row = (await db.execute(query)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Teacher not found")
+    return row_response(TeacherResponse, list(selected), row, response)
+
+
+@router.post("/", response_model=TeacherResponse, status_code=201)
+async def create_teacher(
+    teacher: TeacherCreate, db: AsyncSession = Depends(get_async_db)
+):
+    await _check_email(db, teacher.email)
+    db_teacher = Teacher(**teacher.model_dump())
+    db.add(db_teacher)
+    await db.commit()
+    return db_teacher
+
+
+@router.put("/{teacher_id}", response_model=TeacherResponse)
+async def update_teacher(
+    teacher_id: int, teacher: TeacherUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    db_teacher = await db.get(Teacher, teacher_id)
+    if not db_teacher:
+        raise HTTPException(status_code=404, detail="Teacher not found")
+    update_data = teacher.model_dump(exclude_unset=True)
+    if "email" in update_data:
+        await _check_email(db, update_data["email"], teacher_id)
+    for key, value in update_data.items():
+        setattr(db_teacher, key, value)
+    await db.commit()
+    return db_teacher
+
+
+@router.delete("/{teacher_id}")
+async def delete_teacher(teacher_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_teacher = await db.get(Teacher, teacher_id)
+    if not db_teacher:
+        raise HTTPException(status_code=404, detail="Teacher not found")
+    await db.delete(db_teacher)
+    await db.commit()
+    return {"message": "Teacher deleted successfully"}
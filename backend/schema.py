@@ -0,0 +1,37 @@
+"""Create and drop the full database schema.
+
+The tables come from the models. The SQLite objects built on them are
+created afterwards, in a fixed order:
+
+1. search indexes;
+2. counter triggers;
+3. version triggers.
+
+The order matters. A trigger on a table that precedes the table's FTS5
+index in ``sqlite_master`` leaves other open connections unable to reload
+the schema after the index is dropped and recreated. Every entry point
+(the app, the CLI scripts, the benchmarks and the tests) goes through
+``create_schema``.
+"""
+import coherence
+import counters
+import search
+from database import Base
+from migrations import run_migrations
+
+
+def create_schema(engine) -> None:
+    """Create missing tables, their indexes and triggers, then migrate."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        search.create_search_indexes(connection)
+        counters.create_counter_triggers(connection)
+        coherence.create_version_triggers(connection)
+    run_migrations(engine)
+
+
+def drop_schema(engine) -> None:
+    """Drop every table, with the search indexes built on them."""
+    with engine.begin() as connection:
+        search.drop_search_indexes(connection)
+    Base.metadata.drop_all(bind=engine)
@@ -1,13 +1,37 @@
-from schemas.student import StudentCreate, StudentUpdate, StudentResponse
-from schemas.teacher import TeacherCreate, TeacherUpdate, TeacherResponse
-from schemas.class_schema import ClassCreate, ClassUpdate, ClassResponse
-from schemas.subject import SubjectCreate, SubjectUpdate, SubjectResponse
+from schemas.student import (
+    StudentCreate, StudentUpdate, StudentBulkUpdate, StudentResponse,
+    StudentBatchResponse,
+)
+from schemas.teacher import (
+    TeacherCreate, TeacherUpdate, TeacherBulkUpdate, TeacherResponse,
+    TeacherBatchResponse,
+)
+from schemas.class_schema import (
+    ClassCreate, ClassUpdate, ClassResponse, ClassBatchResponse, ClassRoster,
+)
+from schemas.subject import (
+    SubjectCreate, SubjectUpdate, SubjectBulkUpdate, SubjectResponse,
+    SubjectBatchResponse,
+)
+from schemas.bulk import BulkItemResult, BulkResponse, BulkDelete
+from schemas.imports import ImportRowError, ImportSummary
+from schemas.stats import (
+    ClassStudentCount, TeacherSubjectCount, StatsResponse, CacheStats,
+)
+from schemas.profile import ProfileSummary
 from schemas.auth import UserCreate, UserResponse, LoginRequest, LoginResponse
 
 __all__ = [
-    "StudentCreate", "StudentUpdate", "StudentResponse",
-    "TeacherCreate", "TeacherUpdate", "TeacherResponse",
-    "ClassCreate", "ClassUpdate", "ClassResponse",
-    "SubjectCreate", "SubjectUpdate", "SubjectResponse",
+    "StudentCreate", "StudentUpdate", "StudentBulkUpdate", "StudentResponse",
+    "StudentBatchResponse",
+    "TeacherCreate", "TeacherUpdate", "TeacherBulkUpdate", "TeacherResponse",
+    "TeacherBatchResponse",
+    "ClassCreate", "ClassUpdate", "ClassResponse", "ClassBatchResponse", "ClassRoster",
+    "SubjectCreate", "SubjectUpdate", "SubjectBulkUpdate", "SubjectResponse",
+    "SubjectBatchResponse",
+    "BulkItemResult", "BulkResponse", "BulkDelete",
+    "ImportRowError", "ImportSummary",
+    "ClassStudentCount", "TeacherSubjectCount", "StatsResponse", "CacheStats",
+    "ProfileSummary",
     "UserCreate", "UserResponse", "LoginRequest", "LoginResponse",
 ]
@@ -1,6 +1,10 @@
 from pydantic import BaseModel
 from typing import Optional
 
+from schemas.student import StudentResponse
+from schemas.subject import SubjectResponse
+from schemas.teacher import TeacherResponse
+
 
 class ClassBase(BaseModel):
     name: str
@@ -23,3 +27,14 @@ class ClassResponse(ClassBase):
 
     class Config:
         from_attributes = True
+
+
+class ClassBatchResponse(BaseModel):
+    items: list[ClassResponse]
+    missing: list[int]
+
+
+class ClassRoster(ClassResponse):
+    students: list[StudentResponse]
+    subjects: list[SubjectResponse]
+    teachers: list[TeacherResponse]
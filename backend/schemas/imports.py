@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    row: int
+    detail: str
+
+
+class ImportSummary(BaseModel):
+    entity: str
+    processed: int = 0
+    created: int = 0
+    failed: int = 0
+    chunks: int = 0
+    errors: list[ImportRowError] = []
+    errors_truncated: bool = False
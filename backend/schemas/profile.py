@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    trigger: str
+    method: str
+    path: str
+    status: Optional[int] = None
+    started_at: str
+    duration_ms: float
+    samples: int
@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+
+
+class ClassStudentCount(BaseModel):
+    class_id: int
+    class_name: str
+    students: int
+
+
+class TeacherSubjectCount(BaseModel):
+    teacher_id: int
+    teacher_name: str
+    subjects: int
+
+
+class StatsResponse(BaseModel):
+    students: int
+    teachers: int
+    classes: int
+    subjects: int
+    students_per_class: list[ClassStudentCount]
+    subjects_per_teacher: list[TeacherSubjectCount]
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+    expirations: int
+    entries: int
+    size_bytes: int
+    max_entries: int
+    max_bytes: int
+    ttl_seconds: float
@@ -20,9 +20,18 @@ class StudentUpdate(BaseModel):
     class_id: Optional[int] = None
 
 
+class StudentBulkUpdate(StudentUpdate):
+    id: int
+
+
 class StudentResponse(StudentBase):
     id: int
     class_name: Optional[str] = None
 
     class Config:
         from_attributes = True
+
+
+class StudentBatchResponse(BaseModel):
+    items: list[StudentResponse]
+    missing: list[int]
@@ -20,6 +20,10 @@ class SubjectUpdate(BaseModel):
     class_id: Optional[int] = None
 
 
+class SubjectBulkUpdate(SubjectUpdate):
+    id: int
+
+
 class SubjectResponse(SubjectBase):
     id: int
     teacher_name: Optional[str] = None
@@ -27,3 +31,8 @@ class SubjectResponse(SubjectBase):
 
     class Config:
         from_attributes = True
+
+
+class SubjectBatchResponse(BaseModel):
+    items: list[SubjectResponse]
+    missing: list[int]
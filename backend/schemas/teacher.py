@@ -20,8 +20,17 @@ class TeacherUpdate(BaseModel):
     department: Optional[str] = None
 
 
+class TeacherBulkUpdate(TeacherUpdate):
+    id: int
+
+
 class TeacherResponse(TeacherBase):
     id: int
 
     class Config:
         from_attributes = True
+
+
+class TeacherBatchResponse(BaseModel):
+    items: list[TeacherResponse]
+    missing: list[int]
@@ -0,0 +1,113 @@
+import re
+import sqlite3
+from functools import lru_cache
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, or_, text
+
+# Columns indexed for the ``search`` parameter of each list route.
+SEARCH_COLUMNS = {
+    "students": ("name", "email"),
+    "teachers": ("name", "email"),
+    "classes": ("name", "section"),
+    "subjects": ("name", "code"),
+}
+
+_fts_metadata = MetaData()
+
+
+@lru_cache(maxsize=None)
+def fts5_available() -> bool:
+    """Whether the linked SQLite library was built with FTS5."""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+@lru_cache(maxsize=None)
+def _fts_table(table_name: str) -> Table:
+    # The hidden ``rank`` column is mapped under the ``search_rank`` key so
+    # pagination can read it back from the ``search_rank`` result column.
+    return Table(
+        f"{table_name}_fts",
+        _fts_metadata,
+        Column("rowid", Integer),
+        Column("rank", Float, key="search_rank"),
+        Column(f"{table_name}_fts", String),
+    )
+
+
+def _ddl(table_name: str, columns: tuple) -> list[str]:
+    fts = f"{table_name}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"{cols}, content='{table_name}', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        # Index rows that existed before the search table was created.
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def create_search_indexes(connection) -> None:
+    """Create the FTS5 indexes and their triggers where missing."""
+    if connection.dialect.name != "sqlite" or not fts5_available():
+        return
+    for table_name, columns in SEARCH_COLUMNS.items():
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+            {"name": f"{table_name}_fts"},
+        ).first()
+        if exists:
+            continue
+        for statement in _ddl(table_name, columns):
+            connection.exec_driver_sql(statement)
+
+
+def drop_search_indexes(connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for table_name in SEARCH_COLUMNS:
+        # Dropping the virtual table leaves the triggers on the base table,
+        # which is dropped right after.
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table_name}_fts")
+
+
+def match_expression(search: str) -> str:
+    """Turn free text into an FTS5 query that prefix-matches every word."""
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", search))
+
+
+def apply_search(query, model, search: str):
+    """Filter ``query`` by ``search`` and return it with its ordering keys.
+
+    Uses the FTS5 index ranked by bm25 when available, and falls back to a
+    substring match on the indexed columns otherwise. The rank is selected
+    as a ``search_rank`` column next to the query's own.
+    """
+    table_name = model.__tablename__
+    terms = match_expression(search)
+    if not terms or not fts5_available():
+        columns = [getattr(model, c) for c in SEARCH_COLUMNS[table_name]]
+        query = query.filter(or_(*(c.ilike(f"%{search}%") for c in columns)))
+        return query, [model.id]
+    fts = _fts_table(table_name)
+    query = query.join(fts, fts.c.rowid == model.id).filter(
+        fts.c[f"{table_name}_fts"].match(terms)
+    )
+    query = query.add_columns(fts.c.search_rank.label("search_rank"))
+    return query, [fts.c.search_rank, model.id]
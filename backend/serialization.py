@@ -0,0 +1,64 @@
+"""Encode rows of selected columns straight to JSON bytes.
+
+List and detail routes select exactly their response's columns and hand the
+rows here instead of hydrating ORM entities and building a response model
+per row that FastAPI then validates again. Each response schema gets one
+precompiled pydantic-core serializer for a TypedDict with the same fields,
+so a page of rows is encoded in a single call.
+"""
+from functools import lru_cache
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+
+@lru_cache(maxsize=None)
+def row_type(schema: type[BaseModel]) -> type:
+    # total=False lets callers leave fields out of a row.
+    return TypedDict(
+        f"{schema.__name__}Row",
+        {name: field.annotation for name, field in schema.model_fields.items()},
+        total=False,
+    )
+
+
+@lru_cache(maxsize=None)
+def row_adapter(schema: type[BaseModel], many: bool) -> TypeAdapter:
+    return TypeAdapter(list[row_type(schema)] if many else row_type(schema))
+
+
+@lru_cache(maxsize=None)
+def batch_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    batch_type = TypedDict(
+        f"{schema.__name__}Batch", {"items": list[row_type(schema)], "missing": list[int]}
+    )
+    return TypeAdapter(batch_type)
+
+
+def json_response(body: bytes, response: Response) -> Response:
+    # A returned Response skips FastAPI's merge of headers set by the route
+    # and its dependencies (ETag, X-Next-Cursor), so copy them here.
+    encoded = Response(body, media_type="application/json")
+    encoded.headers.raw.extend(response.headers.raw)
+    return encoded
+
+
+def rows_response(schema: type[BaseModel], names: list, rows, response: Response) -> Response:
+    """Encode ``rows`` as a JSON array of ``schema`` objects keyed by ``names``."""
+    body = row_adapter(schema, True).dump_json([dict(zip(names, row)) for row in rows])
+    return json_response(body, response)
+
+
+def row_response(schema: type[BaseModel], names: list, row, response: Response) -> Response:
+    body = row_adapter(schema, False).dump_json(dict(zip(names, row)))
+    return json_response(body, response)
+
+
+def batch_response(
+    schema: type[BaseModel], names: list, rows, missing: list, response: Response
+) -> Response:
+    """Encode a multi-get result: found ``rows`` plus the ``missing`` ids."""
+    items = [dict(zip(names, row)) for row in rows]
+    body = batch_adapter(schema).dump_json({"items": items, "missing": missing})
+    return json_response(body, response)
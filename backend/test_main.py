@@ -3,8 +3,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from database import Base, get_db
+from database import get_db, get_read_db
 from main import app
+from schema import create_schema, drop_schema
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -23,15 +24,16 @@ def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
 
 client = TestClient(app)
 
 
 @pytest.fixture(autouse=True)
 def setup_db():
-    Base.metadata.create_all(bind=engine)
+    create_schema(engine)
     yield
-    Base.metadata.drop_all(bind=engine)
+    drop_schema(engine)
 
 
 # Health check
@@ -1,11 +1,20 @@
+import os
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# The app reads its configuration at import time. Pointing it at the test
+# database lets its version watcher see the tests' writes.
+os.environ["DATABASE_URL"] = SQLALCHEMY_DATABASE_URL
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
-from database import Base, get_db
+import query_audit
+from database import get_db, get_read_db
 from main import app
+from schema import create_schema, drop_schema
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
@@ -21,15 +30,37 @@ def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
 
 
 @pytest.fixture(autouse=True)
 def setup_db():
-    Base.metadata.create_all(bind=engine)
+    create_schema(engine)
     yield
-    Base.metadata.drop_all(bind=engine)
+    drop_schema(engine)
 
 
 @pytest.fixture
 def client():
     return TestClient(app)
+
+
+@pytest.fixture
+def query_log():
+    """Collect every SQL statement executed during the test."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def sql_audit():
+    """A ``query_audit.QueryAudit`` with one ``metrics.RequestDB`` per
+    request in ``requests``."""
+    with query_audit.record() as audit:
+        yield audit
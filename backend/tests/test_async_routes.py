@@ -0,0 +1,118 @@
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database_async import async_url, get_async_db, get_async_read_db
+from query_audit import QueryAuditMiddleware
+from routes_async import students, teachers, classes, subjects
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+async_engine = create_async_engine(async_url(SQLALCHEMY_DATABASE_URL))
+AsyncTestingSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def override_get_async_db():
+    async with AsyncTestingSession() as db:
+        yield db
+
+
+app = FastAPI()
+app.add_middleware(QueryAuditMiddleware)
+app.include_router(students.router, prefix="/api/students")
+app.include_router(teachers.router, prefix="/api/teachers")
+app.include_router(classes.router, prefix="/api/classes")
+app.include_router(subjects.router, prefix="/api/subjects")
+app.dependency_overrides[get_async_db] = override_get_async_db
+app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+
+@pytest.fixture
+def async_client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_async_student_crud(async_client):
+    cls = async_client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    resp = async_client.post("/api/students/", json={
+        "name": "Alice", "email": "alice@s.com", "class_id": cls["id"],
+    })
+    assert resp.status_code == 201
+    sid = resp.json()["id"]
+    assert resp.json()["class_name"] == "G1"
+
+    dup = async_client.post("/api/students/", json={"name": "A", "email": "alice@s.com"})
+    assert dup.status_code == 400
+
+    resp = async_client.put(f"/api/students/{sid}", json={"name": "Alicia"})
+    assert resp.json()["name"] == "Alicia"
+    assert resp.json()["class_name"] == "G1"
+    assert [s["name"] for s in async_client.get("/api/students/?search=ali").json()] == ["Alicia"]
+
+    assert async_client.delete(f"/api/students/{sid}").status_code == 200
+    assert async_client.get(f"/api/students/{sid}").status_code == 404
+
+
+def test_async_subject_relations_and_pagination(async_client):
+    teacher = async_client.post("/api/teachers/", json={"name": "T", "email": "t@s.com"}).json()
+    for i in range(3):
+        async_client.post("/api/subjects/", json={
+            "name": f"S{i}", "code": f"C{i}", "teacher_id": teacher["id"],
+        })
+    resp = async_client.get("/api/subjects/?limit=2")
+    assert [s["code"] for s in resp.json()] == ["C0", "C1"]
+    assert resp.json()[0]["teacher_name"] == "T"
+    cursor = resp.headers["x-next-cursor"]
+    resp = async_client.get(f"/api/subjects/?limit=2&after={cursor}")
+    assert [s["code"] for s in resp.json()] == ["C2"]
+    bad = async_client.post("/api/subjects/", json={"name": "X", "code": "X", "class_id": 99})
+    assert bad.status_code == 400
+
+
+def test_async_bulk_create(async_client):
+    resp = async_client.post("/api/teachers/bulk", json=[
+        {"name": "A", "email": "a@s.com"},
+        {"name": "B", "email": "a@s.com"},
+    ])
+    assert [r["status"] for r in resp.json()["results"]] == ["created", "error"]
+    assert len(async_client.get("/api/teachers/").json()) == 1
+
+
+def test_async_fields(async_client):
+    async_client.post("/api/teachers/", json={"name": "T1", "email": "t1@s.com"})
+    assert async_client.get("/api/teachers/?fields=name").json() == [{"name": "T1"}]
+    assert async_client.get("/api/teachers/1?fields=id,email").json() == {
+        "id": 1, "email": "t1@s.com",
+    }
+    assert async_client.get("/api/teachers/?fields=bogus").status_code == 400
+
+
+def test_async_batch(async_client):
+    cls = async_client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    resp = async_client.get(f"/api/classes/batch?ids=42,{cls['id']}")
+    assert resp.json() == {"items": [cls], "missing": [42]}
+
+
+def test_async_roster(async_client):
+    cls = async_client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    async_client.post("/api/students/", json={
+        "name": "S1", "email": "s1@s.com", "class_id": cls["id"],
+    })
+    roster = async_client.get(f"/api/classes/{cls['id']}/roster").json()
+    assert [s["name"] for s in roster["students"]] == ["S1"]
+    assert roster["subjects"] == [] and roster["teachers"] == []
+
+
+def test_async_query_audit(async_client, sql_audit, query_log):
+    async_client.post("/api/classes/", json={"name": "G1", "section": "A"})
+    sql_audit.clear()
+    query_log.clear()
+    async_client.get("/api/classes/1/roster")
+    [stats] = sql_audit.requests
+    assert 0 < stats.queries == len(query_log)
+    assert not stats.repeated()
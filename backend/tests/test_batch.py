@@ -0,0 +1,47 @@
+def _students(client, count):
+    cls = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    return [
+        client.post("/api/students/", json={
+            "name": f"S{i}", "email": f"s{i}@s.com", "class_id": cls["id"],
+        }).json()
+        for i in range(count)
+    ]
+
+
+def test_batch_keeps_request_order_and_reports_missing(client):
+    students = _students(client, 3)
+    ids = [students[2]["id"], 999, students[0]["id"], students[2]["id"]]
+    resp = client.get(f"/api/students/batch?ids={','.join(map(str, ids))}")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["items"] == [students[2], students[0]]
+    assert body["items"][0]["class_name"] == "G1"
+    assert body["missing"] == [999]
+
+
+def test_batch_is_one_query(client, query_log):
+    students = _students(client, 5)
+    query_log.clear()
+    ids = ",".join(str(s["id"]) for s in students)
+    client.get(f"/api/students/batch?ids={ids}")
+    assert len(query_log) == 1
+    assert " IN " in query_log[0]
+
+
+def test_batch_with_fields(client):
+    teacher = client.post("/api/teachers/", json={"name": "T1", "email": "t1@s.com"}).json()
+    resp = client.get(f"/api/teachers/batch?ids={teacher['id']},5&fields=name")
+    assert resp.json() == {"items": [{"name": "T1"}], "missing": [5]}
+
+
+def test_batch_rejects_bad_ids(client):
+    assert client.get("/api/classes/batch?ids=1,x").status_code == 400
+    assert client.get("/api/classes/batch?ids=,").status_code == 400
+    for out_of_range in ("99999999999999999999999", str(2 ** 63), "0", "-1"):
+        resp = client.get(f"/api/students/batch?ids=1,{out_of_range}")
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "ids must be comma-separated integers"
+    assert client.get(f"/api/students/batch?ids={2 ** 63 - 1}").json()["missing"] == [2 ** 63 - 1]
+    assert client.get("/api/classes/batch").status_code == 422
+    too_many = ",".join(str(i) for i in range(1, 1002))
+    assert client.get(f"/api/subjects/batch?ids={too_many}").status_code == 400
@@ -0,0 +1,45 @@
+import random
+
+from benchmarks.compare import compare, mann_whitney_greater
+
+
+def _report(scale=1.0, queries=2.0, seed=0):
+    rng = random.Random(seed)
+    samples = sorted(rng.gauss(20, 2) * scale for _ in range(200))
+    return {"scenarios": {"students.detail": {
+        "p50_ms": samples[100], "p95_ms": samples[190],
+        "queries_per_request": queries, "samples_ms": samples,
+    }}}
+
+
+def _statuses(rows):
+    return {(row["scenario"], row["metric"]): row["status"] for row in rows}
+
+
+def test_noise_is_not_a_regression():
+    statuses = _statuses(compare(_report(seed=1), _report(seed=2)))
+    assert set(statuses.values()) == {"ok"}
+
+
+def test_latency_and_query_regressions_are_flagged():
+    statuses = _statuses(compare(_report(), _report(scale=1.5, queries=3.0, seed=2)))
+    assert statuses[("students.detail", "p50_ms")] == "regressed"
+    assert statuses[("students.detail", "p95_ms")] == "regressed"
+    assert statuses[("students.detail", "queries_per_request")] == "regressed"
+
+
+def test_small_absolute_changes_are_ignored():
+    rows = compare(_report(scale=0.01), _report(scale=0.02, seed=2))
+    assert _statuses(rows)[("students.detail", "p50_ms")] == "ok"
+
+
+def test_missing_and_new_scenarios_do_not_fail():
+    current = {"scenarios": {"classes.list": _report()["scenarios"]["students.detail"]}}
+    statuses = _statuses(compare(_report(), current))
+    assert statuses == {("classes.list", "-"): "new", ("students.detail", "-"): "missing"}
+
+
+def test_mann_whitney_direction():
+    assert mann_whitney_greater([3, 4, 5, 6], [1, 1, 2, 2]) < 0.05
+    assert mann_whitney_greater([1, 1, 2, 2], [3, 4, 5, 6]) > 0.95
+    assert mann_whitney_greater([1, 1], [1, 1]) == 1.0
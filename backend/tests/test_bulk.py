@@ -0,0 +1,116 @@
+import time
+
+
+def test_bulk_create_students(client):
+    cls = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    client.post("/api/students/", json={"name": "Taken", "email": "taken@s.com"})
+    resp = client.post("/api/students/bulk", json=[
+        {"name": "A", "email": "a@s.com", "class_id": cls["id"]},
+        {"name": "B", "email": "taken@s.com"},
+        {"name": "C", "email": "a@s.com"},
+        {"name": "D", "email": "d@s.com", "class_id": 999},
+        {"name": "E", "email": "e@s.com"},
+    ])
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+    assert [r["status"] for r in body["results"]] == [
+        "created", "error", "error", "error", "created",
+    ]
+    assert body["results"][1]["detail"] == "Email already registered"
+    assert body["results"][2]["detail"] == "Email already registered"
+    assert body["results"][3]["detail"] == "Class not found"
+    student = client.get(f"/api/students/{body['results'][0]['id']}").json()
+    assert student["class_name"] == "G1"
+    assert len(client.get("/api/students/").json()) == 3
+
+
+def test_bulk_update_subjects(client):
+    teacher = client.post("/api/teachers/", json={"name": "T", "email": "t@s.com"}).json()
+    ids = [
+        r["id"] for r in client.post("/api/subjects/bulk", json=[
+            {"name": "Math", "code": "M1"},
+            {"name": "Art", "code": "A1"},
+        ]).json()["results"]
+    ]
+    resp = client.put("/api/subjects/bulk", json=[
+        {"id": ids[0], "teacher_id": teacher["id"]},
+        {"id": ids[1], "code": "M1"},
+        {"id": 999, "name": "Ghost"},
+    ])
+    body = resp.json()
+    assert [r["status"] for r in body["results"]] == ["updated", "error", "error"]
+    assert body["results"][1]["detail"] == "Subject code already exists"
+    assert body["results"][2]["detail"] == "Subject not found"
+    assert client.get(f"/api/subjects/{ids[0]}").json()["teacher_name"] == "T"
+    assert client.get(f"/api/subjects/{ids[1]}").json()["code"] == "A1"
+
+
+def test_bulk_update_rejects_nulls_per_item(client):
+    ids = [
+        r["id"] for r in client.post("/api/students/bulk", json=[
+            {"name": "A", "email": "a@s.com"},
+            {"name": "B", "email": "b@s.com"},
+        ]).json()["results"]
+    ]
+    resp = client.put("/api/students/bulk", json=[
+        {"id": ids[0], "email": None},
+        {"id": ids[1], "name": None},
+        {"id": ids[1], "phone": None, "class_id": None},
+    ])
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [r["status"] for r in body["results"]] == ["error", "error", "updated"]
+    assert body["results"][0]["detail"] == "Email cannot be null"
+    assert body["results"][1]["detail"] == "Name cannot be null"
+    assert client.get(f"/api/students/{ids[0]}").json()["email"] == "a@s.com"
+
+
+def test_bulk_delete_teachers(client):
+    ids = [
+        r["id"] for r in client.post("/api/teachers/bulk", json=[
+            {"name": "A", "email": "a@s.com"},
+            {"name": "B", "email": "b@s.com"},
+        ]).json()["results"]
+    ]
+    resp = client.request("DELETE", "/api/teachers/bulk", json={"ids": [ids[0], 999]})
+    assert [r["status"] for r in resp.json()["results"]] == ["deleted", "error"]
+    assert [t["id"] for t in client.get("/api/teachers/").json()] == [ids[1]]
+    assert client.get("/api/stats/").json()["teachers"] == 1
+
+
+def test_bulk_delete_matches_single_delete(client):
+    teachers = [
+        client.post("/api/teachers/", json={"name": n, "email": f"{n}@s.com"}).json()["id"]
+        for n in ("a", "b")
+    ]
+    subjects = [
+        client.post("/api/subjects/", json={
+            "name": n, "code": n, "teacher_id": teacher_id,
+        }).json()["id"]
+        for n, teacher_id in zip(("M1", "A1"), teachers)
+    ]
+    client.delete(f"/api/teachers/{teachers[0]}")
+    client.request("DELETE", "/api/teachers/bulk", json={"ids": [teachers[1]]})
+    for subject_id in subjects:
+        subject = client.get(f"/api/subjects/{subject_id}").json()
+        assert (subject["teacher_id"], subject["teacher_name"]) == (None, None)
+
+    # SQLite hands a freed id to the next teacher, who must not inherit the
+    # deleted teacher's subjects.
+    new = client.post("/api/teachers/", json={"name": "c", "email": "c@s.com"}).json()
+    assert new["id"] in teachers
+    for subject_id in subjects:
+        assert client.get(f"/api/subjects/{subject_id}").json()["teacher_id"] is None
+    assert client.get("/api/stats/").json()["subjects_per_teacher"] == []
+
+
+def test_bulk_create_is_set_based(client, query_log):
+    students = [{"name": f"S{i}", "email": f"s{i}@s.com"} for i in range(10_000)]
+    start = time.perf_counter()
+    resp = client.post("/api/students/bulk", json=students)
+    elapsed = time.perf_counter() - start
+    assert resp.json()["succeeded"] == 10_000
+    inserts = [q for q in query_log if q.startswith("INSERT INTO students")]
+    assert len(inserts) <= 20
+    assert elapsed < 5
@@ -0,0 +1,103 @@
+import sqlite3
+
+import pytest
+
+import versions
+from coherence import DATABASE_ID_ROW, WATCHED_TABLES, VersionWatcher
+from database import create_sqlite_engine
+from response_cache import ResponseCache
+from schema import create_schema
+
+
+@pytest.fixture
+def shared_db(tmp_path):
+    path = tmp_path / "shared.db"
+    engine = create_sqlite_engine(f"sqlite:///{path}", "production")
+    create_schema(engine)
+    watcher = VersionWatcher(engine)
+    # Stands in for another worker process writing to the same file.
+    other = sqlite3.connect(path, isolation_level=None)
+    yield watcher, other
+    other.close()
+    watcher.close()
+    engine.dispose()
+
+
+def test_writes_by_other_connections_bump_versions(shared_db):
+    watcher, other = shared_db
+    watcher.poll()
+    students, teachers = versions.version("students"), versions.version("teachers")
+
+    watcher.poll()
+    assert versions.version("students") == students
+
+    other.execute("INSERT INTO students(name, email) VALUES ('S1', 's1@s.com')")
+    watcher.poll()
+    assert versions.version("students") > students
+    assert versions.version("teachers") == teachers
+
+
+def test_other_workers_writes_invalidate_cached_entries(shared_db):
+    watcher, other = shared_db
+    cache = ResponseCache()
+    versions.subscribe(cache.invalidate)
+    watcher.poll()
+    cache.set(("/api/classes/", ""), ("classes",), versions.version("classes"), [], b"[]")
+
+    other.execute("INSERT INTO classes(name, section) VALUES ('G1', 'A')")
+    watcher.poll()
+    assert cache.get(("/api/classes/", "")) is None
+
+
+def test_poll_interval_limits_checks(shared_db):
+    watcher, other = shared_db
+    watcher.interval = 60
+    watcher.poll()
+    before = versions.version("teachers")
+    other.execute("INSERT INTO teachers(name, email) VALUES ('T1', 't1@s.com')")
+    watcher.poll()
+    assert watcher.polls == 1
+    assert versions.version("teachers") == before
+
+
+def test_workers_agree_on_etags(shared_db, tmp_path, monkeypatch):
+    watcher, other = shared_db
+    second = VersionWatcher(create_sqlite_engine(f"sqlite:///{tmp_path / 'shared.db'}"))
+
+    def tag(worker):
+        monkeypatch.setattr(versions, "_shared", worker.counters)
+        return versions.etag(("students", "classes"), versions.version("students"))
+
+    before = tag(watcher)
+    assert tag(second) == before
+    other.execute("INSERT INTO students(name, email) VALUES ('S1', 's1@s.com')")
+    watcher.poll()
+    second.poll()
+    assert tag(watcher) == tag(second) != before
+    second.close()
+
+
+def test_recreated_databases_do_not_repeat_etags(shared_db, tmp_path, monkeypatch):
+    watcher, other = shared_db
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'fresh.db'}", "production")
+    create_schema(engine)
+    fresh = VersionWatcher(engine)
+    assert fresh.counters()[1]["students"] == watcher.counters()[1]["students"]
+
+    tags = set()
+    for worker in (watcher, fresh, None):
+        monkeypatch.setattr(versions, "_shared", worker and worker.counters)
+        tags.add(versions.etag(("students",), 0))
+    assert len(tags) == 3
+    fresh.close()
+    engine.dispose()
+
+
+def test_a_restored_database_bumps_every_table(shared_db):
+    watcher, other = shared_db
+    watcher.poll()
+    before = {table: versions.version(table) for table in WATCHED_TABLES}
+    other.execute("UPDATE table_versions SET version = 42 WHERE table_name = ?",
+                  (DATABASE_ID_ROW,))
+    watcher.poll()
+    assert all(versions.version(table) > before[table] for table in WATCHED_TABLES)
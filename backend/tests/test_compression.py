@@ -0,0 +1,66 @@
+import gzip
+
+import pytest
+
+from compression import negotiate
+
+
+def _seed(client, count):
+    client.post("/api/students/bulk", json=[
+        {"name": f"Student {i}", "email": f"s{i}@s.com"} for i in range(count)
+    ])
+
+
+def test_large_body_is_gzipped(client):
+    _seed(client, 50)
+    plain = client.get("/api/students/", headers={"Accept-Encoding": "identity"})
+    resp = client.get("/api/students/", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert int(resp.headers["content-length"]) < len(plain.content)
+    assert resp.content == plain.content
+    assert "content-encoding" not in plain.headers
+
+
+def test_small_body_is_not_compressed(client):
+    resp = client.get("/api/students/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+    assert "Accept-Encoding" in resp.headers["vary"]
+
+
+def test_compressed_etag_is_weak_and_revalidates(client):
+    _seed(client, 50)
+    tag = client.get("/api/students/", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    assert tag.startswith('W/"')
+    resp = client.get("/api/students/", headers={"Accept-Encoding": "gzip", "If-None-Match": tag})
+    assert resp.status_code == 304
+
+
+def test_streamed_export_is_compressed_in_chunks(client):
+    _seed(client, 50)
+    with client.stream(
+        "GET", "/api/export/students?format=csv", headers={"Accept-Encoding": "gzip"}
+    ) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "content-length" not in resp.headers
+        raw = b"".join(resp.iter_raw())
+    assert gzip.decompress(raw).decode().count("\n") == 51
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("*", "gzip"),
+    ("*;q=0.5, gzip;q=0", None),
+    ("br;q=1.0, gzip;q=0.8", "gzip"),
+    ("x-gzip", "gzip"),
+])
+def test_negotiate(header, expected):
+    assert negotiate(header, {"gzip": None}) == expected
+
+
+def test_negotiate_prefers_server_order_on_ties():
+    available = {"br": None, "gzip": None}
+    assert negotiate("gzip, br", available) == "br"
+    assert negotiate("gzip, br;q=0.5", available) == "gzip"
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from database import create_sqlite_engine, read_only_url
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_production_profile_pragmas(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'prod.db'}", "production")
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "busy_timeout") == 5000
+    assert _pragma(engine, "temp_store") == 2  # MEMORY
+    assert _pragma(engine, "cache_size") == -64 * 1024
+    assert engine.pool.size() == 40
+
+
+def test_default_profile_leaves_sqlite_defaults(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'plain.db'}", "default")
+    assert _pragma(engine, "journal_mode") == "delete"
+    assert _pragma(engine, "synchronous") == 2  # FULL
+
+
+def test_read_only_url():
+    assert read_only_url("sqlite:///./school.db") == "sqlite:///file:./school.db?mode=ro&uri=true"
+    assert read_only_url("sqlite://") == "sqlite://"
+
+
+def test_read_engine_sees_writes_but_cannot_write(tmp_path):
+    url = f"sqlite:///{tmp_path / 'split.db'}"
+    writer = create_sqlite_engine(url, "production")
+    reader = create_sqlite_engine(read_only_url(url), "production", readonly=True)
+    with writer.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("SELECT x FROM t").scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql("INSERT INTO t VALUES (2)")
@@ -0,0 +1,50 @@
+def test_list_and_detail_carry_validators(client):
+    cls = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    for url in ("/api/classes/", f"/api/classes/{cls['id']}"):
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert resp.headers["etag"].startswith('"')
+        assert resp.headers["last-modified"].endswith("GMT")
+        assert resp.headers["cache-control"] == "no-cache"
+
+
+def test_unchanged_collection_is_not_modified(client, query_log):
+    client.post("/api/teachers/", json={"name": "T1", "email": "t1@s.com"})
+    tag = client.get("/api/teachers/").headers["etag"]
+
+    query_log.clear()
+    resp = client.get("/api/teachers/", headers={"If-None-Match": tag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == tag
+    assert query_log == []
+
+    assert client.get("/api/teachers/", headers={"If-None-Match": f'"x", W/{tag}'}).status_code == 304
+    assert client.get("/api/teachers/", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_writes_change_the_etag_of_dependent_resources(client):
+    cls = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    students = client.get("/api/students/").headers["etag"]
+    teachers = client.get("/api/teachers/").headers["etag"]
+
+    client.put(f"/api/classes/{cls['id']}", json={"name": "G1 renamed"})
+    # Student responses include the class name.
+    assert client.get("/api/students/", headers={"If-None-Match": students}).status_code == 200
+    assert client.get("/api/teachers/", headers={"If-None-Match": teachers}).status_code == 304
+
+
+def test_bulk_writes_change_the_etag(client):
+    tag = client.get("/api/students/").headers["etag"]
+    client.post("/api/students/bulk", json=[{"name": "S1", "email": "s1@s.com"}])
+    resp = client.get("/api/students/", headers={"If-None-Match": tag})
+    assert resp.status_code == 200
+    assert len(resp.json()) == 1
+
+
+def test_failed_write_keeps_the_etag(client):
+    client.post("/api/teachers/", json={"name": "T1", "email": "t1@s.com"})
+    tag = client.get("/api/teachers/").headers["etag"]
+    resp = client.post("/api/teachers/", json={"name": "T2", "email": "t1@s.com"})
+    assert resp.status_code == 400
+    assert client.get("/api/teachers/", headers={"If-None-Match": tag}).status_code == 304
@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+
+from routes import exports
+
+
+def test_export_students_ndjson(client):
+    cls = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    client.post("/api/students/", json={"name": "A", "email": "a@s.com", "class_id": cls["id"]})
+    client.post("/api/students/", json={"name": "B", "email": "b@s.com"})
+    resp = client.get("/api/export/students")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["name"] for r in rows] == ["A", "B"]
+    assert rows[0]["class_name"] == "G1"
+    assert rows[1]["class_name"] is None
+
+
+def test_export_subjects_csv(client, monkeypatch):
+    # Force several chunks to exercise buffering.
+    monkeypatch.setattr(exports, "CHUNK_BYTES", 16)
+    teacher = client.post("/api/teachers/", json={"name": "T", "email": "t@s.com"}).json()
+    for i in range(5):
+        client.post("/api/subjects/", json={
+            "name": f"Sub{i}", "code": f"C{i}", "teacher_id": teacher["id"],
+        })
+    resp = client.get("/api/export/subjects?format=csv")
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["code"] for r in rows] == [f"C{i}" for i in range(5)]
+    assert rows[0]["teacher_name"] == "T"
+
+
+def test_export_empty_csv_has_header(client):
+    resp = client.get("/api/export/classes?format=csv")
+    assert resp.text.strip() == "id,name,section,room_number"
+
+
+def test_export_rejects_unknown_entity_and_format(client):
+    assert client.get("/api/export/users").status_code == 404
+    assert client.get("/api/export/students?format=xml").status_code == 422
@@ -0,0 +1,50 @@
+def _seed(client):
+    cls = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    for i in range(3):
+        client.post("/api/students/", json={
+            "name": f"Student {i}", "email": f"s{i}@s.com", "class_id": cls["id"],
+        })
+    return cls
+
+
+def test_fields_trim_list_and_detail(client):
+    cls = _seed(client)
+    assert client.get("/api/classes/?fields=id,name").json() == [{"id": cls["id"], "name": "G1"}]
+    assert client.get(f"/api/classes/{cls['id']}?fields=name").json() == {"name": "G1"}
+
+    # Response order follows the schema, not the parameter.
+    resp = client.get("/api/students/?fields=class_name, name")
+    assert resp.content.startswith(b'[{"name":"Student 0","class_name":"G1"}')
+
+
+def test_unknown_field_is_rejected(client):
+    resp = client.get("/api/teachers/?fields=id,salary")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Unknown fields: salary"
+
+
+def test_pagination_without_id_field(client):
+    _seed(client)
+    first = client.get("/api/students/?fields=name&limit=2")
+    assert first.json() == [{"name": "Student 0"}, {"name": "Student 1"}]
+    cursor = first.headers["x-next-cursor"]
+    second = client.get(f"/api/students/?fields=name&limit=2&after={cursor}")
+    assert second.json() == [{"name": "Student 2"}]
+
+
+def test_joins_only_for_requested_fields(client, query_log):
+    _seed(client)
+    query_log.clear()
+    client.get("/api/students/?fields=id,name")
+    client.get("/api/subjects/?fields=id,teacher_name")
+    assert "JOIN" not in query_log[0]
+    assert "JOIN teachers" in query_log[1]
+    assert "JOIN classes" not in query_log[1]
+
+
+def test_fields_with_search(client):
+    _seed(client)
+    resp = client.get("/api/students/?search=student&fields=email&limit=2")
+    assert resp.status_code == 200
+    assert all(set(row) == {"email"} for row in resp.json())
+    assert "x-next-cursor" in resp.headers
@@ -0,0 +1,76 @@
+import json
+
+import importer
+from importer import iter_lines
+
+
+def _chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_iter_lines_across_chunk_boundaries():
+    data = "a,b\r\nc,é\nlast".encode()
+    assert list(iter_lines(_chunked(data, 3))) == ["a,b\r\n", "c,é\n", "last"]
+
+
+def test_import_students_csv(client):
+    cls = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    rows = ["name,email,phone,class_id"]
+    rows += [f"S{i},s{i}@s.com,,{cls['id']}" for i in range(25)]
+    rows += ["Dup,s0@s.com,,", ",missing-name@s.com,,", "Bad,bad@s.com,,999"]
+    body = ("\n".join(rows) + "\n").encode()
+
+    resp = client.post(
+        "/api/import/students?chunk_size=10",
+        content=_chunked(body, 64),
+        headers={"content-type": "text/csv"},
+    )
+    assert resp.status_code == 200
+    summary = resp.json()
+    assert (summary["processed"], summary["created"], summary["failed"]) == (28, 25, 3)
+    assert summary["chunks"] == 3
+    assert [e["row"] for e in summary["errors"]] == [26, 27, 28]
+    assert summary["errors"][1]["detail"] == "name: Input should be a valid string"
+    assert client.get("/api/stats/").json()["students_per_class"][0]["students"] == 25
+
+
+def test_import_teachers_ndjson(client):
+    lines = [
+        json.dumps({"name": "T1", "email": "t1@s.com", "department": "Math"}),
+        "",
+        "{not json",
+        json.dumps({"name": "T2", "email": "t2@s.com"}),
+    ]
+    resp = client.post(
+        "/api/import/teachers?format=ndjson", content="\n".join(lines).encode()
+    )
+    summary = resp.json()
+    assert (summary["processed"], summary["created"], summary["failed"]) == (3, 2, 1)
+    assert summary["errors"][0]["row"] == 2
+    assert len(client.get("/api/teachers/").json()) == 2
+
+
+def test_import_scalar_json_lines_fail_validation(client):
+    lines = ['"str"', "42", json.dumps({"name": "T1", "email": "t1@s.com"})]
+    resp = client.post(
+        "/api/import/teachers?format=ndjson", content="\n".join(lines).encode()
+    )
+    summary = resp.json()
+    assert (summary["processed"], summary["created"], summary["failed"]) == (3, 1, 2)
+    details = [e["detail"] for e in summary["errors"]]
+    assert all(d.startswith("row: Input should be a valid dictionary") for d in details)
+
+
+def test_import_error_report_is_bounded(client, monkeypatch):
+    monkeypatch.setattr(importer, "MAX_REPORTED_ERRORS", 2)
+    body = "\n".join(["{}"] * 5).encode()
+    summary = client.post("/api/import/subjects?format=ndjson", content=body).json()
+    assert summary["failed"] == 5
+    assert len(summary["errors"]) == 2
+    assert summary["errors_truncated"] is True
+
+
+def test_import_rejects_unknown_entity_and_format(client):
+    assert client.post("/api/import/classes?format=csv", content=b"").status_code == 404
+    assert client.post("/api/import/students", content=b"").status_code == 400
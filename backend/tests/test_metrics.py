@@ -0,0 +1,89 @@
+import re
+
+from metrics import Histogram
+
+
+def _scrape(client) -> str:
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return resp.text
+
+
+def _value(text: str, name: str, **labels) -> float:
+    for line in text.splitlines():
+        if line.startswith(name + "{") or line.startswith(name + " "):
+            found = dict(re.findall(r'(\w+)="([^"]*)"', line.split(" ")[0]))
+            if all(found.get(k) == v for k, v in labels.items()):
+                return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} {labels} not exposed")
+
+
+def test_requests_are_counted_by_route_template(client):
+    client.post("/api/teachers/", json={"name": "T1", "email": "t1@s.com"})
+    before = _scrape(client)
+    client.get("/api/teachers/1")
+    client.get("/api/teachers/999")
+    text = _scrape(client)
+
+    route = "/api/teachers/{teacher_id}"
+    for status in ("200", "404"):
+        count = _value(text, "http_requests_total", method="GET", route=route, status=status)
+        try:
+            previous = _value(before, "http_requests_total", method="GET", route=route, status=status)
+        except AssertionError:
+            previous = 0
+        assert count == previous + 1
+    assert _value(text, "http_request_duration_seconds_bucket",
+                  method="GET", route=route, le="+Inf") >= 2
+    assert _value(text, "http_requests_in_flight") == 1  # the scrape itself
+
+
+def test_db_queries_are_attributed_to_the_request(client):
+    client.get("/api/classes/")
+    text = _scrape(client)
+    queries = _value(text, "http_request_db_queries_sum", method="GET", route="/api/classes/")
+    count = _value(text, "http_request_db_queries_count", method="GET", route="/api/classes/")
+    assert queries >= count >= 1
+    assert _value(text, "http_request_db_seconds_sum", method="GET", route="/api/classes/") > 0
+
+
+def test_unknown_paths_share_one_label(client):
+    client.get("/no/such/path")
+    text = _scrape(client)
+    assert _value(text, "http_requests_total", route="unmatched", status="404") >= 1
+    assert "/no/such/path" not in text
+
+
+def test_cache_and_pool_metrics_are_exposed(client):
+    text = _scrape(client)
+    assert "# TYPE response_cache_hits_total counter" in text
+    assert "# TYPE db_pool_checkouts_total counter" in text
+
+
+def test_histogram_exposition():
+    histogram = Histogram("h_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, "/x")
+    assert histogram.render()[2:] == [
+        'h_seconds_bucket{route="/x",le="0.1"} 1',
+        'h_seconds_bucket{route="/x",le="1.0"} 2',
+        'h_seconds_bucket{route="/x",le="+Inf"} 3',
+        'h_seconds_sum{route="/x"} 5.55',
+        'h_seconds_count{route="/x"} 3',
+    ]
+
+
+def test_cache_hits_keep_their_route(client):
+    def count(text, route):
+        try:
+            return _value(text, "http_requests_total", method="GET", route=route, status="200")
+        except AssertionError:
+            return 0
+
+    client.get("/api/classes/?limit=7")
+    before = _scrape(client)
+    client.get("/api/classes/?limit=7")  # served from the response cache
+    after = _scrape(client)
+    assert _value(after, "response_cache_hits_total") == _value(before, "response_cache_hits_total") + 1
+    assert count(after, "/api/classes/") == count(before, "/api/classes/") + 1
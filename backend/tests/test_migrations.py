@@ -0,0 +1,51 @@
+from sqlalchemy import create_engine, inspect
+
+from migrations import MIGRATIONS, run_migrations
+
+
+def _legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE classes (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+            "section VARCHAR NOT NULL, room_number VARCHAR)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE teachers (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+            "email VARCHAR NOT NULL UNIQUE, phone VARCHAR, department VARCHAR)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE students (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+            "email VARCHAR NOT NULL UNIQUE, phone VARCHAR, "
+            "class_id INTEGER REFERENCES classes (id))"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE subjects (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+            "code VARCHAR NOT NULL UNIQUE, teacher_id INTEGER REFERENCES teachers (id), "
+            "class_id INTEGER REFERENCES classes (id))"
+        )
+        conn.exec_driver_sql("INSERT INTO classes (name, section) VALUES ('G1', 'A')")
+        conn.exec_driver_sql(
+            "INSERT INTO students (name, email, class_id) VALUES ('S', 's@s.com', 1)"
+        )
+    return engine
+
+
+def _index_names(engine, table):
+    return {ix["name"] for ix in inspect(engine).get_indexes(table)}
+
+
+def test_migrations_add_indexes_to_existing_database(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    assert run_migrations(engine) == [name for name, _ in MIGRATIONS]
+    assert "ix_students_class_id" in _index_names(engine, "students")
+    assert {"ix_subjects_teacher_id", "ix_subjects_class_id"} <= _index_names(engine, "subjects")
+    assert "ix_teachers_department" in _index_names(engine, "teachers")
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM students").scalar() == 1
+
+
+def test_migrations_run_once(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    run_migrations(engine)
+    assert run_migrations(engine) == []
@@ -0,0 +1,58 @@
+from pagination import encode_cursor
+
+
+def _create_students(client, count):
+    for i in range(count):
+        client.post("/api/students/", json={"name": f"S{i}", "email": f"s{i}@s.com"})
+
+
+def test_list_without_limit_returns_all(client):
+    _create_students(client, 3)
+    resp = client.get("/api/students/")
+    assert len(resp.json()) == 3
+    assert "x-next-cursor" not in resp.headers
+
+
+def test_paginate_students(client):
+    _create_students(client, 5)
+    resp = client.get("/api/students/?limit=2")
+    assert [s["name"] for s in resp.json()] == ["S0", "S1"]
+    cursor = resp.headers["x-next-cursor"]
+
+    resp = client.get(f"/api/students/?limit=2&after={cursor}")
+    assert [s["name"] for s in resp.json()] == ["S2", "S3"]
+    cursor = resp.headers["x-next-cursor"]
+
+    resp = client.get(f"/api/students/?limit=2&after={cursor}")
+    assert [s["name"] for s in resp.json()] == ["S4"]
+    assert "x-next-cursor" not in resp.headers
+
+
+def test_paginate_with_filter(client):
+    for i in range(4):
+        client.post("/api/teachers/", json={
+            "name": f"T{i}",
+            "email": f"t{i}@s.com",
+            "department": "Math" if i % 2 else "Art",
+        })
+    resp = client.get("/api/teachers/?department=Math&limit=1")
+    assert [t["name"] for t in resp.json()] == ["T1"]
+    cursor = resp.headers["x-next-cursor"]
+    resp = client.get(f"/api/teachers/?department=Math&limit=1&after={cursor}")
+    assert [t["name"] for t in resp.json()] == ["T3"]
+
+
+def test_invalid_cursor(client):
+    assert client.get("/api/classes/?limit=1&after=not-a-cursor").status_code == 400
+
+
+def test_cursor_values_must_be_scalars(client):
+    _create_students(client, 2)
+    for values in ([{"a": 1}], [[1]], [None], [True]):
+        resp = client.get(f"/api/students/?limit=1&after={encode_cursor(values)}")
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Invalid cursor"
+
+
+def test_limit_bounds(client):
+    assert client.get("/api/subjects/?limit=0").status_code == 422
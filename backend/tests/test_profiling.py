@@ -0,0 +1,109 @@
+import threading
+import time
+from contextlib import ExitStack
+
+import pytest
+from fastapi.testclient import TestClient
+
+import metrics
+import profiling
+from main import app
+from profiling import Profile, ProfilingMiddleware, folded, profile_store
+
+TOKEN = {"X-Profile-Token": "secret"}
+
+
+@pytest.fixture
+def profiled(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", "secret")
+    profile_store.clear()
+    yield TestClient(ProfilingMiddleware(app))
+    profile_store.clear()
+
+
+def _seed(client, count):
+    client.post("/api/students/bulk", json=[
+        {"name": f"Student {i}", "email": f"s{i}@s.com"} for i in range(count)
+    ])
+
+
+def test_on_demand_profile_is_stored(profiled):
+    _seed(profiled, 20)
+    resp = profiled.get("/api/students/?profile=1", headers=TOKEN)
+    assert resp.status_code == 200 and len(resp.json()) == 20
+    report = profiled.get(f"/api/profiles/{resp.headers['X-Profile-Id']}", headers=TOKEN).json()
+    assert report["trigger"] == "on-demand"
+    assert (report["method"], report["path"], report["status"]) == ("GET", "/api/students/", 200)
+    assert report["call_tree"]["name"] == "all"
+    assert report["sql"]["count"] == len(report["sql"]["timeline"]) >= 1
+    assert any("FROM students" in entry["statement"] for entry in report["sql"]["timeline"])
+    assert report["allocations"]["peak_kb"] > 0
+
+    [summary] = profiled.get("/api/profiles/", headers=TOKEN).json()
+    assert summary["id"] == report["id"]
+
+
+def test_on_demand_profile_bypasses_the_cache(profiled):
+    _seed(profiled, 5)
+    profiled.get("/api/students/")
+    resp = profiled.get("/api/students/", headers={**TOKEN, "X-Profile": "1"})
+    report = profile_store.get(resp.headers["X-Profile-Id"])
+    assert report["sql"]["count"] >= 1
+
+
+def test_wrong_token_is_rejected(profiled):
+    assert profiled.get("/api/students/?profile=1").status_code == 403
+    resp = profiled.get("/api/students/?profile=1", headers={"X-Profile-Token": "guess"})
+    assert resp.status_code == 403
+    assert profiled.get("/api/profiles/", headers={"X-Profile-Token": "guess"}).status_code == 403
+    assert profile_store.recent() == []
+
+
+def test_flag_is_ignored_without_a_token(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", "")
+    client = TestClient(ProfilingMiddleware(app))
+    resp = client.get("/api/students/?profile=1", headers={"X-Profile-Token": ""})
+    assert resp.status_code == 200
+    assert "X-Profile-Id" not in resp.headers
+    assert client.get("/api/profiles/", headers={"X-Profile-Token": ""}).status_code == 403
+
+
+def test_sampled_requests_skip_allocations(profiled):
+    client = TestClient(ProfilingMiddleware(app, sample_rate=1.0))
+    resp = client.get("/api/classes/")
+    report = profile_store.get(resp.headers["X-Profile-Id"])
+    assert report["trigger"] == "sampled"
+    assert report["allocations"] is None
+
+
+def test_call_tree_samples_the_request_thread():
+    def busy():
+        end = time.perf_counter() + 0.1
+        while time.perf_counter() < end:
+            pass
+
+    scope = {"method": "GET", "path": "/busy", "query_string": b""}
+    with Profile(scope, "on-demand", interval=0.001, allocations=False,
+                 db=metrics.RequestDB()) as profile:
+        busy()
+    report = profile.report()
+    assert report["samples"] > 0
+    assert report["top"][0]["name"].startswith("busy (tests/test_profiling.py:")
+    assert ";busy (tests/test_profiling.py:" in folded(report)
+
+
+def test_concurrent_profiles_share_one_sampler_thread():
+    scope = {"method": "GET", "path": "/busy", "query_string": b""}
+    profiles = [
+        Profile(scope, "sampled", interval=0.005, allocations=False, db=metrics.RequestDB())
+        for _ in range(3)
+    ]
+    with ExitStack() as stack:
+        for profile in profiles:
+            stack.enter_context(profile)
+        end = time.perf_counter() + 0.1
+        while time.perf_counter() < end:
+            pass
+    samplers = [t for t in threading.enumerate() if t.name == "profile-sampler"]
+    assert len(samplers) == 1
+    assert all(profile.report()["samples"] > 0 for profile in profiles)
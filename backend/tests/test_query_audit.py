@@ -0,0 +1,77 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from models import Student
+from metrics import normalize
+from query_audit import QueryAuditMiddleware
+from tests.conftest import engine
+
+
+def _lazy_app():
+    """An app whose one route loads each student's class lazily, the N+1."""
+    app = FastAPI()
+    app.add_middleware(QueryAuditMiddleware, headers=True, threshold=3)
+
+    @app.get("/students")
+    def students():
+        with Session(engine) as db:
+            return [s.student_class.name for s in db.query(Student).order_by(Student.id)]
+
+    return app
+
+
+def _seed(client, count):
+    for i in range(count):
+        class_id = client.post("/api/classes/", json={"name": f"C{i}", "section": "A"}).json()["id"]
+        client.post("/api/students/", json={
+            "name": f"S{i}", "email": f"s{i}@s.com", "class_id": class_id,
+        })
+
+
+def test_normalize_folds_literals_and_in_lists():
+    assert normalize("SELECT * FROM t WHERE id = 1 AND name = 'O''Brien'") == (
+        "SELECT * FROM t WHERE id = ? AND name = ?"
+    )
+    assert normalize("SELECT a_1.x FROM t AS a_1 WHERE id IN (?, ?,\n ?)") == (
+        "SELECT a_1.x FROM t AS a_1 WHERE id IN (?)"
+    )
+    assert normalize("UPDATE t SET x = :x WHERE id = %(id)s") == "UPDATE t SET x = ? WHERE id = ?"
+
+
+def test_lazy_loads_are_flagged(client, caplog):
+    _seed(client, 4)
+    with caplog.at_level(logging.WARNING, logger="query_audit"):
+        resp = TestClient(_lazy_app()).get("/students")
+    assert resp.json() == ["C0", "C1", "C2", "C3"]
+    assert resp.headers["X-Query-Count"] == "5"
+    assert resp.headers["X-Query-Repeated"].startswith("4x SELECT classes.id")
+    assert "GET /students: possible N+1, 4 runs of SELECT classes.id" in caplog.text
+
+
+def test_headers_are_debug_only(client):
+    resp = client.get("/api/students/")
+    assert "X-Query-Count" not in resp.headers
+
+
+def test_fixture_sees_each_request(client, sql_audit, query_log):
+    _seed(client, 6)
+    sql_audit.clear()
+    query_log.clear()
+    client.get("/api/students/")
+    client.get("/api/subjects/")
+    assert [stats.label for stats in sql_audit.requests] == [
+        "GET /api/students/", "GET /api/subjects/",
+    ]
+    assert sql_audit.total == len(query_log)
+    assert not any(stats.repeated() for stats in sql_audit.requests)
+
+
+def test_executemany_is_not_flagged(client, sql_audit):
+    client.post("/api/students/bulk", json=[
+        {"name": f"S{i}", "email": f"s{i}@s.com"} for i in range(20)
+    ])
+    assert sql_audit.requests[-1].queries > 0
+    assert sql_audit.requests[-1].repeated(threshold=2) == {}
@@ -0,0 +1,43 @@
+def _seed(client, count, prefix):
+    for i in range(count):
+        teacher_id = client.post("/api/teachers/", json={
+            "name": f"{prefix}T{i}", "email": f"{prefix}t{i}@s.com",
+        }).json()["id"]
+        class_id = client.post("/api/classes/", json={
+            "name": f"{prefix}C{i}", "section": "A",
+        }).json()["id"]
+        client.post("/api/students/", json={
+            "name": f"{prefix}S{i}",
+            "email": f"{prefix}s{i}@s.com",
+            "class_id": class_id,
+        })
+        client.post("/api/subjects/", json={
+            "name": f"{prefix}Sub{i}",
+            "code": f"{prefix}{i}",
+            "teacher_id": teacher_id,
+            "class_id": class_id,
+        })
+
+
+def _count_queries(client, query_log, url):
+    query_log.clear()
+    assert client.get(url).status_code == 200
+    return len(query_log)
+
+
+def test_list_query_count_is_constant(client, query_log):
+    urls = ("/api/students/", "/api/subjects/")
+    _seed(client, 2, "a")
+    small = [_count_queries(client, query_log, url) for url in urls]
+    _seed(client, 10, "b")
+    large = [_count_queries(client, query_log, url) for url in urls]
+    assert small == large == [1, 1]
+
+
+def test_list_includes_related_names(client):
+    _seed(client, 1, "a")
+    student = client.get("/api/students/").json()[0]
+    subject = client.get("/api/subjects/").json()[0]
+    assert student["class_name"] == "aC0"
+    assert subject["teacher_name"] == "aT0"
+    assert subject["class_name"] == "aC0"
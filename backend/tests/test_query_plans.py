@@ -0,0 +1,48 @@
+import re
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from tests.conftest import engine
+
+# A plan step that reads a base table without an index, e.g. "SCAN students".
+FULL_SCAN = re.compile(r"^SCAN (students|teachers|classes|subjects)\b(?!.*USING)")
+
+HOT_FILTERS = [
+    "/api/students/?class_id=1",
+    "/api/students/?class_id=1&limit=10",
+    "/api/subjects/?teacher_id=1",
+    "/api/subjects/?class_id=1",
+    "/api/teachers/?department=math",
+    "/api/students/?limit=10&after=WzFd",
+    "/api/students/?search=alice",
+    "/api/subjects/?search=math",
+]
+
+
+@pytest.fixture
+def selects():
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", record)
+    yield captured
+    event.remove(Engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("url", HOT_FILTERS)
+def test_hot_filters_use_an_index(client, selects, url):
+    assert client.get(url).status_code == 200
+    assert selects
+    with engine.connect() as conn:
+        for statement, parameters in selects:
+            plan = conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ).all()
+            details = [row[-1] for row in plan]
+            scans = [d for d in details if FULL_SCAN.match(d)]
+            assert not scans, f"{url} falls back to a full scan: {details}"
@@ -0,0 +1,85 @@
+import time
+
+import versions
+from response_cache import ResponseCache, response_cache
+
+
+def _stats(client):
+    return client.get("/api/stats/cache").json()
+
+
+def test_repeated_get_is_served_from_cache(client, query_log):
+    client.post("/api/classes/", json={"name": "G1", "section": "A"})
+    first = client.get("/api/classes/?search=G1&limit=10")
+    before = _stats(client)
+
+    query_log.clear()
+    second = client.get("/api/classes/?limit=10&search=G1")
+    assert query_log == []
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert _stats(client)["hits"] == before["hits"] + 1
+
+
+def test_cached_entry_answers_conditional_get(client):
+    client.get("/api/teachers/")
+    tag = client.get("/api/teachers/").headers["etag"]
+    resp = client.get("/api/teachers/", headers={"If-None-Match": tag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == tag
+
+
+def test_writes_invalidate_only_dependent_entries(client):
+    client.get("/api/students/")
+    client.get("/api/teachers/")
+    client.post("/api/classes/", json={"name": "G1", "section": "A"})
+    before = _stats(client)
+
+    client.get("/api/students/")
+    client.get("/api/teachers/")
+    after = _stats(client)
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_write_is_visible_immediately(client):
+    assert client.get("/api/teachers/").json() == []
+    client.post("/api/teachers/", json={"name": "T1", "email": "t1@s.com"})
+    assert [t["name"] for t in client.get("/api/teachers/").json()] == ["T1"]
+
+
+def test_errors_are_not_cached(client):
+    assert client.get("/api/students/999").status_code == 404
+    entries = response_cache.stats()["entries"]
+    assert client.get("/api/students/999").status_code == 404
+    assert response_cache.stats()["entries"] == entries
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResponseCache(max_entries=2, max_bytes=1024, ttl=60)
+    current = versions.version("t_cache")
+    for name in ("a", "b", "c"):
+        cache.set((name, ""), ("t_cache",), current, [], b"x")
+    assert cache.get(("a", "")) is None
+    assert cache.get(("c", "")) is not None
+    assert cache.evictions == 1
+
+    cache.ttl = 0
+    cache.set(("d", ""), ("t_cache",), current, [], b"x")
+    time.sleep(0.001)
+    assert cache.get(("d", "")) is None
+    assert cache.expirations == 1
+
+
+def test_bump_invalidates_and_stale_sets_are_dropped():
+    cache = ResponseCache()
+    versions.subscribe(cache.invalidate)
+    current = versions.version("t_bump")
+    cache.set(("k", ""), ("t_bump",), current, [], b"x")
+    versions.bump("t_bump")
+    assert cache.get(("k", "")) is None
+    assert cache.invalidations == 1
+
+    # Built before the bump: must not be stored.
+    cache.set(("k", ""), ("t_bump",), current, [], b"x")
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,59 @@
+def _class_with_members(client, students=3):
+    cls = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    other = client.post("/api/classes/", json={"name": "G2", "section": "B"}).json()
+    t1 = client.post("/api/teachers/", json={"name": "Zed", "email": "z@s.com"}).json()
+    t2 = client.post("/api/teachers/", json={"name": "Amy", "email": "a@s.com"}).json()
+    for i in range(students):
+        client.post("/api/students/", json={
+            "name": f"S{i}", "email": f"s{i}@s.com", "class_id": cls["id"],
+        })
+    client.post("/api/students/", json={
+        "name": "Other", "email": "o@s.com", "class_id": other["id"],
+    })
+    for code, teacher in (("M1", t1), ("A1", t2), ("P1", t1), ("F1", None)):
+        client.post("/api/subjects/", json={
+            "name": code, "code": code, "class_id": cls["id"],
+            "teacher_id": teacher["id"] if teacher else None,
+        })
+    return cls
+
+
+def test_roster_nests_students_subjects_and_teachers(client):
+    cls = _class_with_members(client)
+    roster = client.get(f"/api/classes/{cls['id']}/roster").json()
+    assert roster["name"] == "G1"
+    assert [s["name"] for s in roster["students"]] == ["S0", "S1", "S2"]
+    assert {s["class_name"] for s in roster["students"]} == {"G1"}
+    assert [(s["code"], s["teacher_name"]) for s in roster["subjects"]] == [
+        ("M1", "Zed"), ("A1", "Amy"), ("P1", "Zed"), ("F1", None),
+    ]
+    assert [t["name"] for t in roster["teachers"]] == ["Amy", "Zed"]
+
+
+def test_roster_query_count_does_not_grow(client, query_log):
+    small = _class_with_members(client, students=1)
+    query_log.clear()
+    client.get(f"/api/classes/{small['id']}/roster")
+    baseline = len(query_log)
+    assert baseline <= 3
+
+    for i in range(20):
+        client.post("/api/students/", json={
+            "name": f"Extra {i}", "email": f"x{i}@s.com", "class_id": small["id"],
+        })
+    query_log.clear()
+    client.get(f"/api/classes/{small['id']}/roster")
+    assert len(query_log) == baseline
+
+
+def test_roster_changes_with_member_writes(client):
+    cls = _class_with_members(client)
+    tag = client.get(f"/api/classes/{cls['id']}/roster").headers["etag"]
+    client.put("/api/teachers/1", json={"name": "Zoe"})
+    resp = client.get(f"/api/classes/{cls['id']}/roster", headers={"If-None-Match": tag})
+    assert resp.status_code == 200
+    assert "Zoe" in [t["name"] for t in resp.json()["teachers"]]
+
+
+def test_roster_of_missing_class(client):
+    assert client.get("/api/classes/999/roster").status_code == 404
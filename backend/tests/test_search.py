@@ -0,0 +1,63 @@
+import search
+from pagination import encode_cursor
+
+
+def _names(resp):
+    return [row["name"] for row in resp.json()]
+
+
+def test_search_prefix_match(client):
+    client.post("/api/students/", json={"name": "Alice Smith", "email": "alice@s.com"})
+    client.post("/api/students/", json={"name": "Bob Jones", "email": "bob@s.com"})
+    assert _names(client.get("/api/students/?search=ali")) == ["Alice Smith"]
+    assert _names(client.get("/api/students/?search=jon")) == ["Bob Jones"]
+
+
+def test_search_requires_every_word(client):
+    client.post("/api/teachers/", json={"name": "Alice Math", "email": "a@s.com"})
+    client.post("/api/teachers/", json={"name": "Alice Art", "email": "b@s.com"})
+    assert _names(client.get("/api/teachers/?search=alice ma")) == ["Alice Math"]
+
+
+def test_search_ranks_better_matches_first(client):
+    client.post("/api/subjects/", json={"name": "Algebra", "code": "MATH101"})
+    client.post("/api/subjects/", json={"name": "Math Math", "code": "MATH201"})
+    assert _names(client.get("/api/subjects/?search=math"))[0] == "Math Math"
+
+
+def test_search_index_follows_updates_and_deletes(client):
+    sid = client.post(
+        "/api/students/", json={"name": "Old Name", "email": "o@s.com"}
+    ).json()["id"]
+    client.put(f"/api/students/{sid}", json={"name": "New Name"})
+    assert _names(client.get("/api/students/?search=old")) == []
+    assert _names(client.get("/api/students/?search=new")) == ["New Name"]
+    client.delete(f"/api/students/{sid}")
+    assert _names(client.get("/api/students/?search=new")) == []
+
+
+def test_search_paginates_by_rank(client):
+    for i in range(5):
+        client.post("/api/classes/", json={"name": f"Grade {i}", "section": "A"})
+    resp = client.get("/api/classes/?search=grade&limit=2")
+    seen = _names(resp)
+    while "x-next-cursor" in resp.headers:
+        cursor = resp.headers["x-next-cursor"]
+        resp = client.get(f"/api/classes/?search=grade&limit=2&after={cursor}")
+        seen += _names(resp)
+    assert sorted(seen) == [f"Grade {i}" for i in range(5)]
+
+
+def test_search_rejects_tampered_cursor(client):
+    client.post("/api/classes/", json={"name": "Grade 1", "section": "A"})
+    for values in ([[1], 2], [0.5, {"a": 1}], [False, 1]):
+        resp = client.get(f"/api/classes/?search=grade&limit=1&after={encode_cursor(values)}")
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Invalid cursor"
+
+
+def test_search_fallback_without_fts5(client, monkeypatch):
+    monkeypatch.setattr(search, "fts5_available", lambda: False)
+    client.post("/api/students/", json={"name": "Alice", "email": "a@s.com"})
+    client.post("/api/students/", json={"name": "Bob", "email": "b@s.com"})
+    assert _names(client.get("/api/students/?search=lic")) == ["Alice"]
@@ -0,0 +1,29 @@
+from schemas.student import StudentResponse
+from schemas.subject import SubjectResponse
+
+
+def test_list_body_matches_response_schema(client):
+    cls = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()
+    client.post("/api/students/", json={"name": "S1", "email": "s1@s.com", "class_id": cls["id"]})
+    client.post("/api/students/", json={"name": "S2", "email": "s2@s.com"})
+
+    resp = client.get("/api/students/")
+    assert resp.headers["content-type"] == "application/json"
+    expected = [
+        StudentResponse(id=1, name="S1", email="s1@s.com", class_id=cls["id"], class_name="G1"),
+        StudentResponse(id=2, name="S2", email="s2@s.com"),
+    ]
+    assert resp.content == b"[" + b",".join(s.model_dump_json().encode() for s in expected) + b"]"
+
+
+def test_detail_keeps_dependency_headers(client):
+    teacher = client.post("/api/teachers/", json={"name": "T1", "email": "t1@s.com"}).json()
+    subject = client.post("/api/subjects/", json={
+        "name": "Math", "code": "M1", "teacher_id": teacher["id"],
+    }).json()
+
+    resp = client.get(f"/api/subjects/{subject['id']}")
+    assert "etag" in resp.headers
+    assert resp.json() == SubjectResponse(
+        id=subject["id"], name="Math", code="M1", teacher_id=teacher["id"], teacher_name="T1",
+    ).model_dump()
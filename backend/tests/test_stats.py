@@ -0,0 +1,62 @@
+def test_stats_empty(client):
+    resp = client.get("/api/stats/")
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "students": 0,
+        "teachers": 0,
+        "classes": 0,
+        "subjects": 0,
+        "students_per_class": [],
+        "subjects_per_teacher": [],
+    }
+
+
+def test_stats_follow_writes(client):
+    c1 = client.post("/api/classes/", json={"name": "G1", "section": "A"}).json()["id"]
+    c2 = client.post("/api/classes/", json={"name": "G2", "section": "A"}).json()["id"]
+    t1 = client.post("/api/teachers/", json={"name": "T1", "email": "t1@s.com"}).json()["id"]
+    s1 = client.post("/api/students/", json={
+        "name": "S1", "email": "s1@s.com", "class_id": c1,
+    }).json()["id"]
+    client.post("/api/students/", json={"name": "S2", "email": "s2@s.com", "class_id": c1})
+    client.post("/api/subjects/", json={"name": "Math", "code": "M1", "teacher_id": t1})
+
+    stats = client.get("/api/stats/").json()
+    assert (stats["students"], stats["teachers"], stats["classes"], stats["subjects"]) == (2, 1, 2, 1)
+    assert stats["students_per_class"] == [{"class_id": c1, "class_name": "G1", "students": 2}]
+    assert stats["subjects_per_teacher"] == [
+        {"teacher_id": t1, "teacher_name": "T1", "subjects": 1}
+    ]
+
+    client.put(f"/api/students/{s1}", json={"class_id": c2})
+    stats = client.get("/api/stats/").json()
+    assert stats["students_per_class"] == [
+        {"class_id": c1, "class_name": "G1", "students": 1},
+        {"class_id": c2, "class_name": "G2", "students": 1},
+    ]
+
+    client.delete(f"/api/students/{s1}")
+    stats = client.get("/api/stats/").json()
+    assert stats["students"] == 1
+    assert stats["students_per_class"] == [
+        {"class_id": c1, "class_name": "G1", "students": 1},
+    ]
+
+
+def test_stats_query_count_is_constant(client, query_log):
+    for i in range(5):
+        client.post("/api/students/", json={"name": f"S{i}", "email": f"s{i}@s.com"})
+    query_log.clear()
+    client.get("/api/stats/")
+    assert len(query_log) == 3
+
+
+def test_counters_seeded_for_existing_database(client):
+    from schema import create_schema
+    from tests.conftest import engine
+
+    client.post("/api/classes/", json={"name": "G1", "section": "A"})
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM stat_counters")
+    create_schema(engine)
+    assert client.get("/api/stats/").json()["classes"] == 1
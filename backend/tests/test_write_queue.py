@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from database import create_sqlite_engine
+from write_queue import WriteCoordinator
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'writes.db'}", "production")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER UNIQUE)")
+    coordinator = WriteCoordinator(
+        sessionmaker(bind=engine, expire_on_commit=False), window=0.05
+    )
+    yield coordinator
+    coordinator.stop()
+    engine.dispose()
+
+
+def _insert(value):
+    def write(db):
+        db.execute(text("INSERT INTO t VALUES (:x)"), {"x": value})
+        return value
+
+    return write
+
+
+def _values(coordinator):
+    with coordinator.session_factory() as db:
+        return sorted(db.execute(text("SELECT x FROM t")).scalars())
+
+
+def test_concurrent_writes_share_a_commit(coordinator):
+    futures = [coordinator.submit(_insert(i)) for i in range(20)]
+    assert [f.result() for f in futures] == list(range(20))
+    assert coordinator.writes == 20
+    assert coordinator.batches < 20
+    assert _values(coordinator) == list(range(20))
+
+
+def test_failing_write_is_rolled_back_alone(coordinator):
+    first = coordinator.submit(_insert(1))
+    duplicate = coordinator.submit(_insert(1))
+    other = coordinator.submit(_insert(2))
+    assert first.result() == 1
+    with pytest.raises(Exception, match="UNIQUE"):
+        duplicate.result()
+    assert other.result() == 2
+    assert _values(coordinator) == [1, 2]
+
+
+def test_errors_reach_their_caller(coordinator):
+    def missing(db):
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    with pytest.raises(HTTPException) as exc:
+        coordinator.run(missing)
+    assert exc.value.status_code == 404
+
+
+def test_run_from_many_threads(coordinator):
+    results = []
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(coordinator.run(_insert(i))))
+        for i in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == list(range(10))
+    assert _values(coordinator) == list(range(10))
@@ -0,0 +1,178 @@
+"""Per-table change versions and HTTP conditional GETs built on them.
+
+Every committed session records which tables its flushes and ORM
+insert/update/delete statements touched, then bumps their versions from one
+process-wide sequence. A response built from several tables is versioned
+by the highest of their versions, so it changes whenever any of them does.
+
+``conditional_get`` turns that into strong ETags: a matching
+``If-None-Match`` is answered with 304 before the route opens a database
+connection or serializes anything. When coherence.py watches the database,
+tags are built from its shared ``table_versions`` counters, so every worker
+process hands out, and recognizes, the same tag for the same data. They
+carry the database's id, so counters that restart with a recreated or
+restored database never repeat an earlier tag.
+"""
+import itertools
+import threading
+import time
+import uuid
+from email.utils import formatdate
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from database import Base
+
+# Versions restart with the process, so ETags carry a per-process prefix.
+EPOCH = uuid.uuid4().hex[:8]
+STARTED_AT = time.time()
+
+# Tables each resource's responses are built from.
+STUDENT_TABLES = ("students", "classes")
+TEACHER_TABLES = ("teachers",)
+CLASS_TABLES = ("classes",)
+SUBJECT_TABLES = ("subjects", "teachers", "classes")
+ROSTER_TABLES = ("classes", "students", "subjects", "teachers")
+STATS_TABLES = ("students", "teachers", "classes", "subjects")
+
+_sequence = itertools.count(1)
+_lock = threading.Lock()
+_versions: dict[str, int] = {}
+_modified: dict[str, float] = {}
+_listeners: list[Callable[[tuple], None]] = []
+_pollers: list[Callable[[], None]] = []
+# Returns the database's id and its shared per-table change counters, see
+# share_versions.
+_shared: Optional[Callable[[], tuple[Optional[int], dict]]] = None
+
+_CHANGED = "changed_tables"
+
+
+def bump(*tables: str) -> int:
+    """Mark ``tables`` as changed and return their new version."""
+    with _lock:
+        current = next(_sequence)
+        now = time.time()
+        for table in tables:
+            _versions[table] = current
+            _modified[table] = now
+    for listener in _listeners:
+        listener(tables)
+    return current
+
+
+def subscribe(listener: Callable[[tuple], None]) -> None:
+    """Call ``listener(tables)`` after every bump."""
+    _listeners.append(listener)
+
+
+def add_poller(poller: Callable[[], None]) -> None:
+    """Call ``poller()`` from ``refresh`` to pick up changes made elsewhere."""
+    _pollers.append(poller)
+
+
+def share_versions(source: Callable[[], tuple[Optional[int], dict]]) -> None:
+    """Build ETags from the database id and counters ``source()`` returns,
+    kept current by a ``refresh`` poller."""
+    global _shared
+    _shared = source
+
+
+def refresh() -> None:
+    """Bring versions up to date before they are used to answer a request."""
+    for poller in _pollers:
+        poller()
+
+
+def version(*tables: str) -> int:
+    return max((_versions.get(t, 0) for t in tables), default=0)
+
+
+def last_modified(*tables: str) -> float:
+    return max((_modified.get(t, STARTED_AT) for t in tables), default=STARTED_AT)
+
+
+def etag(tables: tuple, current: int) -> str:
+    """The tag of a response built from ``tables`` at version ``current``."""
+    database_id, counters = _shared() if _shared is not None else (None, {})
+    if database_id is not None and all(table in counters for table in tables):
+        shared = ".".join(str(counters[table]) for table in tables)
+        return f'"{database_id:x}-{shared}"'
+    # Nothing is shared, so the versions are this process's own and restart
+    # with it.
+    return f'"{EPOCH}-{current}"'
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _bump_schema(target, connection, tables=(), **kw):
+    bump(*(table.name for table in tables))
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session, flush_context):
+    changed = session.info.setdefault(_CHANGED, set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        changed.add(inspect(obj).mapper.local_table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_statement(orm_execute_state):
+    state = orm_execute_state
+    if (state.is_insert or state.is_update or state.is_delete) and state.bind_mapper:
+        state.session.info.setdefault(_CHANGED, set()).add(
+            state.bind_mapper.local_table.name
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session):
+    changed = session.info.pop(_CHANGED, None)
+    if changed:
+        bump(*changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop(_CHANGED, None)
+
+
+def etag_matches(if_none_match: str, tag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison.
+    return any(
+        candidate.strip().removeprefix("W/") == tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_get(tables: tuple):
+    """Route dependency adding ETag/Last-Modified and answering 304s.
+
+    Only ``If-None-Match`` is evaluated: ``Last-Modified`` has one-second
+    resolution, too coarse to tell two writes in the same second apart.
+    """
+
+    def dependency(request: Request, response: Response) -> None:
+        refresh()
+        current = version(*tables)
+        tag = etag(tables, current)
+        headers = {
+            "ETag": tag,
+            "Last-Modified": formatdate(last_modified(*tables), usegmt=True),
+            # Let browsers keep the response but revalidate it every time.
+            "Cache-Control": "no-cache",
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, tag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        # Lets the response cache tag the body with the version it was built at.
+        request.state.cache_tables = tables
+        request.state.cache_version = current
+
+    return dependency
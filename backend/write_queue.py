@@ -0,0 +1,140 @@
+"""Single-writer queue that group-commits concurrent mutations.
+
+SQLite allows one writer at a time, so concurrent mutating requests
+otherwise queue up on the database lock and pay one fsync each. With
+``WRITE_QUEUE_ENABLED`` a dedicated thread per engine runs every mutation.
+Mutations that arrive within ``WRITE_QUEUE_WINDOW_MS`` of each other share
+one transaction. Each one runs in its own SAVEPOINT, so a failing mutation
+is rolled back alone and its caller gets its own result or exception.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from config import WRITE_QUEUE_ENABLED, WRITE_QUEUE_MAX_BATCH, WRITE_QUEUE_WINDOW_MS
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+class WriteCoordinator:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        window: float = WRITE_QUEUE_WINDOW_MS / 1000,
+        max_batch: int = WRITE_QUEUE_MAX_BATCH,
+    ):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.writes = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._loop, name="sqlite-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, fn: Callable[[Session], T]) -> "Future[T]":
+        """Queue ``fn(session)``; the future resolves once its group commits."""
+        future: Future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def run(self, fn: Callable[[Session], T]) -> T:
+        return self.submit(fn).result()
+
+    def stop(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self, first) -> tuple[list, bool]:
+        batch, stopping = [first], False
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    # Past the window, still take whatever is already queued.
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stopping = True
+                break
+            batch.append(item)
+        return batch, stopping
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, stopping = self._collect(first)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _commit(self, batch: list) -> None:
+        outcomes = []
+        with self.session_factory() as session:
+            try:
+                for fn, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    savepoint = session.begin_nested()
+                    try:
+                        result = fn(session)
+                        savepoint.commit()
+                        outcomes.append((future, result, None))
+                    except Exception as exc:
+                        savepoint.rollback()
+                        outcomes.append((future, None, exc))
+                session.commit()
+            except Exception as exc:
+                session.rollback()
+                # The group commit itself failed: nobody's write landed.
+                outcomes = [(future, None, error or exc) for future, _, error in outcomes]
+        self.batches += 1
+        self.writes += len(outcomes)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+_coordinators: dict = {}
+_coordinators_lock = threading.Lock()
+
+
+def get_coordinator(bind) -> WriteCoordinator:
+    """The writer for ``bind``, started on first use."""
+    with _coordinators_lock:
+        coordinator = _coordinators.get(bind)
+        if coordinator is None:
+            factory = sessionmaker(
+                bind=bind, autoflush=False, expire_on_commit=False
+            )
+            coordinator = _coordinators[bind] = WriteCoordinator(factory)
+        return coordinator
+
+
+def run_write(db: Session, fn: Callable[[Session], T]) -> T:
+    """Run the mutation ``fn`` and commit it.
+
+    ``fn`` receives the session to write with and must not commit. Its
+    return value should not depend on the session staying open.
+    """
+    if WRITE_QUEUE_ENABLED:
+        return get_coordinator(db.get_bind()).run(fn)
+    result = fn(db)
+    db.commit()
+    return result
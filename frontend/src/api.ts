@@ -68,6 +68,10 @@ export const updateSubject = (id: number, data: Record<string, unknown>) =>
 export const deleteSubject = (id: number) =>
   api.delete(`/subjects/${id}`)
 
+// --- Stats ---
+export const getStats = () =>
+  api.get('/stats/')
+
 // --- Auth ---
 export const loginUser = (data: { username: string; password: string }) =>
   api.post('/auth/login', data)
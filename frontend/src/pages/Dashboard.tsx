@@ -1,17 +1,17 @@
 import { useEffect, useState } from 'react'
-import { getStudents, getTeachers, getClasses, getSubjects } from '../api'
+import { getStats } from '../api'
 
 function Dashboard() {
   const [counts, setCounts] = useState({ students: 0, teachers: 0, classes: 0, subjects: 0 })
 
   useEffect(() => {
-    Promise.all([getStudents(), getTeachers(), getClasses(), getSubjects()])
-      .then(([s, t, c, sub]) => {
+    getStats()
+      .then(({ data }) => {
         setCounts({
-          students: s.data.length,
-          teachers: t.data.length,
-          classes: c.data.length,
-          subjects: sub.data.length,
+          students: data.students,
+          teachers: data.teachers,
+          classes: data.classes,
+          subjects: data.subjects,
         })
       })
       .catch(() => {})
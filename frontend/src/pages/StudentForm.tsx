@@ -21,7 +21,7 @@ function StudentForm() {
   const [error, setError] = useState("");
 
   useEffect(() => {
-    getClasses().then(setClasses);
+    getClasses(undefined, "id,name").then(setClasses);
     if (id) {
       getStudent(Number(id)).then((s) => {
         setName(s.name);
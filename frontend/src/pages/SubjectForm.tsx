@@ -24,7 +24,7 @@ function SubjectForm() {
 
   useEffect(() => {
     getTeachers().then(setTeachers);
-    getClasses().then(setClasses);
+    getClasses(undefined, "id,name").then(setClasses);
     if (id) {
       getSubject(Number(id)).then((s) => {
         setName(s.name);
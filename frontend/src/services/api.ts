@@ -1,5 +1,5 @@
 import axios from "axios";
-import type { Student, Teacher, Class, Subject } from "../types";
+import type { Student, Teacher, Class, ClassRoster, Subject } from "../types";
 
 const api = axios.create({ baseURL: "/api" });
 
@@ -36,12 +36,15 @@ export const updateTeacher = (id: number, data: Partial<Omit<Teacher, "id">>) =>
 export const deleteTeacher = (id: number) => api.delete(`/teachers/${id}`);
 
 // Classes
-export const getClasses = (search?: string) =>
-  api.get<Class[]>("/classes/", { params: { search } }).then((r) => r.data);
+export const getClasses = (search?: string, fields?: string) =>
+  api.get<Class[]>("/classes/", { params: { search, fields } }).then((r) => r.data);
 
 export const getClass = (id: number) =>
   api.get<Class>(`/classes/${id}`).then((r) => r.data);
 
+export const getClassRoster = (id: number) =>
+  api.get<ClassRoster>(`/classes/${id}/roster`).then((r) => r.data);
+
 export const createClass = (data: Omit<Class, "id">) =>
   api.post<Class>("/classes/", data).then((r) => r.data);
 
@@ -32,3 +32,9 @@ export interface Subject {
   class_name: string | null;
 }
 
+export interface ClassRoster extends Class {
+  students: Student[];
+  subjects: Subject[];
+  teachers: Teacher[];
+}
+